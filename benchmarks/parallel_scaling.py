@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""Scaling benchmark of lubepy.parallel across worker counts.
+
+    $ python benchmarks/parallel_scaling.py --rows 50000000
+
+Prints the wall time, throughput and speedup of the viscosity_index and
+reynolds_number calculations for 1, 2, 4, ... workers, up to the number of
+CPUs.
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from lubepy.parallel import parallel_run
+
+
+def columns(rows: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    viscosity100 = rng.uniform(2.0, 100.0, rows)
+    return {
+        "viscosity40": viscosity100 * rng.uniform(3.0, 20.0, rows),
+        "viscosity100": viscosity100,
+        "temperature": rng.uniform(-10.0, 120.0, rows),
+        "flow_rate": rng.uniform(1.0, 4_000.0, rows),
+        "diameter": rng.uniform(5.0, 100.0, rows),
+    }
+
+
+def worker_counts(limit: int):
+    count = 1
+    while count < limit:
+        yield count
+        count *= 2
+    yield limit
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    data = columns(args.rows)
+    print(
+        f"{'calculation':<18}{'workers':>8}{'seconds':>10}"
+        f"{'Mrows/s':>10}{'speedup':>9}"
+    )
+    for name in ("viscosity_index", "reynolds_number"):
+        baseline = None
+        for workers in worker_counts(args.max_workers):
+            start = time.perf_counter()
+            parallel_run(name, data, workers=workers)
+            seconds = time.perf_counter() - start
+            baseline = baseline or seconds
+            print(
+                f"{name:<18}{workers:>8}{seconds:>10.2f}"
+                f"{args.rows / seconds / 1e6:>10.1f}"
+                f"{baseline / seconds:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""Load-test client of lubepy.service.
+
+    $ python benchmarks/service_load.py --connections 32 --requests 20000
+
+Starts a loopback service (or connects to --host/--port if given), sends
+viscosity_index requests over concurrent connections, each one keeping
+--in-flight requests outstanding, and prints the p50/p99 latency and the
+throughput.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+from lubepy.service import CalculationService
+
+
+async def client(host, port, requests, in_flight, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    sent = {}
+    window = asyncio.Semaphore(in_flight)
+
+    async def receive():
+        for _ in range(requests):
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - sent.pop(response["id"]))
+            window.release()
+
+    receiver = asyncio.ensure_future(receive())
+    for request_id in range(requests):
+        await window.acquire()
+        viscosity100 = random.uniform(2.0, 100.0)
+        request = {
+            "id": request_id,
+            "calculation": "viscosity_index",
+            "viscosity40": viscosity100 * random.uniform(3.0, 20.0),
+            "viscosity100": viscosity100,
+        }
+        sent[request_id] = time.perf_counter()
+        writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+    await receiver
+    writer.close()
+
+
+async def run(args):
+    service = server = None
+    host, port = args.host, args.port
+    if port is None:
+        service = CalculationService(args.max_batch, args.max_delay)
+        server = await service.serve(host, 0)
+        port = server.sockets[0].getsockname()[1]
+
+    latencies = []
+    per_connection = args.requests // args.connections
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            client(host, port, per_connection, args.in_flight, latencies)
+            for _ in range(args.connections)
+        )
+    )
+    seconds = time.perf_counter() - start
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(f"requests:   {len(latencies)}")
+    print(f"throughput: {len(latencies) / seconds:,.0f} requests/s")
+    print(f"p50:        {percentiles[49] * 1e3:.2f} ms")
+    print(f"p99:        {percentiles[98] * 1e3:.2f} ms")
+    if service is not None:
+        print(f"batches:    {service.batches}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--in-flight", type=int, default=64)
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--max-delay", type=float, default=0.002)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
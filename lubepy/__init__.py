@@ -19,6 +19,9 @@
 
 """This module provides the lubepy package."""
 
+# Subpackages are imported on first attribute access
+_SUBPACKAGES = ("device", "fluid", "lube", "validator")
+
 # Package meta-data.
 NAME = "lubepy"
 DESCRIPTION = (
@@ -53,6 +56,42 @@ MIN_OIL_DENSITY = 0.7  # g/mL
 MAX_OIL_DENSITY = 1.5  # g/mL
 MIN_FLOW_RATE = 0.1  # L/h
 MAX_FLOW_RATE = 5_000.0  # L/h
+# ISO 3448 viscosity grades: KV40 midpoint (cSt) by grade, each band is
+# ±10 % of the midpoint
+ISO_VG_GRADES = {
+    2: 2.2,
+    3: 3.2,
+    5: 4.6,
+    7: 6.8,
+    10: 10.0,
+    15: 15.0,
+    22: 22.0,
+    32: 32.0,
+    46: 46.0,
+    68: 68.0,
+    100: 100.0,
+    150: 150.0,
+    220: 220.0,
+    320: 320.0,
+    460: 460.0,
+    680: 680.0,
+    1000: 1_000.0,
+    1500: 1_500.0,
+    2200: 2_200.0,
+    3200: 3_200.0,
+}
+ISO_VG_TOLERANCE = 0.1
+# SAE J300 engine oil grades: KV100 range (cSt), upper limit excluded
+SAE_J300_GRADES = {
+    8: (4.0, 6.1),
+    12: (5.0, 7.1),
+    16: (6.1, 8.2),
+    20: (6.9, 9.3),
+    30: (9.3, 12.5),
+    40: (12.5, 16.3),
+    50: (16.3, 21.9),
+    60: (21.9, 26.1),
+}
 ASH_CONTRIBUTION = {
     "zinc": 1.50,
     "barium": 1.70,
@@ -66,3 +105,15 @@ ASH_CONTRIBUTION = {
     "molybdenum": 1.5,
     "copper": 1.252,
 }
+
+
+def __getattr__(name):
+    if name in _SUBPACKAGES:
+        from importlib import import_module
+
+        return import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBPACKAGES))
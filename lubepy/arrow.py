@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+
+"""This module provides Arrow and Parquet front ends to the batch APIs.
+
+Arrow columns move into the calculations of lubepy.calculations without
+going through Python objects: numeric columns are viewed as NumPy arrays
+and the numeric results are handed back to Arrow without copying. The
+views are zero-copy for float64 columns without nulls in a record batch
+(a table column with many chunks is joined first); other numeric columns
+are converted once. Only the rows that pass validation are gathered for
+the kernel. Text columns go through the same clean-up as the other front
+ends. Nulls are read as NaN, so they're reported as not finite.
+
+Parquet files are streamed one row group at a time, so memory use depends
+on the row group size and not on the file size.
+
+PyArrow and NumPy are optional dependencies, so this module is only
+imported by the Arrow APIs.
+"""
+
+from typing import Iterator, List, Optional, Union
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from lubepy.calculations import CALCULATIONS, describe_errors, run
+
+ERROR_COLUMN = "error"
+
+_Columnar = Union[pa.RecordBatch, pa.Table]
+
+
+def column_values(data: _Columnar, column: str) -> np.ndarray:
+    """Return a column of a record batch or table as a NumPy array."""
+    values = data.column(column)
+    if pa.types.is_integer(values.type) or pa.types.is_floating(values.type):
+        if values.null_count:
+            values = values.cast(pa.float64()).fill_null(np.nan)
+        return values.to_numpy()
+    return np.asarray(values.to_pylist(), dtype=object)
+
+
+def run_batch(name: str, data: _Columnar) -> _Columnar:
+    """Run a named calculation over a record batch or table.
+
+    Return the data with two new columns: the results, named after the
+    calculation (null for invalid rows), and the errors ("" for valid
+    rows). Categorical results are dictionary encoded.
+    """
+    calculation = CALCULATIONS[name]
+    needed = [column for column, _ in calculation.inputs]
+    needed += [
+        column
+        for column, _ in calculation.optional
+        if column in data.schema.names
+    ]
+    result = run(
+        name, {column: column_values(data, column) for column in needed}
+    )
+
+    if calculation.labels is None:
+        values = _float_array(result.values, result.valid)
+    else:
+        codes = pa.array(
+            np.where(result.valid, result.values, 0).astype(np.int8),
+            mask=~result.valid,
+        )
+        values = pa.DictionaryArray.from_arrays(
+            codes, pa.array(calculation.labels)
+        )
+    data = data.append_column(name, values)
+    return data.append_column(
+        ERROR_COLUMN, pa.array(describe_errors(result), type=pa.string())
+    )
+
+
+def _float_array(values: np.ndarray, valid: np.ndarray) -> pa.Array:
+    """Return a float64 Arrow array on the buffer of values.
+
+    Rows that aren't valid are null. Only the validity bitmap is new.
+    """
+    nulls = len(valid) - int(np.count_nonzero(valid))
+    bitmap = (
+        pa.py_buffer(np.packbits(valid, bitorder="little")) if nulls else None
+    )
+    return pa.Array.from_buffers(
+        pa.float64(),
+        len(values),
+        [bitmap, pa.py_buffer(np.ascontiguousarray(values, dtype=float))],
+        null_count=nulls,
+    )
+
+
+def read_row_groups(
+    source, columns: Optional[List[str]] = None
+) -> Iterator[pa.RecordBatch]:
+    """Read a Parquet file one row group at a time.
+
+    columns: Columns to read (all if None).
+    """
+    parquet = pq.ParquetFile(source)
+    for index in range(parquet.num_row_groups):
+        yield from parquet.read_row_group(index, columns=columns).to_batches()
+
+
+def run_parquet(
+    name: str, source, destination, columns: Optional[List[str]] = None
+) -> int:
+    """Run a named calculation over a Parquet file into another one.
+
+    Every row group of source becomes a row group of destination with the
+    columns added by run_batch().
+
+    columns: Input columns to read and copy (all if None). The columns of
+        the calculation must be among them.
+
+    Return the number of rows written.
+    """
+    rows = 0
+    writer = None
+    try:
+        for batch in read_row_groups(source, columns):
+            batch = run_batch(name, batch)
+            if writer is None:
+                writer = pq.ParquetWriter(destination, batch.schema)
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
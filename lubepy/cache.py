@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+
+"""This module provides a persistent on-disk cache for costly results.
+
+The cache is a SQLite database in WAL mode, so many worker processes can
+read it while one of them writes. Entries are keyed by the calculation
+name, the inputs and a fingerprint of the library version and its
+constants (the validation limits, the ASTM D2270 coefficients and so
+on). Changing any of them makes the old entries unreachable. prune()
+deletes them.
+
+Values are stored as tagged JSON, so tuples, and the named tuples and
+enums of lubepy, come back with their own types (other named tuples come
+back as tuples), and a cached None is told apart from a miss. Reading
+never imports or calls anything but those lubepy types.
+
+    >>> cache = DiskCache("lubepy-cache.sqlite3")
+    >>> viscosity_at_40 = cache.wrap(viscosity.viscosity_at_40)
+    >>> viscosity_at_40(13.9, 130)   # Computed
+    >>> viscosity_at_40(13.9, 130)   # Read from the cache
+
+map() does the same for batch kernels: it only evaluates the rows missing
+from the cache. Its keys, and those of get() and put(), round the numeric
+inputs to `digits` decimals, so inputs closer than that share one entry.
+The functions returned by wrap() use the exact inputs instead.
+"""
+
+import functools
+import hashlib
+import importlib
+import json
+import os
+import sqlite3
+import threading
+from enum import Enum
+from numbers import Real
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+)
+
+import lubepy
+from lubepy.exceptions import ValidationError
+from lubepy.lube.mixture import _TEMPERATURE_CORRECTION
+from lubepy.lube.viscosity import _INTERPOLATION_COEFS
+
+# Keys per SELECT, under the SQLite limit of host parameters
+_BATCH_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    version TEXT NOT NULL,
+    name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (version, name, key)
+) WITHOUT ROWID
+"""
+
+
+def constants_fingerprint() -> str:
+    """Return a hash of the library version and its constants."""
+    constants = {
+        name: value
+        for name, value in vars(lubepy).items()
+        if name.isupper() and not callable(value)
+    }
+    constants["_INTERPOLATION_COEFS"] = [
+        [list(key), list(value)] for key, value in _INTERPOLATION_COEFS.items()
+    ]
+    constants["_TEMPERATURE_CORRECTION"] = _TEMPERATURE_CORRECTION
+    text = json.dumps(constants, sort_keys=True, default=repr)
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+class DiskCache:
+    """Class to cache calculation results in a SQLite database."""
+
+    def __init__(self, path, digits: int = 6, timeout: float = 30.0) -> None:
+        """Class initializer.
+
+        path: Database file, created if missing.
+        digits: Decimal digits the numeric inputs are rounded to.
+        timeout: Seconds to wait for a lock held by another process.
+        """
+        self.path = os.fspath(path)
+        self.digits = digits
+        self.timeout = timeout
+        self.version = constants_fingerprint()
+        self._local = threading.local()
+        self._connection()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return the connection of the current thread and process."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with connection:
+                connection.execute(_SCHEMA)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def key(
+        self,
+        args: Sequence,
+        kwargs: Optional[Mapping] = None,
+        exact: bool = False,
+    ) -> str:
+        """Return the key of some inputs.
+
+        kwargs: Keyword arguments, sorted by name into the key.
+        exact: If False, round the numbers to `digits` decimals.
+        """
+        inputs = [
+            (
+                (float(arg) if exact else round(float(arg), self.digits))
+                if isinstance(arg, Real) and not isinstance(arg, bool)
+                else arg
+            )
+            for arg in args
+        ]
+        if kwargs:
+            inputs.append(dict(sorted(kwargs.items())))
+        return json.dumps(_encode(inputs), default=repr)
+
+    def get(self, name: str, args: Sequence) -> Optional[Any]:
+        """Return the cached result of name(*args), or None if missing."""
+        return self.get_many(name, [args])[0]
+
+    def put(self, name: str, args: Sequence, value: Any) -> None:
+        """Cache the result of name(*args)."""
+        self.put_many(name, [args], [value])
+
+    def get_many(self, name: str, rows: Iterable[Sequence]) -> List:
+        """Return the cached results of many rows, None for the missing."""
+        keys = [self.key(row) for row in rows]
+        found = self._lookup(name, keys)
+        return [found.get(key) for key in keys]
+
+    def put_many(
+        self, name: str, rows: Iterable[Sequence], values: Iterable
+    ) -> None:
+        """Cache the results of many rows in one transaction."""
+        self._store(name, [self.key(row) for row in rows], [*values])
+
+    def _lookup(self, name: str, keys: Sequence[str]) -> Dict[str, Any]:
+        """Return the cached values of the keys found, by key."""
+        found = {}
+        connection = self._connection()
+        for start in range(0, len(keys), _BATCH_SIZE):
+            chunk = keys[start : start + _BATCH_SIZE]
+            found.update(
+                connection.execute(
+                    "SELECT key, value FROM entries"
+                    " WHERE version = ? AND name = ?"
+                    f" AND key IN ({', '.join('?' * len(chunk))})",
+                    [self.version, name, *chunk],
+                )
+            )
+        return {
+            key: _decode(json.loads(value)) for key, value in found.items()
+        }
+
+    def _store(self, name: str, keys: Sequence[str], values: Sequence) -> None:
+        """Cache the values of some keys in one transaction."""
+        entries = [
+            (self.version, name, key, json.dumps(_encode(value)))
+            for key, value in zip(keys, values)
+        ]
+        with self._connection() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)", entries
+            )
+
+    def wrap(self, function: Callable, name: Optional[str] = None):
+        """Return a version of a scalar function that uses the cache.
+
+        The inputs, keyword arguments included, are keyed exactly, not
+        rounded to `digits` decimals.
+        """
+        name = name or f"{function.__module__}.{function.__qualname__}"
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            key = self.key(args, kwargs, exact=True)
+            found = self._lookup(name, [key])
+            if key in found:
+                return found[key]
+            value = function(*args, **kwargs)
+            self._store(name, [key], [value])
+            return value
+
+        return wrapper
+
+    def map(self, name: str, kernel: Callable, *columns) -> List:
+        """Evaluate a batch kernel over columns, skipping cached rows.
+
+        kernel: Function taking the columns of the missing rows (as
+            lists) and returning one result per row.
+
+        Rows are keyed like get() keys them, with the numbers rounded to
+        `digits` decimals.
+
+        Return the results of every row as a list.
+        """
+        rows = list(zip(*columns))
+        keys = [self.key(row) for row in rows]
+        found = self._lookup(name, keys)
+        missing = [index for index, key in enumerate(keys) if key not in found]
+        if missing:
+            missing_rows = [rows[index] for index in missing]
+            results = kernel(*(list(column) for column in zip(*missing_rows)))
+            results = [_to_builtin(result) for result in results]
+            self._store(name, [keys[index] for index in missing], results)
+            found.update(
+                (keys[index], result)
+                for index, result in zip(missing, results)
+            )
+        return [found[key] for key in keys]
+
+    def prune(self) -> int:
+        """Delete the entries of other versions and return their count."""
+        with self._connection() as connection:
+            return connection.execute(
+                "DELETE FROM entries WHERE version != ?", [self.version]
+            ).rowcount
+
+    def __len__(self) -> int:
+        return (
+            self._connection()
+            .execute(
+                "SELECT COUNT(*) FROM entries WHERE version = ?",
+                [self.version],
+            )
+            .fetchone()[0]
+        )
+
+
+def _to_builtin(value):
+    """Turn NumPy scalars into Python numbers so they can be stored."""
+    return value.item() if hasattr(value, "item") else value
+
+
+def _encode(value):
+    """Return a JSON-ready form of a value that keeps its type."""
+    if isinstance(value, Enum) and _is_lubepy_type(type(value), Enum):
+        return {"enum": _type_path(value), "name": value.name}
+    if isinstance(value, tuple):
+        items = [_encode(item) for item in value]
+        if _is_lubepy_type(type(value), tuple):
+            return {"namedtuple": _type_path(value), "items": items}
+        return {"tuple": items}
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        return {"dict": [[_encode(k), _encode(v)] for k, v in value.items()]}
+    return value
+
+
+def _decode(value):
+    """Rebuild a value encoded by _encode()."""
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if "enum" in value:
+        return _import_type(value["enum"], Enum)[value["name"]]
+    if "namedtuple" in value:
+        items = [_decode(item) for item in value["items"]]
+        return _import_type(value["namedtuple"], tuple)(*items)
+    if "tuple" in value:
+        return tuple(_decode(item) for item in value["tuple"])
+    return {_decode(k): _decode(v) for k, v in value["dict"]}
+
+
+def _type_path(value) -> str:
+    """Return the import path of the type of a value."""
+    cls = type(value)
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _is_lubepy_type(cls, base) -> bool:
+    """Tell if cls is an enum or named tuple (per base) of lubepy."""
+    module = getattr(cls, "__module__", "")
+    return (
+        isinstance(cls, type)
+        and issubclass(cls, base)
+        and (base is Enum or hasattr(cls, "_fields"))
+        and (module == "lubepy" or module.startswith("lubepy."))
+    )
+
+
+def _import_type(path: str, base):
+    """Return the type at an import path from _type_path().
+
+    Only enums and named tuples (per base) defined by lubepy are
+    returned, so a tampered database can't make readers call anything
+    else.
+    """
+    module, _, qualname = path.partition(":")
+    parts = module.split(".")
+    # No private modules: importing lubepy.__main__ runs the CLI
+    if parts[0] == "lubepy" and not any(p.startswith("_") for p in parts):
+        try:
+            cls = importlib.import_module(module)
+        except ImportError:
+            cls = None
+        for attribute in qualname.split("."):
+            cls = getattr(cls, attribute, None)
+        if _is_lubepy_type(cls, base):
+            return cls
+    raise ValidationError(f"{path} is not a lubepy result type")
@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides the registry of named batch calculations.
+
+Every calculation maps named input columns to a vectorized kernel. run()
+validates the columns with the array validators. It evaluates the kernel
+on the valid rows only and reports the invalid rows with a reason
+instead of raising. The command-line interface and the other batch
+front ends use this registry.
+
+NumPy is an optional dependency, so this module is only imported by the
+batch APIs.
+"""
+
+from collections import namedtuple
+from functools import partial
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from lubepy import ASH_CONTRIBUTION
+from lubepy.device import batch as device
+from lubepy.fluid import batch as fluid
+from lubepy.lube import batch as lube
+from lubepy.validator import array
+from lubepy.validator.array import INCONSISTENT, REASONS, VALID
+
+# name: Calculation name
+# inputs: (column, array validator) pairs, in kernel argument order
+# kernel: Vectorized function taking the input columns
+# optional: (column, array validator) pairs of columns that may be
+#     missing, passed to the kernel by keyword. In run_records(), a
+#     missing or empty optional value counts as 0.0
+# check: Function of the input columns returning a mask of the
+#     inconsistent rows, or None
+# labels: Labels of the result codes for categorical results, or None
+Calculation = namedtuple(
+    "Calculation",
+    ["name", "inputs", "kernel", "optional", "check", "labels"],
+)
+Calculation.__new__.__defaults__ = ((), None, None)
+
+# values: Kernel results, NaN for invalid rows
+# valid: Mask of valid rows
+# reasons: Reason code of every row (see lubepy.validator.array)
+# columns: Name of the first invalid column of every row ("" if valid)
+_CalculationResult = namedtuple(
+    "_CalculationResult", ["values", "valid", "reasons", "columns"]
+)
+
+_viscosity40 = (
+    "viscosity40",
+    lambda v: array.validate_viscosity_array(v, "40"),
+)
+_viscosity100 = (
+    "viscosity100",
+    lambda v: array.validate_viscosity_array(v, "100"),
+)
+_temperature = ("temperature", array.validate_temperature_array)
+_flow_rate = ("flow_rate", array.validate_flow_rate_array)
+_diameter = ("diameter", array.validate_pipe_session_array)
+_positive = partial(array.validate_array, lower=0.0)
+_additive_percent = ("additive_percent", array.validate_additive_percent_array)
+_outer_diameter = ("outer_diameter", array.validate_bearing_diameter_array)
+_inner_diameter = ("inner_diameter", array.validate_bearing_diameter_array)
+
+
+def _reynolds(flow_rate, viscosity40, viscosity100, temperature, diameter):
+    return fluid.reynolds_at_temp(
+        flow_rate, viscosity40, viscosity100, temperature, diameter
+    )
+
+
+def _flow_type(flow_rate, viscosity40, viscosity100, temperature, diameter):
+    return fluid.flow_type_codes(
+        _reynolds(flow_rate, viscosity40, viscosity100, temperature, diameter)
+    )
+
+
+def _grade(classify, grades: tuple, values):
+    """Return the grade codes, with off-grade values coded as len(grades)."""
+    codes, off_grade = classify(values)
+    return np.where(off_grade, len(grades), codes)
+
+
+def _mixture_calculations(temperature: str):
+    def viscosity(column):
+        return (
+            column,
+            lambda v: array.validate_viscosity_array(v, temperature),
+        )
+
+    return (
+        Calculation(
+            f"mixture_viscosity{temperature}",
+            (
+                viscosity("first_viscosity"),
+                (
+                    "first_oil_percent",
+                    lambda v: array.validate_array(v, 0, 100),
+                ),
+                viscosity("second_viscosity"),
+            ),
+            partial(lube.mixture_viscosity, temperature=temperature),
+        ),
+        Calculation(
+            f"mixture_proportions{temperature}",
+            (
+                viscosity("first_viscosity"),
+                viscosity("second_viscosity"),
+                viscosity("desired_viscosity"),
+            ),
+            partial(lube.mixture_proportions, temperature=temperature),
+            check=_mixture_check,
+        ),
+    )
+
+
+def _mixture_check(first_viscosity, second_viscosity, desired_viscosity):
+    return (
+        desired_viscosity < np.minimum(first_viscosity, second_viscosity)
+    ) | (desired_viscosity > np.maximum(first_viscosity, second_viscosity))
+
+
+def _bearing_check(outer_diameter, inner_diameter, *args):
+    return outer_diameter <= inner_diameter
+
+
+CALCULATIONS: Dict[str, Calculation] = {
+    calculation.name: calculation
+    for calculation in (
+        Calculation(
+            "viscosity_index",
+            (_viscosity40, _viscosity100),
+            lube.viscosity_index,
+        ),
+        Calculation(
+            "viscosity_at_any_temp",
+            (_viscosity40, _viscosity100, _temperature),
+            lube.viscosity_at_any_temp,
+        ),
+        Calculation(
+            "additive_percent_mass",
+            (
+                _additive_percent,
+                ("additive_density", array.validate_oil_density_array),
+                ("oil_density", array.validate_oil_density_array),
+            ),
+            lube.additive_percent_mass,
+        ),
+        Calculation(
+            "iso_vg_grade",
+            (("viscosity40", _positive),),
+            partial(_grade, lube.iso_vg_codes, lube.ISO_VG_CODES),
+            labels=tuple(f"ISO VG {grade}" for grade in lube.ISO_VG_CODES)
+            + ("off-grade",),
+        ),
+        Calculation(
+            "sae_grade",
+            (("viscosity100", _positive),),
+            partial(_grade, lube.sae_codes, lube.SAE_CODES),
+            labels=tuple(f"SAE {grade}" for grade in lube.SAE_CODES)
+            + ("off-grade",),
+        ),
+        *_mixture_calculations("40"),
+        *_mixture_calculations("100"),
+        Calculation(
+            "total_ash",
+            (_additive_percent,),
+            lube.total_ash,
+            tuple(
+                (metal, lambda v: array.validate_array(v, 0.0, None))
+                for metal in ASH_CONTRIBUTION
+            ),
+        ),
+        Calculation(
+            "grease_amount",
+            (_outer_diameter, ("width", array.validate_bearing_width_array)),
+            device.grease_amount,
+        ),
+        Calculation(
+            "velocity_factor",
+            (
+                _outer_diameter,
+                _inner_diameter,
+                ("rpm", array.validate_rpm_array),
+            ),
+            device.velocity_factor,
+            check=_bearing_check,
+        ),
+        Calculation(
+            "reynolds_number",
+            (_flow_rate, _viscosity40, _viscosity100, _temperature, _diameter),
+            _reynolds,
+        ),
+        Calculation(
+            "flow_type",
+            (_flow_rate, _viscosity40, _viscosity100, _temperature, _diameter),
+            _flow_type,
+            labels=tuple(flow_type.value for flow_type in fluid.FLOW_TYPES),
+        ),
+    )
+}
+
+
+def required_columns(name: str) -> Tuple[str, ...]:
+    """Return the required input columns of a calculation."""
+    return tuple(column for column, _ in CALCULATIONS[name].inputs)
+
+
+def run(name: str, columns: Mapping) -> _CalculationResult:
+    """Run a named calculation over input columns.
+
+    columns: Mapping of column name to column values (any sequence of
+        numbers or text). Optional columns may be missing.
+
+    Rows with invalid values never reach the kernel. They get NaN in the
+    results plus the reason code and the name of the first bad column.
+    """
+    calculation = CALCULATIONS[name]
+    size = len(columns[calculation.inputs[0][0]])
+    reasons = np.zeros(size, dtype=np.uint8)
+    bad_columns = np.full(size, "", dtype=object)
+
+    def validate(column, validator):
+        result = validator(columns[column])
+        new = (reasons == VALID) & ~result.valid
+        reasons[new] = result.reasons[new]
+        bad_columns[new] = column
+        return result.values
+
+    values = [
+        validate(column, validator) for column, validator in calculation.inputs
+    ]
+    optional = {
+        column: validate(column, validator)
+        for column, validator in calculation.optional
+        if column in columns
+    }
+    if calculation.check is not None:
+        with np.errstate(invalid="ignore"):
+            inconsistent = (reasons == VALID) & calculation.check(*values)
+        reasons[inconsistent] = INCONSISTENT
+        bad_columns[inconsistent] = calculation.inputs[0][0]
+
+    valid = reasons == VALID
+    results = np.full(size, np.nan)
+    if valid.any():
+        results[valid] = calculation.kernel(
+            *(value[valid] for value in values),
+            **{column: value[valid] for column, value in optional.items()},
+        )
+    return _CalculationResult(results, valid, reasons, bad_columns)
+
+
+def describe_errors(result: _CalculationResult):
+    """Return a readable error per row ("" for valid rows)."""
+    return [
+        f"{column}: {REASONS[reason]}" if reason != VALID else ""
+        for column, reason in zip(result.columns, result.reasons)
+    ]
+
+
+def _optional_value(value):
+    """Return 0.0 for a missing or empty optional value."""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return 0.0
+    return value
+
+
+def run_records(name: str, records: Sequence[Mapping]) -> Tuple[List, List]:
+    """Run a named calculation over dict records.
+
+    Return one result per record (None for invalid records and labels for
+    categorical results) and one error per record ("" if valid).
+    """
+    calculation = CALCULATIONS[name]
+    columns = {
+        column: [record.get(column, "") for record in records]
+        for column, _ in calculation.inputs
+    }
+    for column, _ in calculation.optional:
+        if any(column in record for record in records):
+            columns[column] = [
+                _optional_value(record.get(column)) for record in records
+            ]
+
+    result = run(name, columns)
+    values = [
+        value if valid else None
+        for value, valid in zip(result.values.tolist(), result.valid.tolist())
+    ]
+    if calculation.labels is not None:
+        values = [
+            None if value is None else calculation.labels[int(value)]
+            for value in values
+        ]
+    return values, describe_errors(result)
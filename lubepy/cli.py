@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides the lubepy command-line interface.
+
+The lubepy command streams CSV or JSON Lines records from files or the
+standard input. It runs a named calculation over chunks of records with
+the vectorized kernels and writes every record with its result to the
+standard output. Only a bounded number of chunks is in memory at any
+time, so the size of the input doesn't matter.
+
+    $ lubepy viscosity_index lab_results.csv > results.csv
+    $ cat samples.jsonl | lubepy flow_type --format jsonl --workers 4
+
+Invalid rows aren't dropped. Their result is empty and the error column
+says which column is wrong and why. Malformed JSON lines become rows with
+only their line number and the error.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import deque
+from itertools import chain, islice
+from typing import Iterable, Iterator, List, Optional
+
+from lubepy import DESCRIPTION
+
+FORMATS = ("csv", "jsonl")
+ERROR_COLUMN = "error"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the lubepy command."""
+    from lubepy.calculations import CALCULATIONS
+
+    parser = argparse.ArgumentParser(prog="lubepy", description=DESCRIPTION)
+    parser.add_argument("calculation", choices=sorted(CALCULATIONS))
+    parser.add_argument(
+        "files",
+        nargs="*",
+        default=["-"],
+        help="input files, '-' for the standard input (default)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        help="input and output format (default: by file extension or csv)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=10_000,
+        help="records per chunk (default: 10000)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="worker processes, 0 to run in this process (default: 0)",
+    )
+    parser.add_argument(
+        "--precision",
+        type=int,
+        help="round the results to this number of decimals",
+    )
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1 or args.workers < 0:
+        parser.error("--chunk-size must be positive and --workers >= 0")
+
+    data_format = args.format or _guess_format(args.files[0])
+    records = chain.from_iterable(
+        _read(path, data_format) for path in args.files
+    )
+    chunks = _chunks(records, args.chunk_size)
+    processed = (
+        _process_parallel(
+            args.calculation, chunks, args.precision, args.workers
+        )
+        if args.workers
+        else (
+            process_chunk(args.calculation, chunk, args.precision)
+            for chunk in chunks
+        )
+    )
+    try:
+        _write(processed, data_format, args.calculation, sys.stdout)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # The reader went away, e.g. `lubepy ... | head`
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    return 0
+
+
+class _BadLine(dict):
+    """Record of an input line that couldn't be parsed."""
+
+
+def process_chunk(
+    calculation: str, records: List[dict], precision: Optional[int] = None
+) -> List[dict]:
+    """Add the calculation result and error to every record of a chunk."""
+    from lubepy.calculations import run_records
+
+    parsed = [record for record in records if not isinstance(record, _BadLine)]
+    results = zip(*run_records(calculation, parsed))
+    for record in records:
+        if isinstance(record, _BadLine):
+            record[calculation] = None
+            record[ERROR_COLUMN] = record.pop(ERROR_COLUMN)
+            continue
+        value, error = next(results)
+        if precision is not None and isinstance(value, float):
+            value = round(value, precision)
+        record[calculation] = value
+        record[ERROR_COLUMN] = error
+    return records
+
+
+def _process_parallel(
+    calculation: str,
+    chunks: Iterable[List[dict]],
+    precision: Optional[int],
+    workers: int,
+) -> Iterator[List[dict]]:
+    """Process chunks in worker processes, keeping the input order.
+
+    At most two chunks per worker are in flight, so memory stays bounded
+    however long the input is.
+    """
+    from multiprocessing import Pool
+
+    with Pool(workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(
+                pool.apply_async(
+                    process_chunk, (calculation, chunk, precision)
+                )
+            )
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+
+def _guess_format(path: str) -> str:
+    if path.endswith((".jsonl", ".ndjson", ".json")):
+        return "jsonl"
+    return "csv"
+
+
+def _read(path: str, data_format: str) -> Iterator[dict]:
+    if path == "-":
+        yield from _parse(sys.stdin, data_format)
+        return
+    with open(path, encoding="utf-8", newline="") as file:
+        yield from _parse(file, data_format)
+
+
+def _parse(file, data_format: str) -> Iterator[dict]:
+    if data_format == "csv":
+        yield from csv.DictReader(file)
+        return
+    for number, line in enumerate(file, 1):
+        if line.strip():
+            yield _parse_line(number, line)
+
+
+def _parse_line(number: int, line: str) -> dict:
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError as error:
+        reason = f"invalid JSON ({error.msg})"
+    else:
+        if isinstance(record, dict):
+            return record
+        reason = "not a JSON object"
+    return _BadLine({"line": number, ERROR_COLUMN: f"line {number}: {reason}"})
+
+
+def _chunks(records: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _write(chunks, data_format: str, calculation: str, output) -> None:
+    writer = None
+    for chunk in chunks:
+        if data_format == "jsonl":
+            for record in chunk:
+                output.write(json.dumps(record) + "\n")
+            continue
+        if writer is None:
+            fields = [
+                name
+                for name in chunk[0]
+                if name not in (calculation, ERROR_COLUMN)
+            ]
+            writer = csv.DictWriter(
+                output,
+                fieldnames=fields + [calculation, ERROR_COLUMN],
+                extrasaction="ignore",
+                lineterminator="\n",
+            )
+            writer.writeheader()
+        writer.writerows(chunk)
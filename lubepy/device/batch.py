@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides vectorized bearing calculations.
+
+The functions in this module take NumPy arrays (or anything NumPy can turn
+into an array) and return unrounded NumPy arrays. NumPy is an optional
+dependency, so this module is only imported by the batch APIs.
+"""
+
+import numpy as np
+
+from lubepy import (
+    MAX_BEARING_DIAMETER,
+    MAX_BEARING_WIDTH,
+    MAX_RPM,
+    MIN_BEARING_DIAMETER,
+    MIN_BEARING_WIDTH,
+    MIN_RPM,
+)
+from lubepy.exceptions import ConceptError
+from lubepy.validator.array import _validate_or_raise as _validate
+
+
+def _validate_diameter(param: str, diameter) -> np.ndarray:
+    return _validate(
+        param, diameter, MIN_BEARING_DIAMETER, MAX_BEARING_DIAMETER
+    )
+
+
+def _validate_rpm(rpm) -> np.ndarray:
+    return _validate("Bearing rpm", rpm, MIN_RPM, MAX_RPM)
+
+
+def grease_amount(outer_diameter, width) -> np.ndarray:
+    """Return the amount of grease (g) needed for re-lubrication."""
+    _outer = _validate_diameter("Bearing outer diameter", outer_diameter)
+    _width = _validate(
+        "Bearing width", width, MIN_BEARING_WIDTH, MAX_BEARING_WIDTH
+    )
+    return 0.005 * _outer * _width
+
+
+def lubrication_frequency(inner_diameter, rpm, k_factor=1.0) -> np.ndarray:
+    """Calculate the re-lubrication frequency in hours.
+
+    k_factor: Product of the correction factors of every bearing, see
+        Bearing.lubrication_frequency().
+    """
+    _inner = _validate_diameter("Bearing inner diameter", inner_diameter)
+    _rpm = _validate_rpm(rpm)
+    _k_factor = _validate("Correction factor", k_factor, 0.0, 10.0)
+    return _k_factor * ((14000000 / (_rpm * np.sqrt(_inner))) - 4 * _inner)
+
+
+def velocity_factor(outer_diameter, inner_diameter, rpm) -> np.ndarray:
+    """Calculate the velocity factor of a bearing (mm/min)."""
+    _outer = _validate_diameter("Bearing outer diameter", outer_diameter)
+    _inner = _validate_diameter("Bearing inner diameter", inner_diameter)
+    if (_outer <= _inner).any():
+        raise ConceptError(
+            "Outer diameter must be greater than inner diameter"
+        )
+    return _validate_rpm(rpm) * (_outer + _inner) / 2
@@ -29,14 +29,17 @@ from lubepy import (
     MIN_RPM,
 )
 from lubepy.exceptions import ConceptError
+from lubepy.metrics import instrumented
 from lubepy.validator.core import BearingDiameter, Rpm, BearingWidth
 
 
+@instrumented()
 def grace_amount(outer_diameter: float, width: float) -> float:
     """Return the amount of grease (g) needed for re-lubrication."""
     return Bearing(outer_diameter, MIN_BEARING_DIAMETER, width).grease_amount()
 
 
+@instrumented()
 def lubrication_frequency(
     inner_diameter: float, rpm: float, factors: Dict[str, int]
 ) -> float:
@@ -45,6 +48,7 @@ def lubrication_frequency(
     return bearing.lubrication_frequency(rpm, factors)
 
 
+@instrumented()
 def velocity_factor(
     outer_diameter: float, inner_diameter: float, rpm: float
 ) -> float:
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides vectorized Reynolds number calculations.
+
+The functions in this module take NumPy arrays (or anything NumPy can turn
+into an array) and return unrounded NumPy arrays. NumPy is an optional
+dependency, so this module is only imported by the batch APIs.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from lubepy import (
+    MAX_FLOW_RATE,
+    MAX_PIPE_EQUIVALENT_DIAMETER,
+    MAX_TEMPERATURE,
+    MIN_FLOW_RATE,
+    MIN_PIPE_EQUIVALENT_DIAMETER,
+    MIN_TEMPERATURE,
+)
+from lubepy.exceptions import ConceptError
+from lubepy.fluid.reynolds import (
+    LAMINAR_LIMIT,
+    REYNOLDS_FACTOR,
+    TURBULENT_LIMIT,
+    _FlowTypes,
+)
+from lubepy.lube.batch import (
+    walther_coefficients,
+    walther_temperature,
+    walther_viscosity,
+)
+from lubepy.validator.array import _validate_or_raise as _validate
+
+# Flow types indexed by the codes returned by flow_type_codes()
+FLOW_TYPES = (_FlowTypes.LAMINAR, _FlowTypes.MIXED, _FlowTypes.TURBULENT)
+
+_Transitions = namedtuple("_Transitions", ["laminar", "turbulent"])
+
+
+def _validate_flow_rate(flow_rate) -> np.ndarray:
+    return _validate("Flow rate", flow_rate, MIN_FLOW_RATE, MAX_FLOW_RATE)
+
+
+def _validate_diameter(equivalent_diameter) -> np.ndarray:
+    return _validate(
+        "Pipe equivalent diameter",
+        equivalent_diameter,
+        MIN_PIPE_EQUIVALENT_DIAMETER,
+        MAX_PIPE_EQUIVALENT_DIAMETER,
+    )
+
+
+def equivalent_diameter(base, height) -> np.ndarray:
+    """Calculate the equivalent diameter of rectangular sessions (mm)."""
+    _base = np.asarray(base, dtype=float)
+    _height = np.asarray(height, dtype=float)
+    return (2 * _base * _height) / (_base + _height)
+
+
+def reynolds_number(flow_rate, viscosity, equivalent_diameter) -> np.ndarray:
+    """Calculate Reynolds number (Re) from an already known viscosity."""
+    _flow_rate = _validate_flow_rate(flow_rate)
+    _diameter = _validate_diameter(equivalent_diameter)
+    return (REYNOLDS_FACTOR * _flow_rate) / (
+        _diameter * np.asarray(viscosity, dtype=float)
+    )
+
+
+def reynolds_at_temp(
+    flow_rate, viscosity40, viscosity100, temperature, equivalent_diameter
+) -> np.ndarray:
+    """Calculate Reynolds number (Re) at any temperature."""
+    a, b = walther_coefficients(viscosity40, viscosity100)
+    viscosity = walther_viscosity(a, b, temperature)
+    return reynolds_number(flow_rate, viscosity, equivalent_diameter)
+
+
+def flow_type_codes(number) -> np.ndarray:
+    """Return the flow type code of every Reynolds number.
+
+    0 => Laminar flow (Re <= 2100)
+    1 => Mixed flow (2100 < Re <= 4000)
+    2 => Turbulent flow (Re > 4000)
+
+    Use FLOW_TYPES to map the codes back to flow types.
+    """
+    _number = np.asarray(number, dtype=float)
+    return (
+        (_number > LAMINAR_LIMIT).astype(np.int8)
+        + (_number > TURBULENT_LIMIT).astype(np.int8)
+    )
+
+
+def transition_temperatures(
+    flow_rate, viscosity40, viscosity100, equivalent_diameter
+) -> _Transitions:
+    """Calculate the temperatures (ºC) where the flow type changes.
+
+    The Reynolds thresholds are turned into threshold viscosities and then
+    taken through the inverse of the ASTM D341 relation:
+
+              K * Q
+        v* = --------
+              Lc * Re*
+
+        T* = 10 ^ ((a - log10(log10(v* + 0.7))) / b) - 273.15
+
+    where:
+        Re*: 2100 for the laminar limit and 4000 for the turbulent onset
+        a, b: ASTM D341 coefficients of the oil
+
+    laminar: Temperature where the flow stops being laminar.
+    turbulent: Temperature where the flow becomes turbulent.
+
+    Temperatures outside the valid temperature range are returned as NaN.
+    """
+    _flow_rate = _validate_flow_rate(flow_rate)
+    _diameter = _validate_diameter(equivalent_diameter)
+    a, b = walther_coefficients(viscosity40, viscosity100)
+    viscosity = REYNOLDS_FACTOR * _flow_rate / _diameter
+
+    def threshold(limit):
+        temperature = walther_temperature(a, b, viscosity / limit)
+        outside = ~(
+            (temperature >= MIN_TEMPERATURE)
+            & (temperature <= MAX_TEMPERATURE)
+        )
+        return np.where(outside, np.nan, temperature)
+
+    return _Transitions(threshold(LAMINAR_LIMIT), threshold(TURBULENT_LIMIT))
+
+
+def smallest_pipe_diameters(
+    flow_rate,
+    viscosity40,
+    viscosity100,
+    min_temperature,
+    max_temperature,
+    diameters,
+    reynolds_limit=LAMINAR_LIMIT,
+) -> np.ndarray:
+    """Return the smallest catalogue diameter that meets a Reynolds limit.
+
+    Vectorized version of smallest_pipe_diameter(). The lowest viscosity
+    in the temperature range gives the highest Reynolds number, which
+    sets the minimum diameter:
+
+                  K * Q
+        D_min = -----------
+                 Re* * v_min
+
+    The catalogue is then searched with one binary search per line.
+
+    diameters: Catalogue of pipe bores (mm) sorted in ascending order.
+
+    Lines that no diameter in the catalogue can serve get NaN.
+    """
+    _diameters = _validate_diameter(diameters)
+    if (np.diff(_diameters) < 0).any():
+        raise ConceptError("Pipe diameters must be sorted in ascending order")
+    _flow_rate = _validate_flow_rate(flow_rate)
+    a, b = walther_coefficients(viscosity40, viscosity100)
+    viscosity = np.minimum(
+        walther_viscosity(a, b, min_temperature),
+        walther_viscosity(a, b, max_temperature),
+    )
+    required = REYNOLDS_FACTOR * _flow_rate / (
+        np.asarray(reynolds_limit, dtype=float) * viscosity
+    )
+    index = np.searchsorted(_diameters, required, side="left")
+    found = index < len(_diameters)
+    return np.where(
+        found, _diameters[np.minimum(index, len(_diameters) - 1)], np.nan
+    )
@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides a lubrication circuit network model.
+
+A network is made of nodes joined by pipe branches. Supply nodes have a
+fixed pressure and consumer nodes draw a fixed flow rate. The solver finds
+the node pressures, the flow split between branches, and the Reynolds
+number, flow type and pressure drop of every branch.
+
+NumPy is required. SciPy is used for the linear solves when it's
+installed. Otherwise a Jacobi preconditioned conjugate gradient written
+with NumPy is used. Both only touch the non-zero entries of the network
+matrix, so they scale to thousands of branches.
+"""
+
+import math
+from collections import deque, namedtuple
+from typing import Sequence
+
+import numpy as np
+
+from lubepy import MAX_OIL_DENSITY, MIN_OIL_DENSITY
+from lubepy.exceptions import ConceptError
+from lubepy.fluid.batch import _validate_diameter, flow_type_codes
+from lubepy.fluid.reynolds import (
+    LAMINAR_LIMIT,
+    REYNOLDS_FACTOR,
+    TURBULENT_LIMIT,
+    session_equivalent_diameter,
+)
+from lubepy.lube.batch import viscosity_at_any_temp
+from lubepy.metrics import instrumented, record_iterations
+from lubepy.validator.array import _validate_or_raise as _validate
+
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.linalg import spsolve
+except ImportError:
+    csr_matrix = spsolve = None
+
+# name: Node name
+# pressure: Supply pressure (bar), None for consumers and junctions
+# demand: Flow rate drawn from the node (L/h)
+Node = namedtuple("Node", ["name", "pressure", "demand"])
+Node.__new__.__defaults__ = (None, 0.0)
+
+# start, end: Node names, positive flow goes from start to end
+# length: Branch length (m)
+# session: CircularSession, SquareSession or RectangularSession
+Branch = namedtuple("Branch", ["start", "end", "length", "session"])
+
+_NetworkSolution = namedtuple(
+    "_NetworkSolution",
+    [
+        "pressures",
+        "flow_rates",
+        "reynolds_numbers",
+        "flow_types",
+        "pressure_drops",
+        "iterations",
+    ],
+)
+
+_LITERS_PER_HOUR = 1 / 3.6e6  # m^3/s
+_PASCAL_PER_BAR = 1e5
+_SOLVER = "lubepy.fluid.network.LubricationNetwork.solve"
+_BLASIUS_LIMIT = 0.3164 * TURBULENT_LIMIT ** -0.25
+
+
+@instrumented()
+def solve_network(
+    nodes: Sequence[Node],
+    branches: Sequence[Branch],
+    viscosity40: float,
+    viscosity100: float,
+    temperature: float,
+    density: float,
+) -> _NetworkSolution:
+    """Solve the flow split of a lubrication network."""
+    return LubricationNetwork(nodes, branches).solve(
+        viscosity40, viscosity100, temperature, density
+    )
+
+
+class LubricationNetwork:
+    """Class to calculate the flow split of a lubrication network."""
+
+    def __init__(
+        self, nodes: Sequence[Node], branches: Sequence[Branch]
+    ) -> None:
+        """Class initializer.
+
+        nodes: Network nodes, at least one of them with a supply pressure.
+        branches: Pipe branches between the nodes.
+        """
+        index = {node.name: i for i, node in enumerate(nodes)}
+        if len(index) != len(nodes):
+            raise ConceptError("Node names must be unique")
+        try:
+            self._start = np.array([index[b.start] for b in branches], int)
+            self._end = np.array([index[b.end] for b in branches], int)
+        except KeyError as error:
+            raise ConceptError(
+                f"{error.args[0]} is not a network node"
+            ) from None
+
+        self._lengths = _validate(
+            "Branch length",
+            [branch.length for branch in branches],
+            0.0,
+            math.inf,
+        )
+        if not self._lengths.all():
+            raise ConceptError("Branch length must be greater than 0")
+        self._diameters = _validate_diameter(
+            [session_equivalent_diameter(b.session) for b in branches]
+        )
+        self._fixed = np.array([node.pressure is not None for node in nodes])
+        if not self._fixed.any():
+            raise ConceptError("The network needs at least one supply node")
+        self._pressures = np.array(
+            [node.pressure or 0.0 for node in nodes], dtype=float
+        )
+        self._demands = np.array(
+            [node.demand for node in nodes], dtype=float
+        )
+        self._check_connected(len(nodes))
+
+    def _check_connected(self, size: int) -> None:
+        """Check that every node can be reached from a supply node."""
+        neighbors = [[] for _ in range(size)]
+        for start, end in zip(self._start.tolist(), self._end.tolist()):
+            neighbors[start].append(end)
+            neighbors[end].append(start)
+        reached = self._fixed.copy()
+        queue = deque(np.flatnonzero(reached).tolist())
+        while queue:
+            for node in neighbors[queue.popleft()]:
+                if not reached[node]:
+                    reached[node] = True
+                    queue.append(node)
+        if not reached.all():
+            raise ConceptError("Every node must be connected to a supply node")
+
+    def solve(
+        self,
+        viscosity40: float,
+        viscosity100: float,
+        temperature: float,
+        density: float,
+        tolerance: float = 1e-6,
+        max_iterations: int = 200,
+    ) -> _NetworkSolution:
+        """Solve the node pressures and the flow split of the network.
+
+        Every branch follows the Darcy-Weisbach equation:
+
+                     L   rho * V^2
+        dp = f(Re) * - * ---------
+                     D       2
+
+        where the friction factor depends on the flow type:
+            Laminar flow: f = 64 / Re (Hagen-Poiseuille)
+            Turbulent flow: f = 0.3164 / Re^0.25 (Blasius)
+            Mixed flow: Linear interpolation between both limits
+
+        The branch resistances depend on the flow, so the linear network
+        problem is solved again with updated resistances until the flow
+        rates converge.
+        """
+        viscosity = float(
+            viscosity_at_any_temp(viscosity40, viscosity100, temperature)
+        )
+        density = float(
+            _validate("Oil density", density, MIN_OIL_DENSITY, MAX_OIL_DENSITY)
+        )
+        diameter = self._diameters * 1e-3
+        laminar_resistance = (
+            128
+            * density
+            * 1e3
+            * viscosity
+            * 1e-6
+            * self._lengths
+            / (math.pi * diameter ** 4)
+        )
+
+        factor = np.ones_like(self._lengths)
+        for iteration in range(1, max_iterations + 1):
+            conductance = 1.0 / (laminar_resistance * factor)
+            pressures = self._solve_pressures(conductance)
+            drops = pressures[self._start] - pressures[self._end]
+            flow_rates = conductance * drops / _LITERS_PER_HOUR
+            reynolds = (
+                REYNOLDS_FACTOR
+                * np.abs(flow_rates)
+                / (self._diameters * viscosity)
+            )
+            new_factor = _friction_factor_ratio(reynolds)
+            if np.allclose(new_factor, factor, rtol=tolerance, atol=0.0):
+                break
+            # Under-relaxation keeps the turbulent branches from oscillating
+            factor = 0.5 * (factor + new_factor)
+        else:
+            record_iterations(_SOLVER, max_iterations)
+            raise ConceptError(
+                f"The network did not converge in {max_iterations} iterations"
+            )
+        record_iterations(_SOLVER, iteration)
+
+        return _NetworkSolution(
+            pressures / _PASCAL_PER_BAR,
+            flow_rates,
+            reynolds,
+            flow_type_codes(reynolds),
+            drops / _PASCAL_PER_BAR,
+            iteration,
+        )
+
+    def _solve_pressures(self, conductance: np.ndarray) -> np.ndarray:
+        """Solve the node pressures (Pa) for given branch conductances.
+
+        Flow conservation at every free node gives the linear system
+        A * G * A^T * p = -q, where A is the node-branch incidence matrix,
+        G the branch conductances and q the node demands.
+        """
+        fixed = self._fixed
+        free = ~fixed
+        pressures = np.where(fixed, self._pressures * _PASCAL_PER_BAR, 0.0)
+        rhs = (
+            -self._demands * _LITERS_PER_HOUR
+            - self._laplacian_product(conductance, pressures)
+        )[free]
+        if rhs.size:
+            if spsolve is not None:
+                pressures[free] = self._sparse_solve(conductance, free, rhs)
+            else:
+                pressures[free] = self._conjugate_gradient(
+                    conductance, free, rhs
+                )
+        return pressures
+
+    def _laplacian_product(self, conductance, vector) -> np.ndarray:
+        """Multiply the network matrix A * G * A^T by a node vector."""
+        flows = conductance * (vector[self._start] - vector[self._end])
+        size = len(vector)
+        return np.bincount(
+            self._start, flows, minlength=size
+        ) - np.bincount(self._end, flows, minlength=size)
+
+    def _sparse_solve(self, conductance, free, rhs) -> np.ndarray:
+        size = len(free)
+        rows = np.concatenate(
+            [self._start, self._end, self._start, self._end]
+        )
+        columns = np.concatenate(
+            [self._start, self._end, self._end, self._start]
+        )
+        values = np.concatenate(
+            [conductance, conductance, -conductance, -conductance]
+        )
+        matrix = csr_matrix((values, (rows, columns)), shape=(size, size))
+        return spsolve(matrix[free][:, free].tocsc(), rhs)
+
+    def _conjugate_gradient(self, conductance, free, rhs) -> np.ndarray:
+        """Solve the free node pressures with preconditioned CG."""
+        size = len(free)
+        diagonal = (
+            np.bincount(self._start, conductance, minlength=size)
+            + np.bincount(self._end, conductance, minlength=size)
+        )[free]
+        vector = np.zeros(size)
+
+        def product(values):
+            vector[free] = values
+            return self._laplacian_product(conductance, vector)[free]
+
+        solution = rhs / diagonal
+        residual = rhs - product(solution)
+        preconditioned = residual / diagonal
+        direction = preconditioned.copy()
+        rz = residual @ preconditioned
+        limit = 1e-12 * np.linalg.norm(rhs)
+        for _ in range(10 * len(rhs)):
+            if np.linalg.norm(residual) <= limit:
+                break
+            step = product(direction)
+            alpha = rz / (direction @ step)
+            solution += alpha * direction
+            residual -= alpha * step
+            preconditioned = residual / diagonal
+            new_rz = residual @ preconditioned
+            direction = preconditioned + (new_rz / rz) * direction
+            rz = new_rz
+        return solution
+
+
+def _friction_factor_ratio(reynolds: np.ndarray) -> np.ndarray:
+    """Return f(Re) / f_laminar(Re) for every branch.
+
+    This ratio scales the laminar (Hagen-Poiseuille) resistance.
+    """
+    laminar = 64.0 / np.maximum(reynolds, 1e-12)
+    turbulent = 0.3164 * np.maximum(reynolds, 1e-12) ** -0.25
+    weight = (reynolds - LAMINAR_LIMIT) / (TURBULENT_LIMIT - LAMINAR_LIMIT)
+    mixed = (1 - weight) * 64.0 / LAMINAR_LIMIT + weight * _BLASIUS_LIMIT
+    codes = flow_type_codes(reynolds)
+    friction = np.choose(codes, [laminar, mixed, turbulent])
+    return friction / laminar
@@ -19,43 +19,63 @@
 
 """This module provides the Reynold number calculations."""
 
+from collections import namedtuple
+from collections.abc import Sequence
 from enum import Enum
+from numbers import Real
+from typing import Iterable, List, Optional, Union
 
+from lubepy.exceptions import ConceptError
+from lubepy.metrics import instrumented
 from lubepy.validator.core import (
     FlowRate,
     PipeSession,
 )
-from lubepy import MIN_PIPE_EQUIVALENT_DIAMETER
-from lubepy.lube.viscosity import viscosity_at_any_temp
+from lubepy import MAX_PIPE_EQUIVALENT_DIAMETER, MIN_PIPE_EQUIVALENT_DIAMETER
+from lubepy.lube.oil import accepts_oil
+from lubepy.lube.viscosity import viscosity_at_temp
 from lubepy.validator.core import ParamValidator
 
+# Conversion factor for flow rate in L/h, length in mm and viscosity in cSt
+REYNOLDS_FACTOR = 353.9606
+LAMINAR_LIMIT = 2_100.0
+TURBULENT_LIMIT = 4_000.0
 
+
+@instrumented()
+@accepts_oil
 def reynolds_circular_session(
     flow_rate: float,
     viscosity40: float,
     viscosity100: float,
     temperature: float,
     diameter: float,
+    raw: bool = False,
 ) -> float:
     """Calculate Reynolds number (Re)."""
     return ReynoldsNumber(
-        flow_rate, viscosity40, viscosity100, temperature
+        flow_rate, viscosity40, viscosity100, temperature, raw=raw
     ).reynolds_circular_session(diameter)
 
 
+@instrumented()
+@accepts_oil
 def reynolds_square_session(
     velocity: float,
     viscosity40: float,
     viscosity100: float,
     temperature: float,
     side: float,
+    raw: bool = False,
 ) -> float:
     """Calculate Reynolds number (Re)."""
     return ReynoldsNumber(
-        velocity, viscosity40, viscosity100, temperature
+        velocity, viscosity40, viscosity100, temperature, raw=raw
     ).reynolds_square_session(side)
 
 
+@instrumented()
+@accepts_oil
 def reynolds_rectangular_session(
     velocity: float,
     viscosity40: float,
@@ -63,39 +83,48 @@ def reynolds_rectangular_session(
     temperature: float,
     base: float,
     height: float,
+    raw: bool = False,
 ) -> float:
     """Calculate Reynolds number (Re)."""
     return ReynoldsNumber(
-        velocity, viscosity40, viscosity100, temperature
+        velocity, viscosity40, viscosity100, temperature, raw=raw
     ).reynolds_rectangular_session(base, height)
 
 
+@instrumented()
+@accepts_oil
 def flow_type_circular_session(
     velocity: float,
     viscosity40: float,
     viscosity100: float,
     temperature: float,
     diameter: float,
+    raw: bool = False,
 ) -> str:
     """Determine the flow type of a fluid."""
     return FluidFlowType(
-        velocity, viscosity40, viscosity100, temperature
+        velocity, viscosity40, viscosity100, temperature, raw=raw
     ).flow_type_circular_session(diameter)
 
 
+@instrumented()
+@accepts_oil
 def flow_type_square_session(
     velocity: float,
     viscosity40: float,
     viscosity100: float,
     temperature: float,
     side: float,
+    raw: bool = False,
 ) -> str:
     """Determine the flow type of a fluid."""
     return FluidFlowType(
-        velocity, viscosity40, viscosity100, temperature
+        velocity, viscosity40, viscosity100, temperature, raw=raw
     ).flow_type_square_session(side)
 
 
+@instrumented()
+@accepts_oil
 def flow_type_rectangular_session(
     velocity: float,
     viscosity40: float,
@@ -103,30 +132,174 @@ def flow_type_rectangular_session(
     temperature: float,
     base: float,
     height: float,
+    raw: bool = False,
 ) -> str:
     """Determine the flow type of a fluid."""
     return FluidFlowType(
-        velocity, viscosity40, viscosity100, temperature
+        velocity, viscosity40, viscosity100, temperature, raw=raw
     ).flow_type_rectangular_session(base, height)
 
 
+CircularSession = namedtuple("CircularSession", ["diameter"])
+SquareSession = namedtuple("SquareSession", ["side"])
+RectangularSession = namedtuple("RectangularSession", ["base", "height"])
+
+
+def session_equivalent_diameter(session) -> float:
+    """Return the equivalent diameter (mm) of a pipe session."""
+    if isinstance(session, CircularSession):
+        return session.diameter
+    if isinstance(session, SquareSession):
+        return session.side
+    if isinstance(session, RectangularSession):
+        validate = ParamValidator()
+        base = validate("Base", session.base)
+        height = validate("Height", session.height)
+        return (2 * base * height) / (base + height)
+    raise TypeError(f"{type(session)} is not a valid pipe session")
+
+
+@instrumented()
+@accepts_oil
+def reynolds_circuit(
+    flow_rate: Union[float, Iterable],
+    viscosity40: float,
+    viscosity100: float,
+    temperature: float,
+    sessions: Sequence,
+    raw: bool = False,
+) -> List[float]:
+    """Calculate Reynolds number (Re) for every session of a circuit."""
+    return PipeCircuit(
+        viscosity40, viscosity100, temperature, raw=raw
+    ).reynolds_numbers(flow_rate, sessions)
+
+
+@instrumented()
+@accepts_oil
+def flow_type_circuit(
+    flow_rate: Union[float, Iterable],
+    viscosity40: float,
+    viscosity100: float,
+    temperature: float,
+    sessions: Sequence,
+    raw: bool = False,
+) -> list:
+    """Determine the flow type for every session of a circuit."""
+    return PipeCircuit(
+        viscosity40, viscosity100, temperature, raw=raw
+    ).flow_types(flow_rate, sessions)
+
+
+@instrumented()
+@accepts_oil
+def smallest_pipe_diameter(
+    flow_rate: float,
+    viscosity40: float,
+    viscosity100: float,
+    min_temperature: float,
+    max_temperature: float,
+    diameters: Sequence,
+    reynolds_limit: float = LAMINAR_LIMIT,
+    raw: bool = False,
+) -> Optional[float]:
+    """Return the smallest catalogue diameter that meets a Reynolds limit.
+
+    The Reynolds number must stay under the limit (laminar flow by
+    default) in the whole temperature range. The viscosity changes
+    monotonically with temperature, so it's enough to check both ends of
+    the range. Reynolds number decreases with the diameter, so the
+    catalogue is binary searched.
+
+    diameters: Catalogue of pipe bores (mm) sorted in ascending order.
+        Every bore is validated, not only those the search checks.
+    raw: Compare unrounded Reynolds numbers with the limit.
+
+    Return the diameter as a float, or None if no diameter in the
+    catalogue meets the limit.
+    """
+    validate = ParamValidator()
+    diameters = [
+        validate(
+            "Pipe equivalent diameter",
+            diameter,
+            MIN_PIPE_EQUIVALENT_DIAMETER,
+            MAX_PIPE_EQUIVALENT_DIAMETER,
+        )
+        for diameter in diameters
+    ]
+    if any(a > b for a, b in zip(diameters, diameters[1:])):
+        raise ConceptError("Pipe diameters must be sorted in ascending order")
+
+    envelope = [
+        ReynoldsNumber(
+            flow_rate, viscosity40, viscosity100, temperature, raw=raw
+        )
+        for temperature in (min_temperature, max_temperature)
+    ]
+
+    def meets_limit(diameter):
+        return all(
+            reynolds.reynolds_circular_session(diameter) <= reynolds_limit
+            for reynolds in envelope
+        )
+
+    low, high = 0, len(diameters)
+    while low < high:
+        middle = (low + high) // 2
+        if meets_limit(diameters[middle]):
+            high = middle
+        else:
+            low = middle + 1
+
+    return diameters[low] if low < len(diameters) else None
+
+
 class ReynoldsNumber:
     """Class for calculations related to Reynolds number."""
 
     _flow_rate = FlowRate("Flow rate")
     _equivalent_diameter = PipeSession("Pipe equivalent diameter")
 
+    @accepts_oil
     def __init__(
         self,
         flow_rate: float,
         viscosity40: float,
         viscosity100: float,
         temperature: float,
+        model="walther",
+        raw: bool = False,
     ) -> None:
-        self._flow_rate = flow_rate
-        self._viscosity = viscosity_at_any_temp(
-            viscosity40, viscosity100, temperature
+        """Class initializer.
+
+        model: Viscosity-temperature model of the oil, the name of a
+            registered model or a fitted ViscosityCurve (see
+            lubepy.lube.viscosity).
+        raw: Build on the full precision viscosity and return full
+            precision Reynolds numbers, instead of rounding both.
+        """
+        self._setup(
+            flow_rate,
+            viscosity_at_temp(
+                viscosity40, viscosity100, temperature, model, raw
+            ),
+            raw,
         )
+
+    @classmethod
+    def _from_viscosity(
+        cls, flow_rate: float, viscosity: float, raw: bool = False
+    ) -> "ReynoldsNumber":
+        """Build an instance from an already calculated viscosity."""
+        reynolds = cls.__new__(cls)
+        reynolds._setup(flow_rate, viscosity, raw)
+        return reynolds
+
+    def _setup(self, flow_rate: float, viscosity: float, raw: bool) -> None:
+        self._flow_rate = flow_rate
+        self._viscosity = viscosity
+        self._raw = raw
         self._equivalent_diameter = MIN_PIPE_EQUIVALENT_DIAMETER
 
     def _reynolds_number(self, equivalent_diameter: float) -> float:
@@ -149,14 +322,13 @@ class ReynoldsNumber:
                     a, b: sides
             v: Kinematic Viscosity (cSt)
         """
-        K = 353.9606
+        K = REYNOLDS_FACTOR
         self._equivalent_diameter = equivalent_diameter
 
-        return round(
-            (K * self._flow_rate)
-            / (self._equivalent_diameter * self._viscosity),
-            1,
+        number = (K * self._flow_rate) / (
+            self._equivalent_diameter * self._viscosity
         )
+        return number if self._raw else round(number, 1)
 
     def _reynolds_circular_square(self, equivalent_diameter):
         return self._reynolds_number(equivalent_diameter=equivalent_diameter)
@@ -185,15 +357,18 @@ class _FlowTypes(Enum):
 
 
 class FluidFlowType:
+    @accepts_oil
     def __init__(
         self,
         flow_rate: float,
         viscosity40: float,
         viscosity100: float,
         temperature: float,
+        model="walther",
+        raw: bool = False,
     ) -> None:
         self._reynolds_number = ReynoldsNumber(
-            flow_rate, viscosity40, viscosity100, temperature,
+            flow_rate, viscosity40, viscosity100, temperature, model, raw
         )
 
     @staticmethod
@@ -204,9 +379,9 @@ class FluidFlowType:
         2100.0 < reynolds <= 4000.0 => Mixed flow
         Re > 4000 => Turbulent flow
         """
-        if number <= 2_100.0:
+        if number <= LAMINAR_LIMIT:
             return _FlowTypes.LAMINAR
-        if number > 4_000.0:
+        if number > TURBULENT_LIMIT:
             return _FlowTypes.TURBULENT
 
         return _FlowTypes.MIXED
@@ -224,3 +399,83 @@ class FluidFlowType:
             base, height
         )
         return self._flow_type(number)
+
+
+class PipeCircuit:
+    """Class for Reynolds number calculations on a pipe circuit.
+
+    The oil viscosity is calculated once at the circuit temperature and
+    then shared by every pipe session of the circuit. Sessions can be any
+    mix of CircularSession, SquareSession and RectangularSession.
+    """
+
+    @accepts_oil
+    def __init__(
+        self,
+        viscosity40: float,
+        viscosity100: float,
+        temperature: float,
+        model="walther",
+        raw: bool = False,
+    ) -> None:
+        """Class initializer.
+
+        model: Viscosity-temperature model, as in ReynoldsNumber.
+        raw: Full precision calculations, as in ReynoldsNumber.
+        """
+        self._raw = raw
+        self._viscosity = viscosity_at_temp(
+            viscosity40, viscosity100, temperature, model, raw
+        )
+
+    def reynolds_numbers(
+        self, flow_rate: Union[float, Iterable], sessions: Sequence
+    ) -> List[float]:
+        """Calculate Reynolds number (Re) for every session.
+
+        flow_rate: A single flow rate (L/h) for all the sessions or an
+            iterable (such as a list or a NumPy array) with one flow rate
+            per session.
+        """
+        return [
+            self._reynolds_number(rate, session)
+            for rate, session in zip(
+                self._flow_rates(flow_rate, len(sessions)), sessions
+            )
+        ]
+
+    def flow_types(
+        self, flow_rate: Union[float, Iterable], sessions: Sequence
+    ) -> List[_FlowTypes]:
+        """Determine the flow type for every session."""
+        return [
+            FluidFlowType._flow_type(number)
+            for number in self.reynolds_numbers(flow_rate, sessions)
+        ]
+
+    @staticmethod
+    def _flow_rates(flow_rate, count: int) -> Sequence:
+        if isinstance(flow_rate, (Real, str)):
+            return [flow_rate] * count
+        try:
+            flow_rates = list(flow_rate)
+        except TypeError:
+            # Not iterable, so the validation will judge it
+            return [flow_rate] * count
+        if len(flow_rates) != count:
+            raise ConceptError("There must be one flow rate per pipe session")
+        return flow_rates
+
+    def _reynolds_number(self, flow_rate: float, session) -> float:
+        reynolds = ReynoldsNumber._from_viscosity(
+            flow_rate, self._viscosity, self._raw
+        )
+        if isinstance(session, CircularSession):
+            return reynolds.reynolds_circular_session(session.diameter)
+        if isinstance(session, SquareSession):
+            return reynolds.reynolds_square_session(session.side)
+        if isinstance(session, RectangularSession):
+            return reynolds.reynolds_rectangular_session(
+                session.base, session.height
+            )
+        raise TypeError(f"{type(session)} is not a valid pipe session")
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides the cold start warm-up simulation.
+
+During a warm-up the oil temperature of every line changes with time, and
+so do its viscosity and flow type. The simulation walks the temperature
+profiles one time step at a time, so memory only depends on the number of
+lines, not on the number of time steps.
+"""
+
+from collections import namedtuple
+from itertools import zip_longest
+from typing import Iterable
+
+import numpy as np
+
+from lubepy.exceptions import ConceptError
+from lubepy.fluid.batch import (
+    _validate_diameter,
+    _validate_flow_rate,
+    flow_type_codes,
+)
+from lubepy.fluid.reynolds import REYNOLDS_FACTOR
+from lubepy.lube.batch import walther_coefficients, walther_viscosity
+
+_Warmup = namedtuple(
+    "_Warmup",
+    [
+        "laminar",
+        "mixed",
+        "turbulent",
+        "transitions",
+        "viscosities",
+        "flow_types",
+    ],
+)
+
+# Fills the shorter of times and temperatures
+_END = object()
+
+
+def warmup_flow_types(
+    times: Iterable[float],
+    temperatures: Iterable,
+    flow_rate,
+    viscosity40,
+    viscosity100,
+    equivalent_diameter,
+    trajectories: bool = False,
+) -> _Warmup:
+    """Simulate the flow type of many lines during a warm-up.
+
+    times: Time of every step, in ascending order.
+    temperatures: One array of line temperatures (ºC) per time step, for
+        example a (steps x lines) array or a generator of arrays. It must
+        have as many steps as times.
+    trajectories: Also return the (steps x lines) viscosities and flow
+        type codes. They're None by default to keep memory flat.
+
+    The flow type of a step holds until the next step, so the time spent
+    in each flow type adds up to the total simulated time. The time
+    results use the same unit as times.
+
+    Return the time spent in laminar, mixed and turbulent flow and the
+    number of flow type changes of every line.
+    """
+    a, b = walther_coefficients(viscosity40, viscosity100)
+    factor = (
+        REYNOLDS_FACTOR
+        * _validate_flow_rate(flow_rate)
+        / _validate_diameter(equivalent_diameter)
+    )
+    lines = np.broadcast(a, factor).shape
+    durations = np.zeros((3,) + lines)
+    transitions = np.zeros(lines, dtype=np.int64)
+    columns = np.indices(lines)
+    viscosities, flow_types = [], []
+    previous_time = previous_codes = None
+
+    for time, temperature in zip_longest(times, temperatures, fillvalue=_END):
+        if time is _END or temperature is _END:
+            raise ConceptError(
+                "Times and temperatures must have the same number of steps"
+            )
+        viscosity = walther_viscosity(a, b, temperature)
+        codes = np.broadcast_to(flow_type_codes(factor / viscosity), lines)
+        if previous_codes is not None:
+            step = time - previous_time
+            if step < 0:
+                raise ConceptError("Times must be in ascending order")
+            durations[(previous_codes,) + tuple(columns)] += step
+            transitions += codes != previous_codes
+        if trajectories:
+            viscosities.append(np.broadcast_to(viscosity, lines))
+            flow_types.append(codes)
+        previous_time, previous_codes = time, codes
+
+    return _Warmup(
+        durations[0],
+        durations[1],
+        durations[2],
+        transitions,
+        np.array(viscosities) if trajectories else None,
+        np.array(flow_types) if trajectories else None,
+    )
@@ -0,0 +1,373 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides vectorized viscosity calculations.
+
+The functions in this module take NumPy arrays (or anything NumPy can turn
+into an array) and return unrounded NumPy arrays. NumPy is an optional
+dependency, so this module is only imported by the batch APIs.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from lubepy import (
+    ASH_CONTRIBUTION,
+    MAX_ADDITIVE_PERCENT,
+    MAX_OIL_DENSITY,
+    MAX_TEMPERATURE,
+    MAX_VISCOSITY_MINUS_5,
+    MAX_VISCOSITY_40,
+    MAX_VISCOSITY_100,
+    MIN_ADDITIVE_PERCENT,
+    MIN_OIL_DENSITY,
+    MIN_TEMPERATURE,
+    MIN_VISCOSITY,
+    SAE_J300_GRADES,
+)
+from lubepy.exceptions import ConceptError, ValidationError
+from lubepy.lube.mixture import _TEMPERATURE_CORRECTION
+from lubepy.lube.viscosity import (
+    _INTERPOLATION_COEFS,
+    _ISO_VG_BANDS,
+    _TO_KELVIN,
+)
+from lubepy.validator.array import _validate_or_raise as _validate
+
+_LOG_T40 = np.log10(40 + _TO_KELVIN)
+_LOG_T100 = np.log10(100 + _TO_KELVIN)
+
+_Walther = namedtuple("_Walther", ["a", "b"])
+
+# oils: Sorted oil ids
+# a, b: ASTM D341 coefficients of every oil (NaN if under two temperatures)
+# rms: Root mean square of the residuals of every oil (cSt)
+# residuals: Measured minus fitted viscosity of every measurement (cSt)
+_WaltherFit = namedtuple("_WaltherFit", ["oils", "a", "b", "rms", "residuals"])
+
+# ASTM D2270 KV100 range lower bounds and their interpolation coefficients
+_KV100_BOUNDS = np.array([low for low, _ in _INTERPOLATION_COEFS])
+_COEFS = np.array(list(_INTERPOLATION_COEFS.values()))
+
+
+# Grade codes index into these tables
+ISO_VG_CODES = tuple(grade for grade, _, _ in _ISO_VG_BANDS)
+SAE_CODES = tuple(SAE_J300_GRADES)
+
+# Sorted grade limits: ISO 3448 KV40 bands and SAE J300 KV100 ranges
+_ISO_VG_LOWER = np.array([lower for _, lower, _ in _ISO_VG_BANDS])
+_ISO_VG_UPPER = np.array([upper for _, _, upper in _ISO_VG_BANDS])
+_SAE_LOWER = np.array([lower for lower, _ in SAE_J300_GRADES.values()])
+_SAE_UPPER = np.array([upper for _, upper in SAE_J300_GRADES.values()])
+
+_GradeCodes = namedtuple("_GradeCodes", ["codes", "off_grade"])
+
+
+_MAX_VISCOSITY = {
+    "-5": MAX_VISCOSITY_MINUS_5,
+    "40": MAX_VISCOSITY_40,
+    "100": MAX_VISCOSITY_100,
+}
+
+
+def _validate_viscosity40(viscosity40) -> np.ndarray:
+    return _validate(
+        "Viscosity at 40", viscosity40, MIN_VISCOSITY, MAX_VISCOSITY_40
+    )
+
+
+def _validate_viscosity100(viscosity100) -> np.ndarray:
+    return _validate(
+        "Viscosity at 100", viscosity100, MIN_VISCOSITY, MAX_VISCOSITY_100
+    )
+
+
+def walther_coefficients(viscosity40, viscosity100) -> _Walther:
+    """Calculate the ASTM D341 coefficients from KV40 and KV100.
+
+    log10(log10(v + 0.7)) = a - b * log10(T)
+    where:
+        v: Kinematic viscosity (cSt)
+        T: Temperature (K)
+    """
+    return _walther_coefficients(
+        _validate_viscosity40(viscosity40),
+        _validate_viscosity100(viscosity100),
+    )
+
+
+def _walther_coefficients(viscosity40, viscosity100) -> _Walther:
+    """Calculate the ASTM D341 coefficients of already validated arrays."""
+    x = np.log10(np.log10(viscosity40 + 0.7))
+    y = np.log10(np.log10(viscosity100 + 0.7))
+    b = (x - y) / (_LOG_T100 - _LOG_T40)
+    a = x + b * _LOG_T40
+    return _Walther(a, b)
+
+
+def walther_viscosity(a, b, temperature) -> np.ndarray:
+    """Evaluate the ASTM D341 relation at the given temperatures (ºC)."""
+    _temperature = _validate(
+        "Temperature", temperature, MIN_TEMPERATURE, MAX_TEMPERATURE
+    )
+    log_t = np.log10(_temperature + _TO_KELVIN)
+    return 10 ** (10 ** (a - b * log_t)) - 0.7
+
+
+def walther_temperature(a, b, viscosity) -> np.ndarray:
+    """Invert the ASTM D341 relation to get the temperature (ºC).
+
+    Return NaN where the viscosity can't be reached by the relation.
+    """
+    _viscosity = np.asarray(viscosity, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.log10(np.log10(_viscosity + 0.7))
+        return 10 ** ((a - z) / b) - _TO_KELVIN
+
+
+def fit_walther(oils, temperatures, viscosities) -> _WaltherFit:
+    """Fit the ASTM D341 coefficients of many oils by least squares.
+
+    The measurements are ragged: every oil may have any number of
+    (temperature, viscosity) points, given as three flat arrays.
+
+    oils: Oil id of every measurement, in any order.
+    temperatures: Temperatures of the measurements (ºC).
+    viscosities: Kinematic viscosities of the measurements (cSt).
+
+    The line log10(log10(v + 0.7)) = a - b * log10(T) is fitted for all
+    the oils at once, so a and b plug straight into walther_viscosity().
+    """
+    _temperatures = _validate(
+        "Temperature", temperatures, MIN_TEMPERATURE, MAX_TEMPERATURE
+    )
+    _viscosities = _validate("Viscosity", viscosities, MIN_VISCOSITY, None)
+    ids, group = np.unique(np.asarray(oils), return_inverse=True)
+    group = group.ravel()
+    if not len(group) == len(_temperatures) == len(_viscosities):
+        raise ConceptError("Every measurement needs an oil id")
+
+    x = np.log10(_temperatures + _TO_KELVIN)
+    z = np.log10(np.log10(_viscosities + 0.7))
+
+    def group_sum(values):
+        return np.bincount(group, weights=values, minlength=len(ids))
+
+    count = np.bincount(group, minlength=len(ids))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Centered sums keep the fit well conditioned
+        x_mean = group_sum(x) / count
+        z_mean = group_sum(z) / count
+        dx = x - x_mean[group]
+        sxx = group_sum(dx * dx)
+        slope = group_sum(dx * (z - z_mean[group])) / sxx
+    # Rounding leaves sxx tiny but positive for repeated temperatures, so
+    # the oils with fewer than two distinct temperatures are counted
+    pairs = np.unique(np.column_stack((group, _temperatures)), axis=0)
+    distinct = np.bincount(pairs[:, 0].astype(np.intp), minlength=len(ids))
+    slope[distinct < 2] = np.nan
+    b = -slope
+    a = z_mean - slope * x_mean
+
+    residuals = _viscosities - (10 ** (10 ** (a[group] - b[group] * x)) - 0.7)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rms = np.sqrt(group_sum(residuals ** 2) / count)
+    return _WaltherFit(ids, a, b, rms, residuals)
+
+
+def viscosity_at_any_temp(
+    viscosity40, viscosity100, temperature
+) -> np.ndarray:
+    """Calculate the kinematic viscosity at any temperature (ASTM D341)."""
+    a, b = walther_coefficients(viscosity40, viscosity100)
+    return walther_viscosity(a, b, temperature)
+
+
+def viscosity_index(viscosity40, viscosity100) -> np.ndarray:
+    """Calculate the Viscosity Index (VI) by ASTM-D2270.
+
+    Vectorized and unrounded version of viscosity.viscosity_index(). The
+    interpolation coefficients of every oil are picked with a binary
+    search over the KV100 ranges.
+    """
+    return _viscosity_index(
+        _validate_viscosity40(viscosity40),
+        _validate_viscosity100(viscosity100),
+    )
+
+
+def _viscosity_index(viscosity40: np.ndarray, viscosity100: np.ndarray):
+    """Calculate the VI of float arrays that are already validated."""
+    index = np.searchsorted(_KV100_BOUNDS, viscosity100, side="right") - 1
+    a, b, c, d, e, f = np.moveaxis(_COEFS[index], -1, 0)
+    L = a * viscosity100 ** 2 + b * viscosity100 + c
+    H = d * viscosity100 ** 2 + e * viscosity100 + f
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        N = (np.log10(H) - np.log10(viscosity40)) / np.log10(viscosity100)
+        return np.where(
+            viscosity40 >= H,
+            ((L - viscosity40) / (L - H)) * 100,
+            ((10 ** N - 1) / 0.00715) + 100,
+        )
+
+
+def _mixture_setup(temperature: str, *viscosities):
+    if temperature not in _TEMPERATURE_CORRECTION:
+        raise ValidationError("Temperature must be one of: -5, 40 or 100")
+    correction = _TEMPERATURE_CORRECTION[temperature]
+    return correction, [
+        np.log(
+            _validate(
+                "Viscosity",
+                viscosity,
+                MIN_VISCOSITY,
+                _MAX_VISCOSITY[temperature],
+            )
+            + correction
+        )
+        for viscosity in viscosities
+    ]
+
+
+def mixture_viscosity(
+    first_viscosity, first_oil_percent, second_viscosity, temperature: str
+) -> np.ndarray:
+    """Return the resulting viscosity of mixes of two base oils.
+
+    Vectorized and unrounded version of mixture.mixture_viscosity().
+    """
+    correction, (b, a) = _mixture_setup(
+        temperature, first_viscosity, second_viscosity
+    )
+    x1 = _validate("First oil percent", first_oil_percent, 0.0, 100.0) / 100
+    return np.exp(a * np.exp(x1 * np.log(b / a))) - correction
+
+
+def mixture_proportions(
+    first_viscosity, second_viscosity, desired_viscosity, temperature: str
+) -> np.ndarray:
+    """Return the % of the first oil to get mixes of given viscosities.
+
+    Vectorized and unrounded version of mixture.mixture_proportions(). The
+    second oil percent is 100 minus the result. Return NaN where the
+    desired viscosity is outside the interval of the base oils.
+    """
+    _, (b, c, a) = _mixture_setup(
+        temperature, first_viscosity, second_viscosity, desired_viscosity
+    )
+    inside = (np.minimum(b, c) <= a) & (a <= np.maximum(b, c))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(inside, 100 * np.log(a / c) / np.log(b / c), np.nan)
+
+
+def additive_percent_mass(
+    additive_percent, additive_density, oil_density
+) -> np.ndarray:
+    """Calculate the % by mass of Additive in a motor oil."""
+    _percent = _validate(
+        "Additive percent",
+        additive_percent,
+        MIN_ADDITIVE_PERCENT,
+        MAX_ADDITIVE_PERCENT,
+    )
+    _additive_density = _validate(
+        "Additive density", additive_density, MIN_OIL_DENSITY, MAX_OIL_DENSITY
+    )
+    _oil_density = _validate(
+        "Oil density", oil_density, MIN_OIL_DENSITY, MAX_OIL_DENSITY
+    )
+    return (_additive_density * _percent) / _oil_density
+
+
+def total_ash(additive_percent, **metal_content) -> np.ndarray:
+    """Calculate the total content of sulfated ash.
+
+    metal_content: One array of metal content (% mass) per metal, e.g.
+        total_ash(percent, zinc=[1.66, 1.2], calcium=[0.47, 0.5])
+    """
+    _percent = _validate(
+        "Additive percent",
+        additive_percent,
+        MIN_ADDITIVE_PERCENT,
+        MAX_ADDITIVE_PERCENT,
+    )
+    ash = np.zeros_like(_percent)
+    for metal, content in metal_content.items():
+        metal = metal.strip().lower()
+        if metal not in ASH_CONTRIBUTION:
+            raise ConceptError(f"{metal} is not a valid additive metal")
+        _content = _validate(f"Metal content for {metal}", content, None, None)
+        ash = ash + _content * ASH_CONTRIBUTION[metal]
+    return ash * _percent / 100
+
+
+def iso_vg_codes(viscosity40) -> _GradeCodes:
+    """Classify KV40 values into ISO 3448 viscosity grades.
+
+    Return the grade code of every value, an index into ISO_VG_CODES, and
+    a mask of the off-grade values (outside every ±10 % band). Off-grade
+    values get the code of the nearest grade.
+    """
+    return _grade_codes(
+        _validate("Viscosity at 40", viscosity40, 0.0, None),
+        _ISO_VG_LOWER,
+        _ISO_VG_UPPER,
+        True,
+    )
+
+
+def sae_codes(viscosity100) -> _GradeCodes:
+    """Classify KV100 values into SAE J300 engine oil grades.
+
+    Return the grade code of every value, an index into SAE_CODES, and a
+    mask of the off-grade values. Only the KV100 ranges are checked, so
+    where the ranges of SAE 8 to 20 overlap (they differ by HTHS
+    viscosity), the highest grade is given. Off-grade values get the code
+    of the nearest grade.
+    """
+    return _grade_codes(
+        _validate("Viscosity at 100", viscosity100, 0.0, None),
+        _SAE_LOWER,
+        _SAE_UPPER,
+        False,
+    )
+
+
+def _grade_codes(
+    values: np.ndarray, lower: np.ndarray, upper: np.ndarray, inclusive: bool
+) -> _GradeCodes:
+    """Classify values into the grades of sorted lower and upper limits.
+
+    A binary search picks the highest grade whose lower limit is reached.
+    The upper limits are sorted too, so if that grade doesn't hold the
+    value, no grade does.
+    """
+    last = len(lower) - 1
+    index = np.searchsorted(lower, values, side="right") - 1
+    below = index < 0
+    index = np.maximum(index, 0)
+    limit = upper[index]
+    above = values > limit if inclusive else values >= limit
+    following = np.minimum(index + 1, last)
+    # Nearest of two grades by ratio to their limits (log scale)
+    closer = above & (lower[following] * limit < values * values)
+    codes = np.where(closer, following, index).astype(np.int8)
+    return _GradeCodes(codes, below | above)
@@ -22,9 +22,11 @@
 from typing import Dict
 
 from lubepy import MIN_OIL_DENSITY, ASH_CONTRIBUTION
+from lubepy.metrics import instrumented
 from lubepy.validator.core import OilDensity, AdditivePercent, MetalContent
 
 
+@instrumented()
 def additive_percent_mass(
     additive_percent: float, additive_density: float, oil_density: float
 ) -> float:
@@ -34,6 +36,7 @@ def additive_percent_mass(
     ).additive_percent_mass()
 
 
+@instrumented()
 def total_ash(metal_content: dict, additive_percent: float) -> float:
     """Calculate the total content of sulfated ash."""
     return OilBlend(
@@ -23,19 +23,65 @@ import math
 from collections import namedtuple
 
 from lubepy.exceptions import ConceptError
+from lubepy.metrics import instrumented
+from lubepy.lube.oil import Oil, accepts_oil
+from lubepy.lube.viscosity import fit_viscosity
 from lubepy.validator.core import Temperature, validate_viscosity
 
+# Temperature correction K of the mixture law, by temperature (ºC)
+_TEMPERATURE_CORRECTION = {"100": 1.8, "40": 4.1, "-5": 1.9}
 
+
+@instrumented()
 def mixture_viscosity(
     first_viscosity: float,
     first_oil_percent: float,
     second_viscosity: float,
     temperature: str,
+    raw: bool = False,
 ) -> float:
-    """Return the resulting viscosity of a mix of two base oils."""
+    """Return the resulting viscosity of a mix of two base oils.
+
+    raw: Return the full precision result instead of rounding it.
+    """
     return OilMixture(
         first_viscosity, second_viscosity, temperature
-    ).mixture_viscosity(first_oil_percent)
+    ).mixture_viscosity(first_oil_percent, raw)
+
+
+@instrumented()
+@accepts_oil
+def mixture_viscosity_at_temp(
+    first_viscosity40: float,
+    first_viscosity100: float,
+    second_viscosity40: float,
+    second_viscosity100: float,
+    first_oil_percent: float,
+    temperature: float,
+    model: str = "walther",
+    raw: bool = False,
+) -> float:
+    """Return the viscosity of a mix of two base oils at any temperature.
+
+    The mixture law gives the mix KV40 and KV100, and the viscosity model
+    (the name of a registered model) carries them to the temperature.
+
+    raw: Chain the full precision mix KV40 and KV100 and return the full
+        precision result, instead of rounding every step.
+    """
+    if isinstance(first_viscosity40, Oil):
+        first_viscosity100 = first_viscosity40
+    if isinstance(second_viscosity40, Oil):
+        second_viscosity100 = second_viscosity40
+    viscosity40 = OilMixture(
+        first_viscosity40, second_viscosity40, "40"
+    ).mixture_viscosity(first_oil_percent, raw)
+    viscosity100 = OilMixture(
+        first_viscosity100, second_viscosity100, "100"
+    ).mixture_viscosity(first_oil_percent, raw)
+    curve = fit_viscosity(model, (40.0, 100.0), (viscosity40, viscosity100))
+    v = curve.viscosity(temperature)
+    return v if raw else round(v, 2)
 
 
 _Proportions = namedtuple(
@@ -43,20 +89,28 @@ _Proportions = namedtuple(
 )
 
 
+@instrumented()
 def mixture_proportions(
     first_viscosity: float,
     second_viscosity: float,
     desired_viscosity: float,
     temperature: str,
+    raw: bool = False,
 ) -> _Proportions:
-    """Return proportions to get a mixture of a given viscosity."""
+    """Return proportions to get a mixture of a given viscosity.
+
+    raw: Return the full precision proportions instead of rounding them.
+    """
     return OilMixture(
         first_viscosity, second_viscosity, temperature
-    ).mixture_proportions(desired_viscosity)
+    ).mixture_proportions(desired_viscosity, raw)
 
 
 class OilMixture:
-    """Class to provide calculations on oil mixtures."""
+    """Class to provide calculations on oil mixtures.
+
+    The base oils are viscosities at the temperature or Oil objects.
+    """
 
     temperature = Temperature("Temperature")
 
@@ -65,15 +119,22 @@ class OilMixture:
     ) -> None:
         """Class initializer."""
         self.temperature = temperature
-        self.first_viscosity = validate_viscosity(
-            first_viscosity, self.temperature
-        )
-        self.second_viscosity = validate_viscosity(
-            second_viscosity, self.temperature
-        )
-        self.temp_map = {"100": 1.8, "40": 4.1, "-5": 1.9}
-
-    def mixture_viscosity(self, first_oil_percent: float) -> float:
+        self.first_viscosity = self._viscosity(first_viscosity)
+        self.second_viscosity = self._viscosity(second_viscosity)
+        self.temp_map = _TEMPERATURE_CORRECTION
+
+    def _viscosity(self, oil) -> float:
+        if isinstance(oil, Oil):
+            if self.temperature == "40":
+                return oil.viscosity40
+            if self.temperature == "100":
+                return oil.viscosity100
+            oil = oil.viscosity_at(float(self.temperature), raw=True)
+        return validate_viscosity(oil, self.temperature)
+
+    def mixture_viscosity(
+        self, first_oil_percent: float, raw: bool = False
+    ) -> float:
         """Return the resulting viscosity of a mix of two base oils.
 
         Mixture KV = e ^ (a * e ^ (x1 * log(b / a))) - K
@@ -92,9 +153,11 @@ class OilMixture:
         b = math.log(self.first_viscosity + K)
         mix_viscosity = math.exp(a * math.exp(x1 * math.log(b / a))) - K
 
-        return round(mix_viscosity, 2)
+        return mix_viscosity if raw else round(mix_viscosity, 2)
 
-    def mixture_proportions(self, desired_viscosity: float) -> _Proportions:
+    def mixture_proportions(
+        self, desired_viscosity: float, raw: bool = False
+    ) -> _Proportions:
         """Return proportions to get a mixture of a given viscosity.
 
         first_oil_percent = 100 * (math.log(a / c) / math.log(b / c))
@@ -128,6 +191,8 @@ class OilMixture:
         first_oil_percent = 100 * (math.log(a / c) / math.log(b / c))
         second_oil_percent = 100 - first_oil_percent
 
+        if raw:
+            return _Proportions(first_oil_percent, second_oil_percent)
         return _Proportions(
             round(first_oil_percent, 2), round(second_oil_percent, 2)
         )
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides the Oil value object."""
+
+from functools import wraps
+from typing import Optional, Tuple
+
+from lubepy.exceptions import ConceptError
+from lubepy.validator.core import validate_temperature, validate_viscosity
+
+# Marks a derived value that hasn't been calculated yet
+_MISSING = object()
+
+
+class Oil:
+    """Immutable oil defined by its KV40 and KV100 (cSt).
+
+    The viscosities are validated once, on creation. The derived values
+    (VI, Walther coefficients, ISO VG grade and model curves) are calculated
+    on first access and cached, so passing one Oil to many calculations
+    pays for validation and setup once.
+    """
+
+    __slots__ = (
+        "viscosity40",
+        "viscosity100",
+        "_viscosity_index",
+        "_walther",
+        "_iso_vg_grade",
+        "_curves",
+    )
+
+    def __init__(self, viscosity40: float, viscosity100: float) -> None:
+        """Class initializer."""
+        _set = object.__setattr__
+        _set(self, "viscosity40", validate_viscosity(viscosity40, "40"))
+        _set(self, "viscosity100", validate_viscosity(viscosity100, "100"))
+        _set(self, "_viscosity_index", _MISSING)
+        _set(self, "_walther", _MISSING)
+        _set(self, "_iso_vg_grade", _MISSING)
+        _set(self, "_curves", {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Oil objects are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Oil objects are immutable")
+
+    def __eq__(self, other):
+        if not isinstance(other, Oil):
+            return NotImplemented
+        return (self.viscosity40, self.viscosity100) == (
+            other.viscosity40,
+            other.viscosity100,
+        )
+
+    def __hash__(self):
+        return hash((self.viscosity40, self.viscosity100))
+
+    def __repr__(self):
+        return (
+            f"Oil(viscosity40={self.viscosity40!r}, "
+            f"viscosity100={self.viscosity100!r})"
+        )
+
+    def __reduce__(self):
+        return Oil, (self.viscosity40, self.viscosity100)
+
+    @property
+    def viscosity_index(self) -> int:
+        """Viscosity Index (VI) by ASTM-D2270."""
+        return round(self.raw_viscosity_index)
+
+    @property
+    def raw_viscosity_index(self) -> float:
+        """Unrounded Viscosity Index (VI) by ASTM-D2270."""
+        if self._viscosity_index is _MISSING:
+            from lubepy.lube.viscosity import _viscosity_index
+
+            object.__setattr__(
+                self,
+                "_viscosity_index",
+                _viscosity_index(self.viscosity40, self.viscosity100, True),
+            )
+        return self._viscosity_index
+
+    @property
+    def walther(self) -> Tuple[float, float]:
+        """ASTM D341 coefficients (a, b).
+
+        log10(log10(KV + 0.7)) = a - b * log10(T), with T in K.
+        """
+        if self._walther is _MISSING:
+            from lubepy.lube.viscosity import _walther_coefficients
+
+            object.__setattr__(
+                self,
+                "_walther",
+                _walther_coefficients(self.viscosity40, self.viscosity100),
+            )
+        return self._walther
+
+    @property
+    def iso_vg_grade(self) -> Optional[int]:
+        """ISO 3448 viscosity grade, None if KV40 is off-grade."""
+        if self._iso_vg_grade is _MISSING:
+            from lubepy.lube.viscosity import iso_vg_grade
+
+            object.__setattr__(
+                self, "_iso_vg_grade", iso_vg_grade(self.viscosity40)
+            )
+        return self._iso_vg_grade
+
+    def curve(self, model="walther"):
+        """Return the ViscosityCurve of a registered model for the oil.
+
+        The curve is fitted to KV40 and KV100, so models that need more
+        than two points (such as Vogel) can't be used. Fit them to more
+        measurements with fit_viscosity() instead.
+        """
+        curve = self._curves.get(model)
+        if curve is None:
+            from lubepy.lube.viscosity import (
+                Walther,
+                ViscosityCurve,
+                fit_viscosity,
+                viscosity_model,
+            )
+
+            _model = viscosity_model(model)
+            if _model.min_points > 2:
+                raise ConceptError(
+                    f"The {_model.name} model needs at least"
+                    f" {_model.min_points} different temperatures, but an"
+                    " Oil only has KV40 and KV100. Use fit_viscosity()"
+                    " with more measurements"
+                )
+            if _model.name == Walther.name:
+                curve = ViscosityCurve(_model, self.walther)
+            else:
+                curve = fit_viscosity(
+                    model, (40.0, 100.0), (self.viscosity40, self.viscosity100)
+                )
+            self._curves[model] = curve
+        return curve
+
+    def viscosity_at(self, temperature: float, raw: bool = False) -> float:
+        """Return the kinematic viscosity at any temperature (ASTM D341).
+
+        raw: Return the full precision result instead of rounding it to 2
+            decimals.
+        """
+        from lubepy.lube.viscosity import _walther_viscosity
+
+        v = _walther_viscosity(
+            *self.walther, validate_temperature(temperature)
+        )
+        return v if raw else round(v, 2)
+
+
+class _FromOil:
+    """Placeholder for a KV100 argument given by the Oil before it."""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return "<KV100 of the Oil>"
+
+
+_FROM_OIL = _FromOil()
+
+
+def accepts_oil(function):
+    """Let function take an Oil in place of a KV40, KV100 pair.
+
+    Every positional Oil is followed by a placeholder for its KV100, so
+    the remaining arguments keep their positions and the function gets
+    the Oil, with its cached values, in its KV40 argument. The function
+    must then read both viscosities from the Oil.
+
+    Arguments expanded once aren't expanded again, so decorated functions
+    can pass them on to each other.
+    """
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        for arg in args:
+            if isinstance(arg, Oil):
+                return function(*_expand(args), **kwargs)
+        return function(*args, **kwargs)
+
+    return wrapper
+
+
+def _expand(args: tuple) -> list:
+    expanded = []
+    for index, arg in enumerate(args):
+        expanded.append(arg)
+        if isinstance(arg, Oil) and not (
+            index + 1 < len(args) and args[index + 1] is _FROM_OIL
+        ):
+            expanded.append(_FROM_OIL)
+    return expanded
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides analytic sensitivities of the viscosity calculations.
+
+Every function returns the unrounded value with its partial derivatives
+with respect to every input, vectorized over NumPy arrays. The VI
+derivatives are the ones of the ASTM D2270 interpolation range of every
+oil, so they don't see the steps between ranges. NumPy is an optional
+dependency, so this module is only imported by the batch APIs.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from lubepy import MAX_TEMPERATURE, MIN_TEMPERATURE
+from lubepy.lube.batch import (
+    _COEFS,
+    _KV100_BOUNDS,
+    _LOG_T40,
+    _LOG_T100,
+    _mixture_setup,
+    _validate,
+    _validate_viscosity40,
+    _validate_viscosity100,
+)
+from lubepy.lube.viscosity import _TO_KELVIN
+
+_LN10 = np.log(10)
+
+_IndexGradient = namedtuple(
+    "_IndexGradient", ["value", "viscosity40", "viscosity100"]
+)
+_ViscosityGradient = namedtuple(
+    "_ViscosityGradient",
+    ["value", "viscosity40", "viscosity100", "temperature"],
+)
+_MixtureGradient = namedtuple(
+    "_MixtureGradient",
+    ["value", "first_viscosity", "first_oil_percent", "second_viscosity"],
+)
+
+
+def viscosity_index_gradient(viscosity40, viscosity100) -> _IndexGradient:
+    """Return the VI (ASTM-D2270) and its derivatives by KV40 and KV100.
+
+    VI <= 100: VI = 100 * (L - KV40) / (L - H)
+    VI > 100: VI = (10^N - 1) / 0.00715 + 100,
+        N = (log10(H) - log10(KV40)) / log10(KV100)
+    with L = a * KV100^2 + b * KV100 + c and H = d * KV100^2 + e * KV100 + f
+    """
+    _viscosity40 = _validate_viscosity40(viscosity40)
+    _viscosity100 = _validate_viscosity100(viscosity100)
+    index = np.searchsorted(_KV100_BOUNDS, _viscosity100, side="right") - 1
+    a, b, c, d, e, f = np.moveaxis(_COEFS[index], -1, 0)
+    L = a * _viscosity100 ** 2 + b * _viscosity100 + c
+    H = d * _viscosity100 ** 2 + e * _viscosity100 + f
+    dL = 2 * a * _viscosity100 + b
+    dH = 2 * d * _viscosity100 + e
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        low = ((L - _viscosity40) / (L - H)) * 100
+        low40 = -100 / (L - H)
+        low100 = (
+            100
+            * (dL * (L - H) - (L - _viscosity40) * (dL - dH))
+            / (L - H) ** 2
+        )
+
+        log100 = np.log10(_viscosity100)
+        N = (np.log10(H) - np.log10(_viscosity40)) / log100
+        high = ((10 ** N - 1) / 0.00715) + 100
+        dN = 10 ** N * _LN10 / 0.00715
+        high40 = -dN / (_viscosity40 * _LN10 * log100)
+        high100 = dN * (dH / H - N / _viscosity100) / (_LN10 * log100)
+
+    is_low = _viscosity40 >= H
+    return _IndexGradient(
+        np.where(is_low, low, high),
+        np.where(is_low, low40, high40),
+        np.where(is_low, low100, high100),
+    )
+
+
+def viscosity_gradient(
+    viscosity40, viscosity100, temperature
+) -> _ViscosityGradient:
+    """Return the ASTM D341 viscosity and its derivatives.
+
+    log10(log10(v + 0.7)) = z = x + (x - y) * s
+    where:
+        x, y: log10(log10(KV + 0.7)) at 40 and 100 ºC
+        s = (log10(T40) - log10(T)) / (log10(T100) - log10(T40))
+    """
+    _viscosity40 = _validate_viscosity40(viscosity40)
+    _viscosity100 = _validate_viscosity100(viscosity100)
+    _temperature = _validate(
+        "Temperature", temperature, MIN_TEMPERATURE, MAX_TEMPERATURE
+    )
+    u40 = _viscosity40 + 0.7
+    u100 = _viscosity100 + 0.7
+    x = np.log10(np.log10(u40))
+    y = np.log10(np.log10(u100))
+    kelvin = _temperature + _TO_KELVIN
+    s = (_LOG_T40 - np.log10(kelvin)) / (_LOG_T100 - _LOG_T40)
+    z = x + (x - y) * s
+    value = 10 ** (10 ** z) - 0.7
+    dz = (value + 0.7) * 10 ** z * _LN10 ** 2
+    return _ViscosityGradient(
+        value,
+        dz * (1 + s) / (u40 * np.log(u40) * _LN10),
+        -dz * s / (u100 * np.log(u100) * _LN10),
+        -dz * (x - y) / ((_LOG_T100 - _LOG_T40) * kelvin * _LN10),
+    )
+
+
+def mixture_viscosity_gradient(
+    first_viscosity, first_oil_percent, second_viscosity, temperature: str
+) -> _MixtureGradient:
+    """Return the mixture viscosity of two base oils and its derivatives.
+
+    Mixture KV = e^M - K, M = a^(1 - x1) * b^x1
+    where:
+        a = ln(KV2 + K), b = ln(KV1 + K)
+        x1: Proportion of base oil # 1
+        K: Temperature correction
+    """
+    correction, (b, a) = _mixture_setup(
+        temperature, first_viscosity, second_viscosity
+    )
+    x1 = _validate("First oil percent", first_oil_percent, 0.0, 100.0) / 100
+    M = a ** (1 - x1) * b ** x1
+    value = np.exp(M) - correction
+    dM = np.exp(M) * M
+    return _MixtureGradient(
+        value,
+        dM * x1 / (b * np.exp(b)),
+        dM * np.log(b / a) / 100,
+        dM * (1 - x1) / (a * np.exp(a)),
+    )
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides Monte Carlo uncertainty propagation.
+
+Measured KV40 and KV100 carry a relative uncertainty. Samples of every oil
+are drawn from the input distributions and pushed through the vectorized
+VI and ASTM D341 kernels, and the result is summarized as percentiles.
+NumPy is an optional dependency, so this module is only imported by the
+batch APIs.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from lubepy import (
+    MAX_TEMPERATURE,
+    MAX_VISCOSITY_40,
+    MAX_VISCOSITY_100,
+    MIN_TEMPERATURE,
+    MIN_VISCOSITY,
+)
+from lubepy.exceptions import ConceptError
+from lubepy.lube.batch import (
+    _validate,
+    _validate_viscosity40,
+    _validate_viscosity100,
+    _viscosity_index,
+    _walther_coefficients,
+)
+from lubepy.lube.viscosity import _TO_KELVIN
+
+# Largest number of samples held in memory at once, per quantity
+CHUNK_SIZE = 1_000_000
+PERCENTILES = (2.5, 50.0, 97.5)
+
+_Uncertainty = namedtuple(
+    "_Uncertainty", ["percentiles", "viscosity_index", "viscosity"]
+)
+
+
+def _draw(rng, distribution: str, size) -> np.ndarray:
+    """Return standardized draws (unit standard deviation)."""
+    if distribution == "normal":
+        return rng.standard_normal(size)
+    if distribution == "uniform":
+        return rng.uniform(-np.sqrt(3), np.sqrt(3), size)
+    raise ConceptError(f"{distribution} is not a supported distribution")
+
+
+def _sample(
+    rng, distribution, viscosity, uncertainty, samples, upper
+) -> np.ndarray:
+    """Return (oils, samples) viscosities clipped to the valid range."""
+    draws = _draw(rng, distribution, (len(viscosity), samples))
+    return np.clip(
+        viscosity[:, None] * (1 + uncertainty[:, None] * draws),
+        MIN_VISCOSITY,
+        upper,
+    )
+
+
+def propagate(
+    viscosity40,
+    viscosity100,
+    temperature=None,
+    uncertainty40=0.01,
+    uncertainty100=0.01,
+    samples: int = 10_000,
+    percentiles=PERCENTILES,
+    distribution: str = "normal",
+    seed=None,
+    chunk_size: int = CHUNK_SIZE,
+) -> _Uncertainty:
+    """Propagate the KV40 and KV100 uncertainty to VI and viscosity.
+
+    viscosity40, viscosity100: Measured viscosities of every oil (cSt).
+    temperature: Operating temperature of every oil (ºC), or None to skip
+        the viscosity at temperature.
+    uncertainty40, uncertainty100: Relative standard uncertainty of the
+        measurements (0.01 for 1 %), for all or every oil.
+    samples: Number of samples drawn per oil.
+    percentiles: Percentiles (0-100) to return.
+    distribution: "normal" or "uniform", both with the given standard
+        deviation. KV40 and KV100 errors are independent. Samples are
+        clipped to the valid viscosity ranges.
+    seed: Seed of the random generator, for repeatable results with the
+        same chunk_size.
+    chunk_size: Oils are processed in groups of at most chunk_size
+        samples (at least one oil per group), to bound memory.
+
+    Return the percentiles, with the VI and the viscosity at temperature
+    (None if temperature is None) as (oils, percentiles) arrays. The VI
+    is unrounded.
+    """
+    _viscosity40 = np.atleast_1d(_validate_viscosity40(viscosity40))
+    _viscosity100 = np.atleast_1d(_validate_viscosity100(viscosity100))
+    if samples < 1:
+        raise ConceptError("The number of samples must be at least 1")
+    _uncertainty40 = _validate("Uncertainty", uncertainty40, 0.0, 0.5)
+    _uncertainty100 = _validate("Uncertainty", uncertainty100, 0.0, 0.5)
+    shape = np.broadcast(
+        _viscosity40, _viscosity100, _uncertainty40, _uncertainty100
+    ).shape
+    _viscosity40, _viscosity100, _uncertainty40, _uncertainty100 = (
+        np.broadcast_to(a, shape).ravel()
+        for a in (_viscosity40, _viscosity100, _uncertainty40, _uncertainty100)
+    )
+    log_t = None
+    if temperature is not None:
+        _temperature = _validate(
+            "Temperature", temperature, MIN_TEMPERATURE, MAX_TEMPERATURE
+        )
+        log_t = np.broadcast_to(
+            np.log10(_temperature + _TO_KELVIN), shape
+        ).ravel()
+
+    _percentiles = np.asarray(percentiles, dtype=float)
+    oils = len(_viscosity40)
+    index = np.empty((oils, len(_percentiles)))
+    viscosity = None if log_t is None else np.empty_like(index)
+    rng = np.random.default_rng(seed)
+    step = max(1, chunk_size // samples)
+
+    for start in range(0, oils, step):
+        chunk = slice(start, min(start + step, oils))
+        sample40 = _sample(
+            rng,
+            distribution,
+            _viscosity40[chunk],
+            _uncertainty40[chunk],
+            samples,
+            MAX_VISCOSITY_40,
+        )
+        sample100 = _sample(
+            rng,
+            distribution,
+            _viscosity100[chunk],
+            _uncertainty100[chunk],
+            samples,
+            MAX_VISCOSITY_100,
+        )
+        index[chunk] = np.percentile(
+            _viscosity_index(sample40, sample100), _percentiles, axis=1
+        ).T
+        if log_t is not None:
+            a, b = _walther_coefficients(sample40, sample100)
+            values = 10 ** (10 ** (a - b * log_t[chunk, None])) - 0.7
+            viscosity[chunk] = np.percentile(values, _percentiles, axis=1).T
+
+    return _Uncertainty(_percentiles, index, viscosity)
@@ -20,15 +20,31 @@
 """This module provides viscosity calculations."""
 
 import math
-
-from lubepy import MAX_VISCOSITY_40, MAX_VISCOSITY_100, MIN_VISCOSITY
+from collections import namedtuple
+from numbers import Real
+from typing import Dict, Optional, Sequence, Tuple
+
+from lubepy import (
+    ISO_VG_GRADES,
+    ISO_VG_TOLERANCE,
+    MAX_TEMPERATURE,
+    MAX_VISCOSITY_40,
+    MAX_VISCOSITY_100,
+    MIN_TEMPERATURE,
+    MIN_VISCOSITY,
+)
+from lubepy.exceptions import ConceptError
+from lubepy.lube.oil import Oil, accepts_oil
+from lubepy.metrics import instrumented, record_iterations
 from lubepy.validator.core import (
+    ParamValidator,
     validate_viscosity,
     validate_viscosity_index,
     validate_temperature,
 )
 
 
+@instrumented()
 def viscosity_at_40(viscosity100: float, index: float) -> float:
     """Calculate the Kinematic Viscosity (KV) at 40°C.
 
@@ -36,15 +52,19 @@ def viscosity_at_40(viscosity100: float, index: float) -> float:
     """
     _viscosity = _viscosity100 = validate_viscosity(viscosity100, "100")
     _index = validate_viscosity_index(index)
+    iterations = 0
     while (
         _viscosity_index(_viscosity, _viscosity100) >= _index
         and _viscosity <= MAX_VISCOSITY_40
     ):
         _viscosity += 0.05
+        iterations += 1
+    record_iterations("lubepy.lube.viscosity.viscosity_at_40", iterations)
 
     return round((_viscosity * 100 + 0.1) / 100, 2)
 
 
+@instrumented()
 def viscosity_at_100(viscosity40: float, index: float) -> float:
     """Calculate the Kinematic Viscosity (KV) at 100°C.
 
@@ -53,41 +73,101 @@ def viscosity_at_100(viscosity40: float, index: float) -> float:
     _viscosity = MIN_VISCOSITY
     _viscosity40 = validate_viscosity(viscosity40, "40")
     _index = validate_viscosity_index(index)
+    iterations = 0
     while (
         _viscosity_index(_viscosity40, _viscosity) <= _index
         and _viscosity <= MAX_VISCOSITY_100
     ):
         _viscosity += 0.01
+        iterations += 1
+    record_iterations("lubepy.lube.viscosity.viscosity_at_100", iterations)
 
     return round((_viscosity * 100 + 0.01) / 100, 2)
 
 
 _TO_KELVIN = 273.15
 
-
+# ASTM D2270 interpolation coefficients (a, b, c, d, e, f) by KV100 range
+_INTERPOLATION_COEFS = {
+    (2.0, 3.8): (1.14673, 1.7576, -0.109, 0.84155, 1.5521, -0.077),
+    (3.8, 4.4): (3.38095, -15.4952, 33.196, 0.78571, 1.7929, -0.183),
+    (4.4, 5.0): (2.5, -7.2143, 13.812, 0.82143, 1.5679, 0.119),
+    (5.0, 6.4): (0.101, 16.635, -45.469, 0.04985, 9.1613, -18.557),
+    (6.4, 7.0): (3.35714, -23.5643, 78.466, 0.22619, 7.7369, -16.656),
+    (7.0, 7.7): (0.01191, 21.475, -72.870, 0.79762, -0.7321, 14.61),
+    (7.7, 9.0): (0.41858, 16.1558, -56.040, 0.05794, 10.5156, -28.240),
+    (9.0, 12.0): (0.88779, 7.5527, -16.600, 0.26665, 6.7015, -10.810),
+    (12.0, 15.0): (0.7672, 10.7972, -38.180, 0.20073, 8.4658, -22.490),
+    (15.0, 18.0): (0.97305, 5.3135, -2.200, 0.28889, 5.9741, -4.930),
+    (18.0, 22.0): (0.97256, 5.25, -0.980, 0.24504, 7.416, -16.730),
+    (22.0, 28.0): (0.91413, 7.4759, -21.820, 0.20323, 9.1267, -34.230),
+    (28.0, 40.0): (0.87031, 9.7157, -50.770, 0.18411, 10.1015, -46.750),
+    (40.0, 55.0): (0.84703, 12.6752, -133.310, 0.17029, 11.4866, -80.620),
+    (55.0, 70.0): (0.85921, 11.1009, -83.19, 0.1713, 11.368, -76.940),
+    (70.0, math.inf): (
+        0.83531,
+        14.6731,
+        -216.246,
+        0.16841,
+        11.8493,
+        -96.947,
+    ),
+}
+
+
+@instrumented()
+@accepts_oil
 def viscosity_at_any_temp(
-    viscosity40: float, viscosity100: float, temperature: float
+    viscosity40: float,
+    viscosity100: float,
+    temperature: float,
+    raw: bool = False,
 ) -> float:
-    """Calculate the kinematic viscosity at any temperature (ASTM D341)."""
-    _viscosity40 = validate_viscosity(viscosity40, "40")
-    _viscosity100 = validate_viscosity(viscosity100, "100")
-    _temperature = validate_temperature(temperature)
+    """Calculate the kinematic viscosity at any temperature (ASTM D341).
+
+    An Oil can take the place of KV40 and KV100: (oil, temperature).
 
-    x = math.log10(math.log10(_viscosity40 + 0.7))
-    y = math.log10(math.log10(_viscosity100 + 0.7))
+    raw: Return the full precision result instead of rounding it to 2
+        decimals, to chain it into other calculations.
+    """
+    if isinstance(viscosity40, Oil):
+        return viscosity40.viscosity_at(temperature, raw)
+    a, b = _walther_coefficients(
+        validate_viscosity(viscosity40, "40"),
+        validate_viscosity(viscosity100, "100"),
+    )
+    v = _walther_viscosity(a, b, validate_temperature(temperature))
+    return v if raw else round(v, 2)
+
+
+def _walther_coefficients(
+    viscosity40: float, viscosity100: float
+) -> Tuple[float, float]:
+    """Return the ASTM D341 coefficients (a, b) through KV40 and KV100."""
+    x = math.log10(math.log10(viscosity40 + 0.7))
+    y = math.log10(math.log10(viscosity100 + 0.7))
     t0 = math.log10(40 + _TO_KELVIN)
     t1 = math.log10(100 + _TO_KELVIN)
-    target_t = math.log10(_temperature + _TO_KELVIN)
     b = (x - y) / (t1 - t0)
-    a = x + b * t0
-    v = 10 ** (10 ** (a - b * target_t)) - 0.7
+    return x + b * t0, b
+
 
-    return round(v, 2)
+def _walther_viscosity(a: float, b: float, temperature: float) -> float:
+    """Return the unrounded ASTM D341 viscosity."""
+    target_t = math.log10(temperature + _TO_KELVIN)
+    return 10 ** (10 ** (a - b * target_t)) - 0.7
 
 
-def viscosity_index(viscosity40: float, viscosity100: float) -> float:
+@instrumented()
+@accepts_oil
+def viscosity_index(
+    viscosity40: float, viscosity100: float, raw: bool = False
+) -> float:
     """Calculate the Viscosity Index (VI) by ASTM-D2270.
 
+    An Oil can take the place of KV40 and KV100: viscosity_index(oil).
+    With raw, the VI isn't rounded to an integer.
+
     - Viscosity Index Up to and Including 100
 
            (L - KV40)
@@ -128,36 +208,22 @@ def viscosity_index(viscosity40: float, viscosity100: float) -> float:
         N = --------------------------
                   log10(KV100)
     """
-    return _viscosity_index(viscosity40, viscosity100)
+    if isinstance(viscosity40, Oil):
+        if raw:
+            return viscosity40.raw_viscosity_index
+        return viscosity40.viscosity_index
+    return _viscosity_index(viscosity40, viscosity100, raw)
 
 
-def _viscosity_index(viscosity40: float, viscosity100: float) -> float:
+def _viscosity_index(
+    viscosity40: float, viscosity100: float, raw: bool = False
+) -> float:
     """Calculate the Viscosity Index (VI) by ASTM-D2270."""
     _viscosity40 = validate_viscosity(viscosity40, "40")
     _viscosity100 = validate_viscosity(viscosity100, "100")
-    upper = float("inf")
-    interpolation_coefs = {
-        (2.0, 3.8): (1.14673, 1.7576, -0.109, 0.84155, 1.5521, -0.077),
-        (3.8, 4.4): (3.38095, -15.4952, 33.196, 0.78571, 1.7929, -0.183),
-        (4.4, 5.0): (2.5, -7.2143, 13.812, 0.82143, 1.5679, 0.119),
-        (5.0, 6.4): (0.101, 16.635, -45.469, 0.04985, 9.1613, -18.557),
-        (6.4, 7.0): (3.35714, -23.5643, 78.466, 0.22619, 7.7369, -16.656),
-        (7.0, 7.7): (0.01191, 21.475, -72.870, 0.79762, -0.7321, 14.61),
-        (7.7, 9.0): (0.41858, 16.1558, -56.040, 0.05794, 10.5156, -28.240),
-        (9.0, 12.0): (0.88779, 7.5527, -16.600, 0.26665, 6.7015, -10.810),
-        (12.0, 15.0): (0.7672, 10.7972, -38.180, 0.20073, 8.4658, -22.490),
-        (15.0, 18.0): (0.97305, 5.3135, -2.200, 0.28889, 5.9741, -4.930),
-        (18.0, 22.0): (0.97256, 5.25, -0.980, 0.24504, 7.416, -16.730),
-        (22.0, 28.0): (0.91413, 7.4759, -21.820, 0.20323, 9.1267, -34.230),
-        (28.0, 40.0): (0.87031, 9.7157, -50.770, 0.18411, 10.1015, -46.750),
-        (40.0, 55.0): (0.84703, 12.6752, -133.310, 0.17029, 11.4866, -80.620),
-        (55.0, 70.0): (0.85921, 11.1009, -83.19, 0.1713, 11.368, -76.940),
-        (70.0, upper): (0.83531, 14.6731, -216.246, 0.16841, 11.8493, -96.947),
-    }
-
     a, b, c, d, e, f = [0.0] * 6
 
-    for k, v in interpolation_coefs.items():
+    for k, v in _INTERPOLATION_COEFS.items():
         if k[0] <= _viscosity100 < k[1]:
             a, b, c, d, e, f = v
             break
@@ -167,8 +233,288 @@ def _viscosity_index(viscosity40: float, viscosity100: float) -> float:
     H = d * _viscosity100 ** 2 + e * _viscosity100 + f
 
     if _viscosity40 >= H:
-        return round(((L - _viscosity40) / (L - H)) * 100)
+        index = ((L - _viscosity40) / (L - H)) * 100
+    else:
+        N = (math.log10(H) - math.log10(_viscosity40)) / math.log10(
+            _viscosity100
+        )
+        index = ((10 ** N - 1) / 0.00715) + 100
+
+    return index if raw else round(index)
+
+
+@instrumented()
+@accepts_oil
+def viscosity_at_temp(
+    viscosity40: float,
+    viscosity100: float,
+    temperature: float,
+    model="walther",
+    raw: bool = False,
+) -> float:
+    """Calculate the kinematic viscosity at any temperature with a model.
+
+    An Oil can take the place of KV40 and KV100: (oil, temperature).
+
+    model: Name of a registered model (fitted to KV40 and KV100) or an
+        already fitted ViscosityCurve. The default ASTM D341 model gives
+        the same results as viscosity_at_any_temp().
+    raw: Return the full precision result, as in viscosity_at_any_temp().
+    """
+    if isinstance(model, str) and model == Walther.name:
+        return viscosity_at_any_temp(
+            viscosity40, viscosity100, temperature, raw
+        )
+    if isinstance(viscosity40, Oil) and isinstance(model, str):
+        v = viscosity40.curve(model).viscosity(temperature)
+    else:
+        v = viscosity_curve(viscosity40, viscosity100, model).viscosity(
+            temperature
+        )
+    return v if raw else round(v, 2)
+
+
+_validate = ParamValidator()
+_GOLDEN_SECTIONS = 80
+
+# ISO 3448 KV40 limits, as published (rounded to 2 decimals)
+_ISO_VG_BANDS = tuple(
+    (
+        grade,
+        round(midpoint * (1 - ISO_VG_TOLERANCE), 2),
+        round(midpoint * (1 + ISO_VG_TOLERANCE), 2),
+    )
+    for grade, midpoint in ISO_VG_GRADES.items()
+)
+
+
+class ViscosityModel:
+    """Base class of the viscosity-temperature models.
+
+    A model fits its parameters to (temperature, viscosity) points and
+    evaluates them both ways. viscosity() and temperature() take floats
+    or NumPy arrays. Temperatures are in ºC and viscosities in cSt.
+    """
+
+    name = ""
+    min_points = 2
+
+    def fit(self, temperatures: Sequence, viscosities: Sequence) -> Tuple:
+        """Return the model parameters that best fit the points."""
+        raise NotImplementedError
+
+    def viscosity(self, params: Tuple, temperature):
+        """Return the viscosity at the given temperature."""
+        raise NotImplementedError
+
+    def temperature(self, params: Tuple, viscosity):
+        """Return the temperature with the given viscosity (inverse)."""
+        raise NotImplementedError
+
+
+class Walther(ViscosityModel):
+    """ASTM D341 model: log10(log10(v + 0.7)) = a - b * log10(T)."""
+
+    name = "walther"
+
+    def fit(self, temperatures, viscosities):
+        slope, intercept = _line(
+            [math.log10(t + _TO_KELVIN) for t in temperatures],
+            [math.log10(math.log10(v + 0.7)) for v in viscosities],
+        )
+        return intercept, -slope
+
+    def viscosity(self, params, temperature):
+        a, b = params
+        np, temperature = _math(temperature, "Temperature")
+        return 10 ** (10 ** (a - b * np.log10(temperature + _TO_KELVIN))) - 0.7
+
+    def temperature(self, params, viscosity):
+        a, b = params
+        np, viscosity = _math(viscosity, "Viscosity")
+        z = np.log10(np.log10(viscosity + 0.7))
+        return 10 ** ((a - z) / b) - _TO_KELVIN
+
+
+class Andrade(ViscosityModel):
+    """Andrade model: ln(v) = A + B / T."""
+
+    name = "andrade"
+
+    def fit(self, temperatures, viscosities):
+        slope, intercept = _line(
+            [1 / (t + _TO_KELVIN) for t in temperatures],
+            [math.log(v) for v in viscosities],
+        )
+        return intercept, slope
+
+    def viscosity(self, params, temperature):
+        a, b = params
+        np, temperature = _math(temperature, "Temperature")
+        return np.exp(a + b / (temperature + _TO_KELVIN))
+
+    def temperature(self, params, viscosity):
+        a, b = params
+        np, viscosity = _math(viscosity, "Viscosity")
+        return b / (np.log(viscosity) - a) - _TO_KELVIN
+
+
+class Vogel(ViscosityModel):
+    """Vogel model: ln(v) = A + B / (T - C).
+
+    C (K) is found by a golden-section search between 0 and the lowest
+    measured temperature. A and B are a linear least-squares fit for
+    every C tried.
+    """
+
+    name = "vogel"
+    min_points = 3
+
+    def fit(self, temperatures, viscosities):
+        kelvin = [t + _TO_KELVIN for t in temperatures]
+        logs = [math.log(v) for v in viscosities]
+
+        def error(c):
+            x = [1 / (t - c) for t in kelvin]
+            slope, intercept = _line(x, logs)
+            return sum(
+                (intercept + slope * xi - y) ** 2 for xi, y in zip(x, logs)
+            )
+
+        low, high = 0.0, min(kelvin) - 1.0
+        ratio = (math.sqrt(5) - 1) / 2
+        for _ in range(_GOLDEN_SECTIONS):
+            first = high - ratio * (high - low)
+            second = low + ratio * (high - low)
+            if error(first) < error(second):
+                high = second
+            else:
+                low = first
+        c = (low + high) / 2
+        b, a = _line([1 / (t - c) for t in kelvin], logs)
+        return a, b, c
+
+    def viscosity(self, params, temperature):
+        a, b, c = params
+        np, temperature = _math(temperature, "Temperature")
+        return np.exp(a + b / (temperature + _TO_KELVIN - c))
+
+    def temperature(self, params, viscosity):
+        a, b, c = params
+        np, viscosity = _math(viscosity, "Viscosity")
+        return c + b / (np.log(viscosity) - a) - _TO_KELVIN
+
+
+VISCOSITY_MODELS: Dict[str, ViscosityModel] = {
+    model.name: model for model in (Walther(), Vogel(), Andrade())
+}
+
+
+class ViscosityCurve(namedtuple("ViscosityCurve", ["model", "params"])):
+    """Viscosity-temperature curve of an oil: a model and its parameters."""
+
+    __slots__ = ()
+
+    def viscosity(self, temperature):
+        """Return the viscosity (cSt) at the given temperature (ºC)."""
+        return self.model.viscosity(self.params, temperature)
+
+    def temperature(self, viscosity):
+        """Return the temperature (ºC) with the given viscosity (cSt)."""
+        return self.model.temperature(self.params, viscosity)
+
+
+def fit_viscosity(
+    model: str, temperatures: Sequence, viscosities: Sequence
+) -> ViscosityCurve:
+    """Fit a registered viscosity model to measured points.
+
+    model: Name of a model in VISCOSITY_MODELS.
+    temperatures: Measurement temperatures (ºC).
+    viscosities: Kinematic viscosities (cSt).
+    """
+    _model = viscosity_model(model)
+    _temperatures = [validate_temperature(t) for t in temperatures]
+    _viscosities = [
+        _validate("Viscosity", v, MIN_VISCOSITY, math.inf) for v in viscosities
+    ]
+    if len(_temperatures) != len(_viscosities):
+        raise ConceptError("There must be one viscosity per temperature")
+    if len(set(_temperatures)) < _model.min_points:
+        raise ConceptError(
+            f"The {_model.name} model needs at least {_model.min_points}"
+            " different temperatures"
+        )
+    return ViscosityCurve(_model, _model.fit(_temperatures, _viscosities))
+
+
+def viscosity_model(model) -> ViscosityModel:
+    """Return a registered viscosity model by name."""
+    if isinstance(model, ViscosityModel):
+        return model
+    try:
+        return VISCOSITY_MODELS[model]
+    except (KeyError, TypeError):
+        raise ConceptError(f"{model} is not a registered viscosity model")
+
+
+@accepts_oil
+def viscosity_curve(
+    viscosity40: float, viscosity100: float, model="walther"
+) -> ViscosityCurve:
+    """Return the curve of an oil from KV40 and KV100, or from an Oil.
+
+    model: Name of a registered model (fitted to KV40 and KV100) or an
+        already fitted ViscosityCurve, which is returned as is.
+    """
+    if isinstance(model, ViscosityCurve):
+        return model
+    if isinstance(viscosity40, Oil):
+        return viscosity40.curve(model)
+    return fit_viscosity(
+        model,
+        (40.0, 100.0),
+        (
+            validate_viscosity(viscosity40, "40"),
+            validate_viscosity(viscosity100, "100"),
+        ),
+    )
+
+
+def iso_vg_grade(viscosity40: float) -> Optional[int]:
+    """Return the ISO 3448 viscosity grade of KV40, None if off-grade."""
+    _viscosity40 = _validate("Viscosity at 40", viscosity40, 0.0, math.inf)
+    for grade, lower, upper in _ISO_VG_BANDS:
+        if lower <= _viscosity40 <= upper:
+            return grade
+    return None
+
+
+def _line(x: Sequence, y: Sequence) -> Tuple[float, float]:
+    """Return the slope and intercept of the least-squares line."""
+    count = len(x)
+    x_mean = sum(x) / count
+    y_mean = sum(y) / count
+    sxx = sum((xi - x_mean) ** 2 for xi in x)
+    sxy = sum((xi - x_mean) * (yi - y_mean) for xi, yi in zip(x, y))
+    slope = sxy / sxx
+    return slope, y_mean - slope * x_mean
+
+
+def _math(value, param: str):
+    """Return the math module for value (math or NumPy) and value.
+
+    Scalars stay on the math module, so the scalar API doesn't need NumPy.
+    """
+    limits = {
+        "Temperature": (MIN_TEMPERATURE, MAX_TEMPERATURE),
+        "Viscosity": (MIN_VISCOSITY, math.inf),
+    }[param]
+    if isinstance(value, Real) or isinstance(value, str):
+        return math, _validate(param, value, *limits)
+
+    import numpy
 
-    N = (math.log10(H) - math.log10(_viscosity40)) / math.log10(_viscosity100)
+    from lubepy.validator.array import _validate_or_raise
 
-    return round(((10 ** N - 1) / 0.00715) + 100)
+    return numpy, _validate_or_raise(param, value, *limits)
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+
+"""This module provides opt-in instrumentation of the lubepy hot paths.
+
+Instrumentation is off by default and then costs nothing: the decorated
+functions are left untouched. Set the LUBEPY_METRICS environment variable
+to 1 before importing lubepy to wrap them and start recording:
+
+    - Calls, errors and a latency histogram per public function, plus
+      the validator (ParamValidator) calls.
+    - An iteration histogram per inverse solver (viscosity_at_40,
+      viscosity_at_100 and the lubrication network solver).
+
+disable() and enable() pause and resume the recording. snapshot() returns
+the metrics as a dict and prometheus() renders them in the Prometheus
+text exposition format.
+"""
+
+import functools
+import os
+import threading
+from bisect import bisect_left
+from time import perf_counter
+from typing import Callable, Dict, Optional, Tuple
+
+# Histogram upper bounds, the last bucket is +Inf
+LATENCY_BUCKETS = (
+    1e-6,
+    2.5e-6,
+    5e-6,
+    1e-5,
+    2.5e-5,
+    5e-5,
+    1e-4,
+    2.5e-4,
+    1e-3,
+    1e-2,
+    1e-1,
+    1.0,
+)
+ITERATION_BUCKETS = (1, 5, 10, 50, 100, 500, 1_000, 5_000, 10_000, 50_000)
+
+# Whether functions get wrapped when they're decorated
+INSTRUMENTED = os.environ.get("LUBEPY_METRICS", "") == "1"
+
+_enabled = INSTRUMENTED
+_lock = threading.Lock()
+_calls: Dict[str, "_Histogram"] = {}
+_solvers: Dict[str, "_Histogram"] = {}
+
+
+class _Histogram:
+    """Class to accumulate observations in fixed buckets."""
+
+    __slots__ = ("bounds", "buckets", "count", "total", "errors")
+
+    def __init__(self, bounds: Tuple) -> None:
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.errors = 0
+
+    def observe(self, value: float) -> None:
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def as_dict(self) -> Dict:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.bounds + (float("inf"),), self.buckets):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "errors": self.errors,
+            "buckets": buckets,
+        }
+
+
+def enable() -> None:
+    """Start recording metrics.
+
+    Function calls are only recorded if LUBEPY_METRICS was set at import.
+    """
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    """Stop recording metrics. The recorded metrics are kept."""
+    global _enabled
+    _enabled = False
+
+
+def enabled() -> bool:
+    """Return whether metrics are being recorded."""
+    return _enabled
+
+
+def reset() -> None:
+    """Drop all the recorded metrics."""
+    with _lock:
+        _calls.clear()
+        _solvers.clear()
+
+
+def _histogram(registry: Dict, name: str, bounds: Tuple) -> _Histogram:
+    histogram = registry.get(name)
+    if histogram is None:
+        histogram = registry[name] = _Histogram(bounds)
+    return histogram
+
+
+def instrumented(name: Optional[str] = None) -> Callable:
+    """Decorate a function to record its calls and latency.
+
+    The function is returned as is unless LUBEPY_METRICS was set.
+
+    name: Metric label, module.qualname of the function by default.
+    """
+
+    def decorator(function: Callable) -> Callable:
+        if not INSTRUMENTED:
+            return function
+        label = name or f"{function.__module__}.{function.__qualname__}"
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            start = perf_counter()
+            failed = True
+            try:
+                result = function(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                elapsed = perf_counter() - start
+                with _lock:
+                    histogram = _histogram(_calls, label, LATENCY_BUCKETS)
+                    histogram.observe(elapsed)
+                    histogram.errors += failed
+
+        return wrapper
+
+    return decorator
+
+
+def record_iterations(solver: str, iterations: int) -> None:
+    """Record the iterations an inverse solver took to finish."""
+    if not _enabled:
+        return
+    with _lock:
+        _histogram(_solvers, solver, ITERATION_BUCKETS).observe(iterations)
+
+
+def snapshot() -> Dict:
+    """Return the recorded metrics.
+
+    {"calls": {function: histogram}, "solvers": {solver: histogram}}
+    where every histogram is a dict with the count, sum, errors and the
+    cumulative count per bucket upper bound.
+    """
+    with _lock:
+        return {
+            "calls": {
+                name: histogram.as_dict() for name, histogram in _calls.items()
+            },
+            "solvers": {
+                name: histogram.as_dict()
+                for name, histogram in _solvers.items()
+            },
+        }
+
+
+def prometheus(prefix: str = "lubepy") -> str:
+    """Return the recorded metrics in the Prometheus text format."""
+    metrics = snapshot()
+    lines = []
+    families = (
+        (
+            "calls",
+            "function",
+            f"{prefix}_call_duration_seconds",
+            "Latency of lubepy function calls.",
+        ),
+        (
+            "solvers",
+            "solver",
+            f"{prefix}_solver_iterations",
+            "Iterations of lubepy inverse solvers.",
+        ),
+    )
+    for key, label, family, description in families:
+        lines.append(f"# HELP {family} {description}")
+        lines.append(f"# TYPE {family} histogram")
+        for name, histogram in sorted(metrics[key].items()):
+            name = _escape(name)
+            for bound, count in histogram["buckets"].items():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(
+                    f'{family}_bucket{{{label}="{name}",le="{le}"}} {count}'
+                )
+            lines.append(
+                f'{family}_sum{{{label}="{name}"}} {histogram["sum"]}'
+            )
+            lines.append(
+                f'{family}_count{{{label}="{name}"}} {histogram["count"]}'
+            )
+
+    errors = f"{prefix}_call_errors_total"
+    lines.append(f"# HELP {errors} Calls that raised an exception.")
+    lines.append(f"# TYPE {errors} counter")
+    for name, histogram in sorted(metrics["calls"].items()):
+        lines.append(
+            f'{errors}{{function="{_escape(name)}"}} {histogram["errors"]}'
+        )
+    return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
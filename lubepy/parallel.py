@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides a process pool executor for batch calculations.
+
+The input columns and the results live in shared memory blocks
+(multiprocessing.shared_memory). Every task is only a (start, stop) row
+range, so the column data is never pickled. Each task attaches to the
+blocks, runs the named calculation from lubepy.calculations on its range,
+writes the results straight into the shared output arrays and closes its
+handles on the blocks, even if the calculation fails.
+
+Requires NumPy and Python 3.8 or later.
+"""
+
+import os
+from collections import namedtuple
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Mapping, Optional, Tuple
+
+import numpy as np
+
+from lubepy.calculations import CALCULATIONS, run
+
+DEFAULT_CHUNK_SIZE = 262_144
+
+_ParallelResult = namedtuple("_ParallelResult", ["values", "valid", "reasons"])
+
+# Calculation and shared arrays of the current worker, set by _setup()
+_worker: Dict = {}
+
+
+def parallel_run(
+    name: str,
+    columns: Mapping,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    start_method: Optional[str] = None,
+) -> _ParallelResult:
+    """Run a named calculation over numeric columns in worker processes.
+
+    columns: Mapping of column name to numeric column values. Values that
+        can't be converted to float must be cleaned up first, for example
+        with the array validators.
+    workers: Number of worker processes, os.cpu_count() by default.
+    chunk_size: Number of rows per task.
+    start_method: multiprocessing start method, the platform default if
+        None.
+
+    Return the results, the mask of valid rows and the reason codes, as in
+    lubepy.calculations.run().
+    """
+    calculation = CALCULATIONS[name]
+    names = [
+        column
+        for column, _ in calculation.inputs + calculation.optional
+        if column in columns
+    ]
+    arrays = {
+        column: np.ascontiguousarray(columns[column], dtype=float)
+        for column in names
+    }
+    size = len(arrays[calculation.inputs[0][0]])
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or size <= chunk_size:
+        result = run(name, arrays)
+        return _ParallelResult(result.values, result.valid, result.reasons)
+
+    blocks = []
+    try:
+        specs = {}
+        for column, values in arrays.items():
+            specs[column] = _share(values, blocks)
+        specs["__values__"] = _share(np.empty(size), blocks)
+        specs["__reasons__"] = _share(np.empty(size, np.uint8), blocks)
+        ranges = [
+            (start, min(start + chunk_size, size))
+            for start in range(0, size, chunk_size)
+        ]
+        context = get_context(start_method)
+        with context.Pool(
+            workers, initializer=_setup, initargs=(name, specs)
+        ) as pool:
+            pool.map(_run_range, ranges, chunksize=1)
+        values = _view(blocks[-2], specs["__values__"]).copy()
+        reasons = _view(blocks[-1], specs["__reasons__"]).copy()
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+    return _ParallelResult(values, reasons == 0, reasons)
+
+
+def _share(values: np.ndarray, blocks) -> Tuple[str, Tuple, str]:
+    """Copy an array into a new shared memory block."""
+    block = SharedMemory(create=True, size=max(values.nbytes, 1))
+    blocks.append(block)
+    _view(block, (block.name, values.shape, values.dtype.str))[:] = values
+    return block.name, values.shape, values.dtype.str
+
+
+def _view(block: SharedMemory, spec) -> np.ndarray:
+    _, shape, dtype = spec
+    return np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _setup(name: str, specs: Dict) -> None:
+    """Set the calculation and shared arrays of a worker process."""
+    _worker["name"] = name
+    _worker["specs"] = specs
+
+
+def _run_range(rows: Tuple[int, int]) -> None:
+    start, stop = rows
+    specs = _worker["specs"]
+    blocks = {}
+    try:
+        for key, spec in specs.items():
+            blocks[key] = SharedMemory(name=spec[0])
+        arrays = {key: _view(blocks[key], specs[key]) for key in blocks}
+        columns = {
+            key: values[start:stop]
+            for key, values in arrays.items()
+            if not key.startswith("__")
+        }
+        result = run(_worker["name"], columns)
+        arrays["__values__"][start:stop] = result.values
+        arrays["__reasons__"][start:stop] = result.reasons
+    finally:
+        # The views must not outlive the mappings
+        arrays = columns = None
+        for block in blocks.values():
+            block.close()
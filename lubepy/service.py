@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides a local asyncio calculation service.
+
+The service speaks a line protocol over TCP: every request and every
+response is one JSON object per line.
+
+    --> {"id": 1, "calculation": "viscosity_index",
+         "viscosity40": 104.7, "viscosity100": 13.9}
+    <-- {"id": 1, "result": 133.66111353350294, "error": ""}
+
+Requests aren't calculated one by one. They're queued per calculation and
+run as one vectorized batch when the queue holds max_batch requests or
+when the oldest request has waited max_delay seconds, whichever happens
+first. Responses carry the request id and may arrive out of order.
+
+Any calculation of lubepy.calculations is available. Start a loopback
+instance with:
+
+    $ python -m lubepy.service --port 8765
+
+Requires NumPy and Python 3.7 or later.
+"""
+
+import argparse
+import asyncio
+import json
+from typing import Dict, List, Optional, Tuple
+
+from lubepy.calculations import CALCULATIONS, run_records
+
+DEFAULT_PORT = 8765
+
+
+class CalculationService:
+    """Class to serve calculations with micro-batching."""
+
+    def __init__(self, max_batch: int = 256, max_delay: float = 0.002):
+        """Class initializer.
+
+        max_batch: Requests that trigger a batch right away.
+        max_delay: Seconds the oldest queued request may wait.
+        """
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.batches = 0
+        self._queues: Dict[str, List[Tuple[dict, asyncio.Future]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+
+    async def calculate(self, name: str, record: dict) -> Tuple:
+        """Queue one calculation and wait for its (result, error)."""
+        if name not in CALCULATIONS:
+            return None, f"{name} is not a valid calculation"
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        queue = self._queues.setdefault(name, [])
+        queue.append((record, future))
+        if len(queue) >= self.max_batch:
+            self._flush(name)
+        elif name not in self._timers:
+            self._timers[name] = loop.call_later(
+                self.max_delay, self._flush, name
+            )
+        return await future
+
+    def _flush(self, name: str) -> None:
+        """Run the queued requests of a calculation as one batch."""
+        timer = self._timers.pop(name, None)
+        if timer is not None:
+            timer.cancel()
+        queue = self._queues.pop(name, [])
+        if not queue:
+            return
+        self.batches += 1
+        try:
+            values, errors = run_records(name, [record for record, _ in queue])
+        except Exception as error:  # Keep serving the other requests
+            values, errors = [None] * len(queue), [str(error)] * len(queue)
+        for (_, future), value, error in zip(queue, values, errors):
+            if not future.done():
+                future.set_result((value, error))
+
+    async def handle(self, reader, writer) -> None:
+        """Serve the requests of one connection."""
+        pending = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.ensure_future(self._answer(line, writer))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.wait(pending)
+        finally:
+            writer.close()
+
+    async def _answer(self, line: bytes, writer) -> None:
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            name = request.get("calculation")
+            result, error = await self.calculate(name, request)
+        except (ValueError, AttributeError):
+            result, error = None, "Requests must be JSON objects"
+        response = {"id": request_id, "result": result, "error": error}
+        writer.write(json.dumps(response).encode() + b"\n")
+        await writer.drain()
+
+    async def serve(
+        self, host: str = "127.0.0.1", port: int = DEFAULT_PORT
+    ) -> asyncio.AbstractServer:
+        """Start serving on host and port."""
+        return await asyncio.start_server(self.handle, host, port)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run a calculation service until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--max-delay", type=float, default=0.002)
+    args = parser.parse_args(argv)
+
+    async def serve_forever():
+        service = CalculationService(args.max_batch, args.max_delay)
+        server = await service.serve(args.host, args.port)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
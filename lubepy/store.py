@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+
+"""This module provides an append-only, memory-mapped results store.
+
+A store is a directory with one raw binary file per column and a small
+JSON header holding the column dtypes and the number of committed rows:
+
+    results/
+        header.json     {"version": 1, "rows": 1200,
+                         "columns": {"asset": "S16", "viscosity_index": "<f8"}}
+        asset.bin
+        viscosity_index.bin
+
+Chunks are appended to the column files first and committed by rewriting
+the header, so readers never see a half written chunk. Bytes past the
+committed rows (from an interrupted append) are dropped on the next
+append. Columns are read as read-only NumPy memory maps, so slicing a
+year of results by asset only touches the pages it needs:
+
+    >>> store = ResultStore("results")
+    >>> store["viscosity_index"][store["asset"] == b"P-101"]
+
+Only one process should append to a store at a time. Requires NumPy.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Mapping, Optional
+
+import numpy as np
+
+from lubepy.calculations import CALCULATIONS, run
+from lubepy.exceptions import ConceptError, ValidationError
+
+HEADER = "header.json"
+FORMAT_VERSION = 1
+
+
+class ResultStore:
+    """Class to append and read calculation results as columns."""
+
+    def __init__(self, path) -> None:
+        """Open an existing store.
+
+        path: Directory of the store.
+        """
+        self.path = Path(path)
+        self.refresh()
+
+    @classmethod
+    def create(cls, path, columns: Mapping) -> "ResultStore":
+        """Create an empty store.
+
+        columns: Mapping of column name to a fixed size NumPy dtype, e.g.
+            {"asset": "S16", "viscosity_index": "f8", "reason": "u1"}
+        """
+        path = Path(path)
+        dtypes = {name: np.dtype(dtype) for name, dtype in columns.items()}
+        for name, dtype in dtypes.items():
+            if not name.isidentifier():
+                raise ValidationError(f"{name} is not a valid column name")
+            if dtype.hasobject or dtype.itemsize == 0:
+                raise ValidationError(f"{name} must have a fixed size dtype")
+        path.mkdir(parents=True)
+        for name in dtypes:
+            (path / f"{name}.bin").touch()
+        cls._write_header(path, dtypes, 0)
+        return cls(path)
+
+    @staticmethod
+    def _write_header(path: Path, dtypes: Dict, rows: int) -> None:
+        header = {
+            "version": FORMAT_VERSION,
+            "rows": rows,
+            "columns": {name: dtype.str for name, dtype in dtypes.items()},
+        }
+        temporary = path / f"{HEADER}.tmp"
+        temporary.write_text(json.dumps(header))
+        os.replace(temporary, path / HEADER)
+
+    def refresh(self) -> None:
+        """Reload the header to see the rows appended since opening."""
+        header = json.loads((self.path / HEADER).read_text())
+        if header["version"] != FORMAT_VERSION:
+            raise ValidationError(
+                f"Unsupported store version: {header['version']}"
+            )
+        self.rows = header["rows"]
+        self.dtypes = {
+            name: np.dtype(dtype) for name, dtype in header["columns"].items()
+        }
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        """Return a read-only memory-mapped view of a column."""
+        if column not in self.dtypes:
+            raise KeyError(column)
+        dtype = self.dtypes[column]
+        if self.rows == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(
+            self.path / f"{column}.bin",
+            dtype=dtype,
+            mode="r",
+            shape=(self.rows,),
+        )
+
+    def read(
+        self,
+        columns: Optional[Iterable[str]] = None,
+        start: int = 0,
+        stop: Optional[int] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Return views of a row range of some columns (all if None)."""
+        columns = self.dtypes if columns is None else columns
+        return {column: self[column][start:stop] for column in columns}
+
+    def append(self, columns: Mapping) -> int:
+        """Append a chunk of rows and return the new number of rows.
+
+        columns: Mapping of every column name to its values. All the
+            columns must have the same length, and the values must fit
+            the column dtypes (text no longer than the column size).
+        """
+        if set(columns) != set(self.dtypes):
+            raise ConceptError(
+                "Chunks must have these columns: " + ", ".join(self.dtypes)
+            )
+        arrays = {
+            name: _column_array(name, columns[name], dtype)
+            for name, dtype in self.dtypes.items()
+        }
+        sizes = {len(array) for array in arrays.values()}
+        if len(sizes) != 1:
+            raise ConceptError("All the columns must have the same length")
+
+        self.refresh()
+        for name, array in arrays.items():
+            with open(self.path / f"{name}.bin", "r+b") as column_file:
+                column_file.truncate(self.rows * array.itemsize)
+                column_file.seek(0, os.SEEK_END)
+                array.tofile(column_file)
+                column_file.flush()
+                os.fsync(column_file.fileno())
+        self._write_header(self.path, self.dtypes, self.rows + sizes.pop())
+        self.refresh()
+        return self.rows
+
+    def append_run(
+        self, name: str, columns: Mapping, keep: Iterable[str] = ()
+    ):
+        """Run a named calculation over a chunk and append its results.
+
+        The store must have a column named after the calculation (the
+        results), a "reason" column (the reason codes) and the input
+        columns listed in keep, e.g. an asset id column.
+
+        Return the result of lubepy.calculations.run().
+        """
+        if name not in CALCULATIONS:
+            raise ConceptError(f"{name} is not a valid calculation")
+        result = run(name, columns)
+        chunk = {column: columns[column] for column in keep}
+        chunk[name] = result.values
+        chunk["reason"] = result.reasons
+        self.append(chunk)
+        return result
+
+
+def _column_array(name: str, values, dtype: np.dtype) -> np.ndarray:
+    """Convert the values of a column, refusing lossy conversions."""
+    try:
+        if dtype.kind in "SU":
+            text = np.asarray(values)
+            if text.dtype.kind not in "SU":
+                text = text.astype(str)
+            size = dtype.itemsize // np.dtype(f"{dtype.kind}1").itemsize
+            if text.size and np.char.str_len(text).max() > size:
+                raise ValidationError(
+                    f"{name} values must be at most {size} characters long"
+                )
+        return np.ascontiguousarray(values, dtype=dtype)
+    except (ValueError, TypeError, OverflowError) as error:
+        raise ValidationError(
+            f"{name} values don't fit a {dtype.str} column: {error}"
+        ) from None
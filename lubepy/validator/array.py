@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides validators for arrays of input parameters.
+
+Array validators check a whole column in one vectorized pass. They never
+raise for bad values. Instead they return the clean values (NaN for bad
+rows), a boolean mask of valid rows and a reason code per row:
+
+    VALID: The value is valid.
+    NOT_A_NUMBER: The value can't be converted to a number.
+    NOT_FINITE: The value is NaN or infinite.
+    OUT_OF_RANGE: The value is outside the valid range.
+    INCONSISTENT: The value is valid alone but not together with the rest
+        of its row, e.g. an inner diameter larger than the outer one.
+
+NumPy is an optional dependency, so this module is only imported by the
+batch APIs.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from lubepy import (
+    MIN_VISCOSITY,
+    MAX_VISCOSITY_MINUS_5,
+    MAX_VISCOSITY_40,
+    MAX_VISCOSITY_100,
+    MIN_VISCOSITY_INDEX,
+    MAX_VISCOSITY_INDEX,
+    MIN_TEMPERATURE,
+    MAX_TEMPERATURE,
+    MIN_BEARING_DIAMETER,
+    MAX_BEARING_DIAMETER,
+    MIN_BEARING_WIDTH,
+    MAX_BEARING_WIDTH,
+    MIN_RPM,
+    MAX_RPM,
+    MIN_OIL_DENSITY,
+    MAX_OIL_DENSITY,
+    MIN_ADDITIVE_PERCENT,
+    MAX_ADDITIVE_PERCENT,
+    MIN_FLOW_RATE,
+    MAX_FLOW_RATE,
+    MIN_PIPE_EQUIVALENT_DIAMETER,
+    MAX_PIPE_EQUIVALENT_DIAMETER,
+)
+from lubepy.exceptions import ConceptError, ValidationError
+
+VALID = 0
+NOT_A_NUMBER = 1
+NOT_FINITE = 2
+OUT_OF_RANGE = 3
+INCONSISTENT = 4
+
+# Reason descriptions indexed by reason code
+REASONS = (
+    "valid",
+    "not a number",
+    "not finite",
+    "out of range",
+    "inconsistent",
+)
+
+_ArrayValidation = namedtuple(
+    "_ArrayValidation", ["values", "valid", "reasons"]
+)
+
+_VISCOSITY_LIMITS = {
+    "-5": MAX_VISCOSITY_MINUS_5,
+    "40": MAX_VISCOSITY_40,
+    "100": MAX_VISCOSITY_100,
+}
+
+
+def validate_viscosity_array(values, temperature: str) -> _ArrayValidation:
+    return validate_array(
+        values, MIN_VISCOSITY, _VISCOSITY_LIMITS[temperature]
+    )
+
+
+def validate_viscosity_index_array(values) -> _ArrayValidation:
+    return validate_array(values, MIN_VISCOSITY_INDEX, MAX_VISCOSITY_INDEX)
+
+
+def validate_temperature_array(values) -> _ArrayValidation:
+    return validate_array(values, MIN_TEMPERATURE, MAX_TEMPERATURE)
+
+
+def validate_bearing_diameter_array(values) -> _ArrayValidation:
+    return validate_array(values, MIN_BEARING_DIAMETER, MAX_BEARING_DIAMETER)
+
+
+def validate_bearing_width_array(values) -> _ArrayValidation:
+    return validate_array(values, MIN_BEARING_WIDTH, MAX_BEARING_WIDTH)
+
+
+def validate_rpm_array(values) -> _ArrayValidation:
+    return validate_array(values, MIN_RPM, MAX_RPM)
+
+
+def validate_oil_density_array(values) -> _ArrayValidation:
+    return validate_array(values, MIN_OIL_DENSITY, MAX_OIL_DENSITY)
+
+
+def validate_additive_percent_array(values) -> _ArrayValidation:
+    return validate_array(values, MIN_ADDITIVE_PERCENT, MAX_ADDITIVE_PERCENT)
+
+
+def validate_flow_rate_array(values) -> _ArrayValidation:
+    return validate_array(values, MIN_FLOW_RATE, MAX_FLOW_RATE)
+
+
+def validate_pipe_session_array(values) -> _ArrayValidation:
+    return validate_array(
+        values, MIN_PIPE_EQUIVALENT_DIAMETER, MAX_PIPE_EQUIVALENT_DIAMETER
+    )
+
+
+def validate_array(values, lower=None, upper=None) -> _ArrayValidation:
+    """Validate an array of values against an optional range.
+
+    Numeric arrays are checked directly. Text arrays get the same clean-up
+    as ParamValidator (whitespace removed and decimal commas turned into
+    points) before they're parsed.
+
+    The input is never modified. Clean values share its memory when it's
+    a float64 array with only valid values.
+    """
+    raw = np.asarray(values)
+    floats, parsed = _to_float(raw)
+    if raw.dtype.kind in "fiu" and not isinstance(values, np.ndarray):
+        # NumPy turns True and False into numbers when they're mixed with
+        # numbers, but ParamValidator rejects them
+        parsed &= ~_bool_elements(values, raw.shape)
+    reasons = np.where(parsed, VALID, NOT_A_NUMBER).astype(np.uint8)
+    reasons[parsed & ~np.isfinite(floats)] = NOT_FINITE
+    outside = np.zeros(floats.shape, dtype=bool)
+    with np.errstate(invalid="ignore"):
+        if lower is not None:
+            outside |= floats < lower
+        if upper is not None:
+            outside |= floats > upper
+    reasons[outside & (reasons == VALID)] = OUT_OF_RANGE
+    valid = reasons == VALID
+    if not valid.all():
+        floats = np.where(valid, floats, np.nan)
+    return _ArrayValidation(floats, valid, reasons)
+
+
+def _bool_elements(values, shape) -> np.ndarray:
+    """Return a mask of the bool elements of a sequence of values."""
+    if len(shape) != 1:
+        return np.zeros(shape, dtype=bool)
+    return np.fromiter(
+        (isinstance(value, (bool, np.bool_)) for value in values),
+        dtype=bool,
+        count=shape[0],
+    )
+
+
+def _to_float(raw: np.ndarray):
+    """Return the float values and a mask of the values that parsed."""
+    if raw.dtype.kind in "fiu":
+        return raw.astype(float, copy=False), np.ones(raw.shape, dtype=bool)
+    if raw.dtype.kind == "b":
+        return np.full(raw.shape, np.nan), np.zeros(raw.shape, dtype=bool)
+
+    text = raw.astype(str)
+    for whitespace in (" ", "\t", "\n", "\r"):
+        text = np.char.replace(text, whitespace, "")
+    text = np.char.replace(text, ",", ".")
+    try:
+        return text.astype(float), np.ones(raw.shape, dtype=bool)
+    except ValueError:
+        # Some values don't parse, so find them one by one
+        floats = np.full(raw.shape, np.nan)
+        parsed = np.zeros(raw.shape, dtype=bool)
+        for index, value in np.ndenumerate(text):
+            try:
+                floats[index] = float(value)
+                parsed[index] = True
+            except ValueError:
+                pass
+        return floats, parsed
+
+
+def _validate_or_raise(param: str, values, lower=None, upper=None):
+    """Return values as a float array or raise on the first bad value."""
+    result = validate_array(values, lower, upper)
+    if not result.valid.all():
+        reason = result.reasons[~result.valid].flat[0]
+        if reason == OUT_OF_RANGE:
+            raise ConceptError(f"{param} must be between {lower} and {upper}")
+        raise ValidationError(f"{param} must be an array of valid numbers")
+    return result.values
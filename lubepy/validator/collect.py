@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides the error-collecting validation mode.
+
+Inside a collect_errors() block, validators don't raise. They record a
+ValidationIssue and return NaN instead. Issue messages are only formatted
+when they're read, so dirty batches don't pay for messages nobody reads.
+"""
+
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from typing import Callable, Iterable, List, Mapping
+
+from lubepy.exceptions import ValidationError
+
+_state = threading.local()
+
+_ValidatedRecords = namedtuple(
+    "_ValidatedRecords", ["indices", "results", "errors"]
+)
+_RecordError = namedtuple("_RecordError", ["index", "issues"])
+
+
+class ValidationIssue(namedtuple("ValidationIssue", "error template fields")):
+    """Validation error recorded instead of raised.
+
+    error: Exception class that would have been raised.
+    template: Message template, formatted with fields on demand.
+    fields: Message fields, such as param, value, lower and upper.
+    """
+
+    __slots__ = ()
+
+    @property
+    def param(self):
+        return self.fields.get("param")
+
+    @property
+    def value(self):
+        return self.fields.get("value")
+
+    @property
+    def message(self) -> str:
+        return self.template.format(**self.fields)
+
+    def exception(self) -> ValidationError:
+        return self.error(self.message)
+
+
+@contextmanager
+def collect_errors():
+    """Collect validation errors of the current thread in a list."""
+    previous = getattr(_state, "issues", None)
+    _state.issues = issues = []
+    try:
+        yield issues
+    finally:
+        _state.issues = previous
+
+
+def validate_records(
+    factory: Callable, records: Iterable[Mapping]
+) -> _ValidatedRecords:
+    """Build objects from records, collecting the invalid ones.
+
+    factory: Any callable taking the record items as keyword arguments,
+        for example Bearing or OilBlend.
+
+    Return the indices and results of the valid records and one error
+    per invalid record with all its issues.
+    """
+    indices, results, errors = [], [], []
+    for index, record in enumerate(records):
+        with collect_errors() as issues:
+            try:
+                result = factory(**record)
+            except (ValidationError, TypeError) as error:
+                issues.append(_from_exception(error))
+            except Exception as error:
+                # Errors caused by values already reported as invalid
+                if not issues:
+                    raise
+                issues.append(_from_exception(error))
+        if issues:
+            errors.append(_RecordError(index, issues))
+        else:
+            indices.append(index)
+            results.append(result)
+    return _ValidatedRecords(indices, results, errors)
+
+
+def _from_exception(error: Exception) -> ValidationIssue:
+    return ValidationIssue(type(error), "{message}", {"message": str(error)})
+
+
+def _fail(error, template: str, **fields):
+    """Raise a validation error or record it when collecting errors.
+
+    Return NaN when the error is recorded.
+    """
+    issues: List = getattr(_state, "issues", None)
+    if issues is None:
+        raise error(template.format(**fields))
+    issues.append(ValidationIssue(error, template, fields))
+    return float("nan")
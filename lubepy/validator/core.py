@@ -19,7 +19,9 @@
 
 """This module provides validators for input parameters."""
 
-from math import isinf, isnan
+from functools import partial
+from math import isfinite
+from numbers import Real
 
 from lubepy import (
     MIN_VISCOSITY,
@@ -48,93 +50,121 @@ from lubepy import (
 )
 
 from lubepy.exceptions import ConceptError, ValidationError
+from lubepy.metrics import instrumented
+from lubepy.validator.collect import _fail
+
+_NOT_A_NUMBER = "{param} must be a valid number, not: {value}"
+_OUT_OF_RANGE = "{param} must be between {lower} and {upper}"
 
 
 def validate_viscosity(value, temperature: str) -> float:
-    upper_limit = {
-        "-5": MAX_VISCOSITY_MINUS_5,
-        "40": MAX_VISCOSITY_40,
-        "100": MAX_VISCOSITY_100,
-    }
-    validate = ParamValidator()
-    return validate(
-        param=f"Viscosity at {temperature}",
-        value=value,
-        lower=MIN_VISCOSITY,
-        upper=upper_limit[temperature],
-    )
+    return _VISCOSITY_VALIDATORS[temperature](value)
 
 
 def validate_viscosity_index(value) -> float:
-    validate = ParamValidator()
-    return validate(
-        param="Viscosity Index",
-        value=value,
-        lower=MIN_VISCOSITY_INDEX,
-        upper=MAX_VISCOSITY_INDEX,
-    )
+    return _validate_viscosity_index(value)
 
 
 def validate_temperature(value) -> float:
-    validate = ParamValidator()
-    return validate(
-        param="Temperature",
-        value=value,
-        lower=MIN_TEMPERATURE,
-        upper=MAX_TEMPERATURE,
-    )
+    return _validate_temperature(value)
 
 
 class ParamValidator:
-    """Validate params."""
+    """Validate params.
 
-    def __init__(self):
-        self._param = None
-        self._value = None
+    Validators keep no state between calls, so one instance can be shared
+    by many threads.
+    """
 
+    @instrumented("lubepy.validator.core.ParamValidator")
     def __call__(self, param, value, lower=None, upper=None):
-        self._param = param
-        self._value = value
-        self._cleanup()
-        self._to_float()
-        self._check_symbols()
-        self._check_range(lower, upper)
-        return self._value
-
-    def _cleanup(self):
-        self._value = "".join(str(self._value).split()).replace(",", ".")
-
-    def _to_float(self):
         try:
-            self._value = float(self._value)
-        except ValueError:
-            raise ValidationError(self._error_msg) from None
+            if type(value) is float or type(value) is int:
+                value = float(value)
+            elif isinstance(value, Real) and not isinstance(value, bool):
+                # Other real numbers, such as NumPy scalars
+                value = float(value)
+            else:
+                value = self._cleanup(value)
+                value = float(value)
+        except (ValueError, OverflowError):
+            # Text that is not a number, or integers too large for a float
+            return _fail(
+                ValidationError, _NOT_A_NUMBER, param=param, value=value
+            )
+        if not isfinite(value):
+            return _fail(
+                ValidationError, _NOT_A_NUMBER, param=param, value=value
+            )
+        return self._check_range(param, value, lower, upper)
 
-    def _check_symbols(self):
-        if isinf(self._value) or isnan(self._value):
-            raise ValidationError(self._error_msg)
+    @staticmethod
+    def _cleanup(value):
+        return "".join(str(value).split()).replace(",", ".")
 
-    def _check_range(self, lower: float = None, upper: float = None):
+    @staticmethod
+    def _check_range(param, value, lower: float = None, upper: float = None):
         if lower is None and upper is None:
-            return None
-        if not lower <= self._value <= upper:
-            raise ConceptError(
-                f"{self._param} must be between {lower} and {upper}"
+            return value
+        if not lower <= value <= upper:
+            return _fail(
+                ConceptError,
+                _OUT_OF_RANGE,
+                param=param,
+                lower=lower,
+                upper=upper,
+                value=value,
             )
+        return value
+
 
-    @property
-    def _error_msg(self):
-        return f"{self._param} must be a valid number, not: {self._value}"
+_validate = ParamValidator()
+_VISCOSITY_VALIDATORS = {
+    temperature: partial(
+        _validate,
+        f"Viscosity at {temperature}",
+        lower=MIN_VISCOSITY,
+        upper=upper,
+    )
+    for temperature, upper in (
+        ("-5", MAX_VISCOSITY_MINUS_5),
+        ("40", MAX_VISCOSITY_40),
+        ("100", MAX_VISCOSITY_100),
+    )
+}
+_validate_viscosity_index = partial(
+    _validate,
+    "Viscosity Index",
+    lower=MIN_VISCOSITY_INDEX,
+    upper=MAX_VISCOSITY_INDEX,
+)
+_validate_temperature = partial(
+    _validate, "Temperature", lower=MIN_TEMPERATURE, upper=MAX_TEMPERATURE
+)
 
 
 class BaseParam:
+    """Base descriptor class for validated params.
+
+    Values are stored in the instance under the descriptor's attribute
+    name, so every instance keeps its own values.
+    """
+
     def __init__(self, name):
         self._name = name
-        self._value = None
-        self._validate = ParamValidator()
+        self._attribute = None
+        self._validate = _validate
+
+    def __set_name__(self, owner, attribute):
+        self._attribute = attribute
 
     def __get__(self, instance, owner):
-        return self._value
+        if instance is None:
+            return self
+        return instance.__dict__.get(self._attribute)
+
+    def _store(self, instance, value):
+        instance.__dict__[self._attribute] = value
 
 
 class Temperature(BaseParam):
@@ -142,53 +172,62 @@ class Temperature(BaseParam):
 
     def __set__(self, instance, value):
         temperature = str(value).strip()
-        if temperature in {"-5", "40", "100"}:
-            self._value = temperature
-        else:
-            raise ConceptError(f"{self._name} must be -5ºC, 40ºC or 100ºC")
+        if temperature not in {"-5", "40", "100"}:
+            temperature = _fail(
+                ConceptError,
+                "{param} must be -5ºC, 40ºC or 100ºC",
+                param=self._name,
+                value=value,
+            )
+        self._store(instance, temperature)
 
 
 class BearingDiameter(BaseParam):
     """Descriptor class for validating bearing diameters."""
 
     def __set__(self, instance, value):
-        self._value = self._validate(
+        value = self._validate(
             self._name, value, MIN_BEARING_DIAMETER, MAX_BEARING_DIAMETER
         )
+        self._store(instance, value)
 
 
 class BearingWidth(BaseParam):
     """Descriptor class for validating bearing widths."""
 
     def __set__(self, instance, value):
-        self._value = self._validate(
+        value = self._validate(
             self._name, value, MIN_BEARING_WIDTH, MAX_BEARING_WIDTH
         )
+        self._store(instance, value)
 
 
 class Rpm(BaseParam):
     """Descriptor class for validating bearing rpm."""
 
     def __set__(self, instance, value):
-        self._value = self._validate(self._name, value, MIN_RPM, MAX_RPM)
+        value = self._validate(self._name, value, MIN_RPM, MAX_RPM)
+        self._store(instance, value)
 
 
 class OilDensity(BaseParam):
     """Descriptor class for validating density in g/ml."""
 
     def __set__(self, instance, value):
-        self._value = self._validate(
+        value = self._validate(
             self._name, value, MIN_OIL_DENSITY, MAX_OIL_DENSITY
         )
+        self._store(instance, value)
 
 
 class AdditivePercent(BaseParam):
     """Descriptor class for validating additive percent."""
 
     def __set__(self, instance, value):
-        self._value = self._validate(
+        value = self._validate(
             self._name, value, MIN_ADDITIVE_PERCENT, MAX_ADDITIVE_PERCENT
         )
+        self._store(instance, value)
 
 
 class MetalContent(BaseParam):
@@ -200,32 +239,39 @@ class MetalContent(BaseParam):
                 f"{self._name} must be a dictionary object not {type(value)}"
             )
 
-        self._value = {
+        content = {
             k.strip().lower(): self._validate(f"{self._name} for {k}", v)
             for k, v in value.items()
         }
 
-        for metal in self._value:
+        for metal in content:
             if metal not in ASH_CONTRIBUTION:
-                raise ConceptError(f"{metal} is not a valid additive metal")
+                _fail(
+                    ConceptError,
+                    "{value} is not a valid additive metal",
+                    param=self._name,
+                    value=metal,
+                )
+
+        self._store(instance, content)
 
 
 class FlowRate(BaseParam):
     """Descriptor class for validating a flow velocity in m/s."""
 
     def __set__(self, instance, value):
-        self._value = self._validate(
-            self._name, value, MIN_FLOW_RATE, MAX_FLOW_RATE
-        )
+        value = self._validate(self._name, value, MIN_FLOW_RATE, MAX_FLOW_RATE)
+        self._store(instance, value)
 
 
 class PipeSession(BaseParam):
     """Descriptor class for validating the session of a pipe in mm."""
 
     def __set__(self, instance, value):
-        self._value = self._validate(
+        value = self._validate(
             self._name,
             value,
             MIN_PIPE_EQUIVALENT_DIAMETER,
             MAX_PIPE_EQUIVALENT_DIAMETER,
         )
+        self._store(instance, value)
@@ -53,6 +53,13 @@ setup(
     url=__about__["URL"],
     packages=find_packages(exclude=["tests"]),
     include_package_data=True,
+    package_data={"lubepy.lube": ["data/*.json", "data/*.npy"]},
+    extras_require={
+        "numpy": ["numpy"],
+        "arrow": ["numpy", "pyarrow"],
+        "network": ["numpy", "scipy"],
+    },
+    entry_points={"console_scripts": ["lubepy = lubepy.cli:main"]},
     license="GNU General Public License, Version 2, June 1991",
     classifiers=[
         "License :: OSI Approved :: GNU General Public License v2 (GPLv2)",
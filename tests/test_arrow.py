@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides tests for arrow.py."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from lubepy.arrow import (  # noqa: E402
+    _float_array,
+    column_values,
+    read_row_groups,
+    run_batch,
+    run_parquet,
+)
+from lubepy.calculations import run  # noqa: E402
+
+TABLE = {
+    "sample": ["A-001", "A-002", "A-003", "A-004"],
+    "viscosity40": [104.7, None, 68.0, 320.0],
+    "viscosity100": [13.9, 10.0, 8.6, 24.0],
+}
+
+
+class TestArrow:
+    """Class to test the Arrow and Parquet front ends."""
+
+    def test_column_values_zero_copy(self):
+        batch = pa.record_batch({"viscosity40": [104.7, 68.0]})
+        values = column_values(batch, "viscosity40")
+        address = batch.column(0).buffers()[1].address
+        assert values.ctypes.data == address
+
+    def test_float_results_zero_copy(self):
+        values = np.array([1.5, np.nan, 2.5])
+        result = _float_array(values, np.array([True, False, True]))
+        assert result.buffers()[1].address == values.ctypes.data
+        assert result.to_pylist() == [1.5, None, 2.5]
+        assert _float_array(values[::2], np.ones(2, bool)).null_count == 0
+
+    def test_column_values(self):
+        batch = pa.record_batch({"nulls": [1, None], "text": ["68,0", "abc"]})
+        assert np.isnan(column_values(batch, "nulls")[1])
+        assert column_values(batch, "text").tolist() == ["68,0", "abc"]
+
+    def test_run_batch(self):
+        batch = run_batch("viscosity_index", pa.record_batch(TABLE))
+        expected = run(
+            "viscosity_index",
+            {
+                "viscosity40": [104.7, np.nan, 68.0, 320.0],
+                "viscosity100": TABLE["viscosity100"],
+            },
+        )
+        assert batch.schema.names == [
+            "sample",
+            "viscosity40",
+            "viscosity100",
+            "viscosity_index",
+            "error",
+        ]
+        result = batch.column("viscosity_index").to_pylist()
+        assert result[1] is None
+        assert result[::2] == pytest.approx(expected.values[::2].tolist())
+        assert batch.column("error").to_pylist() == [
+            "",
+            "viscosity40: not finite",
+            "",
+            "",
+        ]
+
+    def test_run_batch_labels(self):
+        table = pa.table(
+            {
+                "flow_rate": [30.0, 100_000.0],
+                "viscosity40": ["68,0", "68"],
+                "viscosity100": [8.6, 8.6],
+                "temperature": [40, 40],
+                "diameter": [10, 10],
+            }
+        )
+        result = run_batch("flow_type", table)
+        assert isinstance(result, pa.Table)
+        flow_types = result.column("flow_type")
+        assert pa.types.is_dictionary(flow_types.type)
+        assert flow_types.to_pylist() == ["laminar", None]
+
+    def test_run_parquet(self, tmp_path):
+        source = tmp_path / "lab.parquet"
+        destination = tmp_path / "results.parquet"
+        pq.write_table(pa.table(TABLE), source, row_group_size=3)
+
+        assert len(list(read_row_groups(source))) == 2
+        assert run_parquet("viscosity_index", source, destination) == 4
+        output = pq.ParquetFile(destination)
+        assert output.num_row_groups == 2
+        expected = run_batch("viscosity_index", pa.table(TABLE))
+        assert output.read().equals(expected)
+
+    def test_run_parquet_columns(self, tmp_path):
+        source = tmp_path / "lab.parquet"
+        destination = tmp_path / "results.parquet"
+        pq.write_table(pa.table(TABLE), source)
+        run_parquet(
+            "viscosity_index",
+            source,
+            destination,
+            columns=["viscosity40", "viscosity100"],
+        )
+        assert "sample" not in pq.read_schema(destination).names
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides tests for cache.py."""
+
+import json
+import sqlite3
+from collections import namedtuple
+from multiprocessing import get_context
+
+import pytest
+from pytest import param
+
+import lubepy
+from lubepy import cache as cache_module
+from lubepy.cache import DiskCache
+from lubepy.exceptions import ConceptError, ValidationError
+from lubepy.fluid.reynolds import (
+    CircularSession,
+    flow_type_circular_session,
+    reynolds_circular_session,
+)
+from lubepy.lube.viscosity import viscosity_at_40
+
+Point = namedtuple("Point", ["x", "y"])
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "cache.sqlite3"
+
+
+def write_rows(path, start):
+    """Cache 100 rows from a worker process."""
+    cache = DiskCache(path)
+    rows = [(value,) for value in range(start, start + 100)]
+    cache.put_many("double", rows, [2 * value for (value,) in rows])
+    return len(cache.get_many("double", rows))
+
+
+class TestDiskCache:
+    """Class to test DiskCache."""
+
+    def test_get_and_put(self, path):
+        cache = DiskCache(path)
+        assert cache.get("viscosity_at_40", (13.9, 130)) is None
+        cache.put("viscosity_at_40", (13.9, 130), 107.65)
+        assert cache.get("viscosity_at_40", (13.9, 130.0000001)) == 107.65
+        assert cache.get("viscosity_at_40", (13.9, 130.001)) is None
+        assert cache.get("viscosity_at_100", (13.9, 130)) is None
+
+    def test_wrap(self, path):
+        calls = []
+
+        def function(*args):
+            calls.append(args)
+            return viscosity_at_40(*args)
+
+        cached = DiskCache(path).wrap(function, "viscosity_at_40")
+        assert cached(13.9, 130) == cached(13.9, 130) == 107.65
+        assert len(calls) == 1
+        # Another process (or a restart) reuses the results
+        assert DiskCache(path).wrap(function, "viscosity_at_40")(13.9, 130)
+        assert len(calls) == 1
+
+    def test_wrap_keeps_types(self, path):
+        def session(diameter):
+            return CircularSession(diameter)
+
+        cache = DiskCache(path)
+        flow_type = cache.wrap(flow_type_circular_session)
+        session = cache.wrap(session, "session")
+        for _ in range(2):
+            assert flow_type(
+                1_000, 320, 24, 40, 10
+            ) is flow_type_circular_session(1_000, 320, 24, 40, 10)
+            assert session(25.0) == CircularSession(25.0)
+            assert type(session(25.0)) is CircularSession
+        assert DiskCache(path).get("session", (25.0,)) == CircularSession(25.0)
+        assert len(cache) == 2
+
+    def test_other_named_tuples_are_tuples(self, path):
+        cache = DiskCache(path)
+        cache.put("point", (1,), Point(1.0, 2.0))
+        value = cache.get("point", (1,))
+        assert value == (1.0, 2.0) and type(value) is tuple
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            param({"namedtuple": "os:system", "items": ["true"]}, id="os"),
+            param(
+                {"namedtuple": "lubepy.cache:os.system", "items": ["true"]},
+                id="through-lubepy",
+            ),
+            param(
+                {"namedtuple": "lubepy.__main__:main", "items": []},
+                id="private-module",
+            ),
+            param({"namedtuple": "lubepy:Oil", "items": []}, id="class"),
+            param(
+                {"enum": "lubepy.fluid.reynolds:CircularSession", "name": "x"},
+                id="not-an-enum",
+            ),
+        ],
+    )
+    def test_tampered_entries(self, path, value):
+        cache = DiskCache(path)
+        with cache._connection() as connection:
+            connection.execute(
+                "INSERT INTO entries VALUES (?, ?, ?, ?)",
+                [
+                    cache.version,
+                    "tampered",
+                    cache.key((1,)),
+                    json.dumps(value),
+                ],
+            )
+        with pytest.raises(ValidationError):
+            cache.get("tampered", (1,))
+
+    def test_wrap_caches_none(self, path):
+        calls = []
+
+        def function(value):
+            calls.append(value)
+
+        cached = DiskCache(path).wrap(function, "none")
+        assert cached(1.0) is None
+        assert cached(1.0) is None
+        assert calls == [1.0]
+
+    def test_wrap_keyword_arguments(self, path):
+        cached = DiskCache(path).wrap(reynolds_circular_session)
+        args = (1_000, 320, 24, 40, 10)
+        assert cached(*args) == reynolds_circular_session(*args)
+        assert cached(*args, raw=True) == reynolds_circular_session(
+            *args, raw=True
+        )
+        assert cached(*args, raw=True) != cached(*args)
+
+    def test_wrap_keys_exact_inputs(self, path):
+        cached = DiskCache(path, digits=2).wrap(float, "float")
+        assert cached(1.001) == 1.001
+        assert cached(1.004) == 1.004
+
+    def test_map_caches_none(self, path):
+        cache = DiskCache(path)
+        calls = []
+
+        def kernel(values):
+            calls.append(len(values))
+            return [None if value < 0 else value for value in values]
+
+        assert cache.map("clip", kernel, [-1, 2]) == [None, 2]
+        assert cache.map("clip", kernel, [-1, 2]) == [None, 2]
+        assert calls == [2]
+
+    def test_errors_are_not_cached(self, path):
+        cached = DiskCache(path).wrap(viscosity_at_40)
+        with pytest.raises(ConceptError):
+            cached(13.9, 1_000)
+        assert len(DiskCache(path)) == 0
+
+    def test_map(self, path):
+        cache = DiskCache(path)
+        calls = []
+
+        def kernel(viscosity40, viscosity100):
+            calls.append(len(viscosity40))
+            return [a / b for a, b in zip(viscosity40, viscosity100)]
+
+        assert cache.map("ratio", kernel, [10, 20], [2, 4]) == [5, 5]
+        assert cache.map("ratio", kernel, [10, 30, 20], [2, 5, 4]) == [5, 6, 5]
+        assert cache.map("ratio", kernel, [10, 30], [2, 5]) == [5, 6]
+        assert calls == [2, 1]
+
+    def test_batches_over_the_parameter_limit(self, path):
+        cache = DiskCache(path)
+        rows = [(value,) for value in range(2_000)]
+        cache.put_many("identity", rows, range(2_000))
+        assert cache.get_many("identity", rows) == list(range(2_000))
+
+    def test_constants_invalidate_entries(self, path, monkeypatch):
+        DiskCache(path).put("viscosity_at_40", (13.9, 130), 107.65)
+        monkeypatch.setattr(lubepy, "MAX_VISCOSITY_40", 3_000.0)
+        cache = DiskCache(path)
+        assert cache.get("viscosity_at_40", (13.9, 130)) is None
+        assert cache.prune() == 1
+
+    def test_coefficients_invalidate_entries(self, path, monkeypatch):
+        version = DiskCache(path).version
+        coefs = dict(cache_module._INTERPOLATION_COEFS)
+        coefs[(2.0, 3.8)] = (0.0,) * 6
+        monkeypatch.setattr(cache_module, "_INTERPOLATION_COEFS", coefs)
+        assert DiskCache(path).version != version
+
+    def test_wal_mode(self, path):
+        DiskCache(path)
+        with sqlite3.connect(path) as connection:
+            mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
+    def test_many_processes(self, path):
+        DiskCache(path)
+        with get_context("spawn").Pool(4) as pool:
+            counts = pool.starmap(
+                write_rows, [(path, start) for start in range(0, 400, 100)]
+            )
+        assert counts == [100] * 4
+        assert len(DiskCache(path)) == 400
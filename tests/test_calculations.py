@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides tests for calculations.py."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from lubepy.calculations import (  # noqa: E402
+    CALCULATIONS,
+    describe_errors,
+    required_columns,
+    run,
+    run_records,
+)
+from lubepy.device.bearing import grace_amount, velocity_factor  # noqa: E402
+from lubepy.fluid.reynolds import (  # noqa: E402
+    flow_type_circular_session,
+    reynolds_circular_session,
+)
+from lubepy.lube.blend import additive_percent_mass, total_ash  # noqa: E402
+from lubepy.lube.mixture import mixture_viscosity  # noqa: E402
+from lubepy.lube.viscosity import (  # noqa: E402
+    viscosity_at_any_temp,
+    viscosity_index,
+)
+from lubepy.validator.array import (  # noqa: E402
+    INCONSISTENT,
+    NOT_A_NUMBER,
+    OUT_OF_RANGE,
+    VALID,
+)
+
+ROWS = {
+    "viscosity_index": (
+        viscosity_index,
+        0,
+        [("104.7", "13.9"), (320, 24.0), (68, 8.6)],
+    ),
+    "viscosity_at_any_temp": (
+        viscosity_at_any_temp,
+        2,
+        [(68, 8.6, 60), (320, 24.0, -10), (10, 2.5, 100)],
+    ),
+    "additive_percent_mass": (
+        additive_percent_mass,
+        2,
+        [(10, 0.9, 0.88), (20, 1.1, 0.9)],
+    ),
+    "mixture_viscosity40": (
+        lambda v1, percent, v2: mixture_viscosity(v1, percent, v2, "40"),
+        2,
+        [(100, 30, 32), (68, 50, 32)],
+    ),
+    "grease_amount": (
+        grace_amount,
+        2,
+        [(100, 20), (300, 60)],
+    ),
+    "velocity_factor": (
+        velocity_factor,
+        0,
+        [(100, 50, 1_000), (300, 100, 3_600)],
+    ),
+    "reynolds_number": (
+        lambda q, v40, v100, t, d: reynolds_circular_session(
+            q, v40, v100, t, d
+        ),
+        1,
+        [(1_800.0, 320, 24.0, 40, 20.0), (600.0, 10, 2.5, 40, 10.0)],
+    ),
+}
+
+
+def columns_of(name, rows):
+    return dict(zip(required_columns(name), zip(*rows)))
+
+
+class TestCalculations:
+    """Class to test the calculation registry."""
+
+    @pytest.mark.parametrize("name", list(ROWS))
+    def test_matches_scalar_functions(self, name):
+        function, digits, rows = ROWS[name]
+        result = run(name, columns_of(name, rows))
+        assert result.valid.all()
+        assert np.round(result.values, digits).tolist() == pytest.approx(
+            [function(*row) for row in rows], abs=0.1
+        )
+
+    def test_flow_type(self):
+        rows = [(1_800.0, 320, 24.0, 40, 20.0), (600.0, 5, 2.1, 40, 10.0)]
+        result = run("flow_type", columns_of("flow_type", rows))
+        labels = CALCULATIONS["flow_type"].labels
+        assert [labels[int(code)] for code in result.values] == [
+            flow_type_circular_session(*row).value for row in rows
+        ]
+
+    @pytest.mark.parametrize(
+        "name, column, values, expected",
+        [
+            (
+                "iso_vg_grade",
+                "viscosity40",
+                [68, "31,5", 40],
+                ["ISO VG 68", "ISO VG 32", "off-grade"],
+            ),
+            (
+                "sae_grade",
+                "viscosity100",
+                [10.0, 14, 30],
+                ["SAE 30", "SAE 40", "off-grade"],
+            ),
+        ],
+    )
+    def test_grades(self, name, column, values, expected):
+        result = run(name, {column: values})
+        labels = CALCULATIONS[name].labels
+        assert [labels[int(code)] for code in result.values] == expected
+
+    def test_total_ash_optional_columns(self):
+        result = run(
+            "total_ash",
+            {"additive_percent": [10, 12], "zinc": [1.2, "1,3"]},
+        )
+        assert result.values.tolist() == pytest.approx(
+            [
+                total_ash({"zinc": 1.2}, 10),
+                total_ash({"zinc": 1.3}, 12),
+            ],
+            abs=0.01,
+        )
+
+    def test_total_ash_mixed_metals(self):
+        records = [
+            {"additive_percent": 10, "zinc": 1.2},
+            {"additive_percent": 12, "calcium": "2,1"},
+            {"additive_percent": 8, "zinc": "", "calcium": " "},
+            {"additive_percent": 9, "zinc": "abc"},
+        ]
+        values, errors = run_records("total_ash", records)
+        assert values[:3] == pytest.approx(
+            [
+                total_ash({"zinc": 1.2}, 10),
+                total_ash({"calcium": 2.1}, 12),
+                total_ash({}, 8),
+            ],
+            abs=0.01,
+        )
+        assert values[3] is None
+        assert errors == ["", "", "", "zinc: not a number"]
+
+    def test_invalid_rows(self):
+        result = run(
+            "velocity_factor",
+            {
+                "outer_diameter": [100, "abc", 50, 100],
+                "inner_diameter": [50, 10, 80, 50],
+                "rpm": [1_000, 1_000, 1_000, 0],
+            },
+        )
+        assert result.valid.tolist() == [True, False, False, False]
+        assert np.isnan(result.values[1:]).all()
+        assert result.reasons.tolist() == [
+            VALID,
+            NOT_A_NUMBER,
+            INCONSISTENT,
+            OUT_OF_RANGE,
+        ]
+        assert describe_errors(result) == [
+            "",
+            "outer_diameter: not a number",
+            "outer_diameter: inconsistent",
+            "rpm: out of range",
+        ]
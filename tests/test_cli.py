@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides tests for cli.py."""
+
+import csv
+import io
+import json
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from lubepy.cli import main  # noqa: E402
+
+CSV = (
+    "sample,viscosity40,viscosity100\n"
+    "A-001,104.7,13.9\n"
+    "A-002,abc,10\n"
+    'A-003,"68,0",8.6\n'
+)
+
+
+def read_csv(text):
+    return list(csv.DictReader(io.StringIO(text)))
+
+
+class TestCli:
+    """Class to test the lubepy command."""
+
+    def test_csv_file(self, tmp_path, capsys):
+        path = tmp_path / "lab.csv"
+        path.write_text(CSV)
+        assert main(["viscosity_index", str(path), "--precision", "0"]) == 0
+        rows = read_csv(capsys.readouterr().out)
+        assert [row["viscosity_index"] for row in rows] == [
+            "134.0",
+            "",
+            "97.0",
+        ]
+        assert [row["error"] for row in rows] == [
+            "",
+            "viscosity40: not a number",
+            "",
+        ]
+        assert rows[0]["sample"] == "A-001"
+
+    def test_stdin_jsonl(self, monkeypatch, capsys):
+        lines = [
+            {
+                "flow_rate": 600,
+                "viscosity40": 10,
+                "viscosity100": 2.5,
+                "temperature": 40,
+                "diameter": 10,
+            },
+            {"flow_rate": 600, "viscosity40": 5, "viscosity100": 2.1},
+        ]
+        monkeypatch.setattr(
+            "sys.stdin",
+            io.StringIO("".join(json.dumps(line) + "\n" for line in lines)),
+        )
+        assert main(["flow_type", "--format", "jsonl"]) == 0
+        records = [
+            json.loads(line) for line in capsys.readouterr().out.splitlines()
+        ]
+        assert [record["flow_type"] for record in records] == ["mixed", None]
+        assert records[1]["error"] == "temperature: not a number"
+
+    def test_malformed_jsonl_lines(self, tmp_path, capsys):
+        path = tmp_path / "lab.jsonl"
+        path.write_text(
+            '{"viscosity40": 104.7, "viscosity100": 13.9}\n'
+            '{"viscosity40": 68,\n'
+            "\n"
+            "[1, 2]\n"
+            '{"viscosity40": 68, "viscosity100": 8.6}\n'
+        )
+        assert main(["viscosity_index", str(path)]) == 0
+        records = [
+            json.loads(line) for line in capsys.readouterr().out.splitlines()
+        ]
+        assert [record["viscosity_index"] for record in records] == [
+            pytest.approx(133.6, abs=0.1),
+            None,
+            None,
+            pytest.approx(96.8, abs=0.1),
+        ]
+        assert records[1]["line"] == 2
+        assert records[1]["error"].startswith("line 2: invalid JSON")
+        assert records[2]["error"] == "line 4: not a JSON object"
+
+    def test_csv_empty_optional_cell(self, tmp_path, capsys):
+        path = tmp_path / "ash.csv"
+        path.write_text("additive_percent,zinc,calcium\n10,1.2,\n12,,2.1\n")
+        assert main(["total_ash", str(path)]) == 0
+        rows = read_csv(capsys.readouterr().out)
+        assert [row["error"] for row in rows] == ["", ""]
+        assert all(float(row["total_ash"]) > 0 for row in rows)
+
+    @pytest.mark.parametrize("workers", [0, 2])
+    def test_chunks_keep_order(self, tmp_path, capsys, workers):
+        path = tmp_path / "lab.csv"
+        rows = "".join(f"{i},{100 + i},{10 + i % 5}\n" for i in range(50))
+        path.write_text("sample,viscosity40,viscosity100\n" + rows)
+        main(
+            [
+                "viscosity_index",
+                str(path),
+                str(path),
+                "--chunk-size",
+                "7",
+                "--workers",
+                str(workers),
+            ]
+        )
+        output = read_csv(capsys.readouterr().out)
+        assert [row["sample"] for row in output] == [
+            str(i) for i in range(50)
+        ] * 2
+        assert all(row["viscosity_index"] for row in output)
+
+    def test_wrong_calculation(self):
+        with pytest.raises(SystemExit):
+            main(["nothing"])
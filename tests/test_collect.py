@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides tests for collect.py."""
+
+import math
+
+import pytest
+
+from lubepy.device.bearing import Bearing
+from lubepy.exceptions import ConceptError, ValidationError
+from lubepy.lube.blend import OilBlend
+from lubepy.lube.mixture import OilMixture
+from lubepy.validator.collect import collect_errors, validate_records
+from lubepy.validator.core import validate_temperature, validate_viscosity
+
+
+class TestCollectErrors:
+    """Class to test the error-collecting validation mode."""
+
+    def test_collect_instead_of_raise(self):
+        with collect_errors() as issues:
+            assert math.isnan(validate_viscosity("abc", "40"))
+            assert math.isnan(validate_viscosity("1", "40"))
+            assert validate_temperature("60") == 60.0
+        assert [issue.error for issue in issues] == [
+            ValidationError,
+            ConceptError,
+        ]
+        assert issues[0].param == "Viscosity at 40"
+        assert issues[0].value == "abc"
+        assert issues[0].message == (
+            "Viscosity at 40 must be a valid number, not: abc"
+        )
+        assert (
+            issues[1].message
+            == "Viscosity at 40 must be between 2.0 and 2000.0"
+        )
+        assert isinstance(issues[1].exception(), ConceptError)
+
+    def test_raise_outside_block(self):
+        with collect_errors():
+            pass
+        with pytest.raises(ConceptError):
+            validate_viscosity("1", "40")
+
+    def test_nested_blocks(self):
+        with collect_errors() as outer:
+            with collect_errors() as inner:
+                validate_temperature("x")
+            validate_temperature("-60")
+        assert len(inner) == 1 and len(outer) == 1
+
+
+class TestValidateRecords:
+    """Class to test validate_records()."""
+
+    def test_bearings(self):
+        records = [
+            {"outer_diameter": 100, "inner_diameter": 50, "width": 20},
+            {"outer_diameter": "abc", "inner_diameter": 0.5, "width": 20},
+            {"outer_diameter": 50, "inner_diameter": 100, "width": 20},
+            {"outer_diameter": 100, "inner_diameter": 50},
+            {"outer_diameter": "200", "inner_diameter": "80", "width": "30"},
+        ]
+        report = validate_records(Bearing, records)
+        assert report.indices == [0, 4]
+        assert [bearing.grease_amount() for bearing in report.results] == [
+            10.0,
+            30.0,
+        ]
+        assert [error.index for error in report.errors] == [1, 2, 3]
+        assert [
+            [issue.error for issue in error.issues] for error in report.errors
+        ] == [[ValidationError, ConceptError], [ConceptError], [TypeError]]
+        assert report.errors[0].issues[0].param == "Bearing outer diameter"
+
+    def test_blends(self):
+        records = [
+            {
+                "additive_percent": 10,
+                "additive_density": 0.9,
+                "oil_density": 0.88,
+                "metal_content": {"Zinc": 1.2, "Gold": 1.0},
+            },
+            {
+                "additive_percent": 10,
+                "additive_density": 0.9,
+                "oil_density": 0.88,
+                "metal_content": {"Zinc": 1.2},
+            },
+        ]
+        report = validate_records(OilBlend, records)
+        assert report.indices == [1]
+        assert report.errors[0].issues[0].message == (
+            "gold is not a valid additive metal"
+        )
+
+    def test_dependent_errors(self):
+        records = [
+            {"first_viscosity": 10, "second_viscosity": 20, "temperature": 7},
+            {"first_viscosity": 10, "second_viscosity": 20, "temperature": 40},
+        ]
+        report = validate_records(OilMixture, records)
+        assert report.indices == [1]
+        assert report.errors[0].issues[0].error is ConceptError
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides concurrency tests for the calculation classes."""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from lubepy.device.bearing import Bearing
+from lubepy.fluid.reynolds import ReynoldsNumber
+from lubepy.lube.blend import OilBlend
+from lubepy.lube.mixture import OilMixture
+
+WORKERS = 8
+BEARINGS = [
+    (100.0 + i % 400, 10.0 + i % 80, 5.0 + i % 50, 500.0 + i)
+    for i in range(2_000)
+]
+
+
+def bearing_results(outer_diameter, inner_diameter, width, rpm):
+    bearing = Bearing(outer_diameter, inner_diameter, width)
+    return (
+        bearing.outer_diameter,
+        bearing.inner_diameter,
+        bearing.width,
+        bearing.grease_amount(),
+        bearing.velocity_factor(rpm),
+        bearing.rpm,
+    )
+
+
+def free_threaded():
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+class TestInstanceStorage:
+    """Class to test that every instance keeps its own values."""
+
+    def test_bearings(self):
+        first = Bearing(100.0, 50.0, 20.0)
+        second = Bearing(300.0, 150.0, 60.0)
+        assert (first.outer_diameter, first.inner_diameter, first.width) == (
+            100.0,
+            50.0,
+            20.0,
+        )
+        assert first.grease_amount() == 10.0
+        assert second.grease_amount() == 90.0
+
+    def test_blends(self):
+        first = OilBlend(10.0, 0.9, 0.88, {"Zinc": 1.2})
+        second = OilBlend(20.0, 1.1, 0.9, {"Calcium": 2.0})
+        assert first.metal_content == {"zinc": 1.2}
+        assert first.additive_percent_mass() == 10.23
+        assert second.additive_percent_mass() == 24.44
+
+    def test_mixtures(self):
+        first = OilMixture(100, 200, "40")
+        second = OilMixture(5, 10, "100")
+        assert first.temperature == "40"
+        assert second.temperature == "100"
+
+    def test_reynolds(self):
+        first = ReynoldsNumber(1_800.0, 320, 24.0, 40)
+        second = ReynoldsNumber(600.0, 10, 2.5, 40)
+        assert first.reynolds_circular_session(20.0) == 99.6
+        assert second.reynolds_circular_session(10.0) == 2123.8
+        assert first._flow_rate == 1_800.0
+
+    def test_descriptor_on_class(self):
+        assert Bearing.outer_diameter._name == "Bearing outer diameter"
+
+
+class TestThreadPool:
+    """Class to test calculations under a thread pool."""
+
+    def test_bearings(self):
+        expected = [bearing_results(*args) for args in BEARINGS]
+        with ThreadPoolExecutor(WORKERS) as executor:
+            results = list(
+                executor.map(lambda args: bearing_results(*args), BEARINGS)
+            )
+        assert results == expected
+
+    def test_reynolds(self):
+        args = [
+            (100.0 + i, 68, 8.6, i % 100, 5.0 + i % 50) for i in range(2_000)
+        ]
+
+        def reynolds(flow_rate, viscosity40, viscosity100, temp, diameter):
+            number = ReynoldsNumber(flow_rate, viscosity40, viscosity100, temp)
+            return number.reynolds_circular_session(diameter)
+
+        expected = [reynolds(*row) for row in args]
+        with ThreadPoolExecutor(WORKERS) as executor:
+            results = list(executor.map(lambda row: reynolds(*row), args))
+        assert results == expected
+
+    @pytest.mark.skipif(
+        not free_threaded() or (os.cpu_count() or 1) < 4,
+        reason="Needs a free-threaded CPython build with 4+ cores",
+    )
+    def test_scaling(self):
+        def run(workers):
+            start = time.perf_counter()
+            with ThreadPoolExecutor(workers) as executor:
+                list(
+                    executor.map(
+                        lambda args: bearing_results(*args), BEARINGS * 10
+                    )
+                )
+            return time.perf_counter() - start
+
+        assert run(4) < run(1) / 1.5
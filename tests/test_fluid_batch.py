@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides tests for fluid/batch.py."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from lubepy.exceptions import ConceptError  # noqa: E402
+from lubepy.fluid.batch import (  # noqa: E402
+    FLOW_TYPES,
+    flow_type_codes,
+    reynolds_at_temp,
+    smallest_pipe_diameters,
+    transition_temperatures,
+)
+from lubepy.fluid.reynolds import (  # noqa: E402
+    _FlowTypes,
+    flow_type_circular_session,
+    reynolds_circular_session,
+    smallest_pipe_diameter,
+)
+
+LINES = {
+    "flow_rate": [1_800.0, 600.0, 600.0, 2_000.0],
+    "viscosity40": [320, 10, 5, 68],
+    "viscosity100": [24.0, 2.5, 2.1, 9.0],
+    "equivalent_diameter": [20.0, 10.0, 10.0, 15.0],
+}
+
+
+class TestReynoldsBatch:
+    """Class to test the vectorized Reynolds calculations."""
+
+    def test_reynolds_at_temp(self):
+        expected = [
+            reynolds_circular_session(q, v40, v100, 40, d)
+            for q, v40, v100, d in zip(*LINES.values())
+        ]
+        result = reynolds_at_temp(
+            LINES["flow_rate"],
+            LINES["viscosity40"],
+            LINES["viscosity100"],
+            40,
+            LINES["equivalent_diameter"],
+        )
+        assert result == pytest.approx(expected, abs=0.5)
+
+    def test_flow_type_codes(self):
+        codes = flow_type_codes([99.6, 2_100.0, 2_123.8, 4_000.0, 4_247.5])
+        assert [FLOW_TYPES[code] for code in codes] == [
+            _FlowTypes.LAMINAR,
+            _FlowTypes.LAMINAR,
+            _FlowTypes.MIXED,
+            _FlowTypes.MIXED,
+            _FlowTypes.TURBULENT,
+        ]
+
+    def test_transition_temperatures(self):
+        laminar, turbulent = transition_temperatures(**LINES)
+        assert (laminar < turbulent)[~np.isnan(turbulent)].all()
+        for i, (q, v40, v100, d) in enumerate(zip(*LINES.values())):
+            for limit, before, after in (
+                (laminar[i], _FlowTypes.LAMINAR, _FlowTypes.MIXED),
+                (turbulent[i], _FlowTypes.MIXED, _FlowTypes.TURBULENT),
+            ):
+                if np.isnan(limit):
+                    continue
+                assert (
+                    flow_type_circular_session(q, v40, v100, limit - 0.1, d)
+                    == before
+                )
+                assert (
+                    flow_type_circular_session(q, v40, v100, limit + 0.1, d)
+                    == after
+                )
+
+    def test_transition_out_of_range(self):
+        laminar, turbulent = transition_temperatures(0.1, 10, 2.5, 1_000.0)
+        assert np.isnan(laminar) and np.isnan(turbulent)
+
+    def test_wrong_flow_rate(self):
+        with pytest.raises(ConceptError):
+            transition_temperatures([0.0], [10], [2.5], [10.0])
+
+    def test_smallest_pipe_diameters(self):
+        catalogue = [6.0, 8.0, 10.0, 15.0, 20.0, 25.0, 32.0, 40.0, 50.0]
+        min_temperature = [20, 0, -10, 10]
+        max_temperature = [60, 40, 90, 80]
+        expected = [
+            smallest_pipe_diameter(q, v40, v100, t0, t1, catalogue)
+            for q, v40, v100, t0, t1 in zip(
+                LINES["flow_rate"],
+                LINES["viscosity40"],
+                LINES["viscosity100"],
+                min_temperature,
+                max_temperature,
+            )
+        ]
+        result = smallest_pipe_diameters(
+            LINES["flow_rate"],
+            LINES["viscosity40"],
+            LINES["viscosity100"],
+            min_temperature,
+            max_temperature,
+            catalogue,
+        )
+        assert [
+            None if np.isnan(value) else value for value in result
+        ] == expected
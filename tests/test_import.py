@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides import-time tests for the lubepy package."""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+# Budgets for a cold `import lubepy`
+MAX_IMPORT_SECONDS = 0.05
+ALLOWED_MODULES = {"lubepy"}
+SCALAR_MODULES = [
+    "lubepy.device.bearing",
+    "lubepy.fluid.reynolds",
+    "lubepy.lube.blend",
+    "lubepy.lube.mixture",
+    "lubepy.lube.viscosity",
+    "lubepy.validator.collect",
+    "lubepy.validator.core",
+]
+
+
+def run_python(code: str):
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        stdout=subprocess.PIPE,
+    ).stdout
+    return json.loads(output)
+
+
+class TestImport:
+    """Class to test the package import cost."""
+
+    def test_import_budget(self):
+        seconds, modules = run_python(
+            "import json, sys, time\n"
+            "before = set(sys.modules)\n"
+            "start = time.perf_counter()\n"
+            "import lubepy\n"
+            "seconds = time.perf_counter() - start\n"
+            "modules = sorted(set(sys.modules) - before)\n"
+            "print(json.dumps([seconds, modules]))\n"
+        )
+        assert set(modules) <= ALLOWED_MODULES
+        assert seconds < MAX_IMPORT_SECONDS
+
+    def test_lazy_subpackages(self):
+        loaded, attributes = run_python(
+            "import json, sys\n"
+            "import lubepy\n"
+            "lubepy.lube\n"
+            "print(json.dumps([\n"
+            "    sorted(m for m in sys.modules if m.startswith('lubepy')),\n"
+            "    dir(lubepy),\n"
+            "]))\n"
+        )
+        assert "lubepy.lube" in loaded and "lubepy.fluid" not in loaded
+        assert {"device", "fluid", "lube", "validator"} <= set(attributes)
+
+    def test_unknown_attribute(self):
+        import lubepy
+
+        with pytest.raises(AttributeError):
+            lubepy.nothing
+
+    def test_scalar_api_without_numpy(self):
+        imports = "; ".join(f"import {name}" for name in SCALAR_MODULES)
+        loaded = run_python(
+            f"import json, sys; {imports}; "
+            "print(json.dumps('numpy' in sys.modules))"
+        )
+        assert not loaded
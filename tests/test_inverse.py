@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides tests for inverse.py."""
+
+import warnings
+
+import pytest
+from pytest import param
+
+np = pytest.importorskip("numpy")
+
+from lubepy import MAX_VISCOSITY_100, MIN_VISCOSITY  # noqa: E402
+from lubepy.exceptions import ConceptError  # noqa: E402
+from lubepy.lube import inverse  # noqa: E402
+from lubepy.lube.batch import viscosity_index  # noqa: E402
+from lubepy.lube.inverse import (  # noqa: E402
+    GRID_MAX_RELATIVE_ERROR,
+    viscosity40_from_index,
+    viscosity100_from_index,
+)
+
+
+@pytest.fixture(scope="module")
+def oils():
+    """Return KV40, KV100 and VI of random oils inside the valid ranges."""
+    rng = np.random.default_rng(0)
+    viscosity100 = rng.uniform(2.0, 100.0, 20_000)
+    viscosity40 = viscosity100 * rng.uniform(3.0, 20.0, 20_000)
+    keep = viscosity40 <= 2_000
+    viscosity40, viscosity100 = viscosity40[keep], viscosity100[keep]
+    index = viscosity_index(viscosity40, viscosity100)
+    keep = (-25 <= index) & (index <= 400)
+    return viscosity40[keep], viscosity100[keep], index[keep]
+
+
+class TestInverse:
+    """Class to test the inverse Viscosity Index calculations."""
+
+    def test_viscosity40_from_index(self, oils):
+        viscosity40, viscosity100, index = oils
+        result = viscosity40_from_index(viscosity100, index)
+        assert result == pytest.approx(viscosity40, rel=1e-12)
+
+    def test_viscosity100_from_index(self, oils):
+        viscosity40, viscosity100, index = oils
+        result = viscosity100_from_index(viscosity40, index)
+        assert (
+            np.abs(result / viscosity100 - 1).max() < GRID_MAX_RELATIVE_ERROR
+        )
+
+    def test_viscosity100_exact(self, oils):
+        viscosity40, _, index = oils
+        result = viscosity100_from_index(viscosity40, index, exact=True)
+        assert viscosity_index(viscosity40, result) == pytest.approx(
+            index, abs=1e-9
+        )
+
+    def test_viscosity100_exact_edges(self):
+        # Random KV40 and VI, many of them out of reach or near the edge
+        rng = np.random.default_rng(2)
+        (low40, high40, _), (low_index, high_index, _) = inverse._axes()
+        viscosity40 = 10 ** rng.uniform(low40, high40, 50_000)
+        index = rng.uniform(low_index, high_index, 50_000)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            result = viscosity100_from_index(viscosity40, index, exact=True)
+        expected = inverse._solve_viscosity100(
+            viscosity40,
+            index,
+            MIN_VISCOSITY,
+            np.minimum(viscosity40, MAX_VISCOSITY_100),
+        )
+        # Same reach as the full range bisection. The results give the VI,
+        # or match the bisection where a step of the VI skips it
+        assert np.isnan(result).tolist() == np.isnan(expected).tolist()
+        known = np.isfinite(result)
+        result, expected = result[known], expected[known]
+        matches = np.isclose(
+            viscosity_index(viscosity40[known], result), index[known], 0, 1e-9
+        ) | np.isclose(result, expected, 1e-12, 0)
+        assert matches.all()
+        assert np.isnan(viscosity100_from_index(4.6886, 337.294, exact=True))
+
+    @pytest.mark.parametrize(
+        "function, args",
+        [
+            param(viscosity40_from_index, (500, -25), id="kv40-too-high"),
+            param(viscosity100_from_index, (3, 400), id="kv100-unreachable"),
+        ],
+    )
+    def test_out_of_reach(self, function, args):
+        assert np.isnan(function(*args))
+
+    @pytest.mark.parametrize(
+        "args",
+        [param((68, 401), id="index"), param((1, 95), id="viscosity")],
+    )
+    def test_wrong_input(self, args):
+        with pytest.raises(ConceptError):
+            viscosity100_from_index(*args)
+
+    def test_shipped_grid(self):
+        grid, metadata = inverse._grid()
+        assert isinstance(grid, np.memmap)
+        assert grid.shape == inverse.GRID_SHAPE
+        assert metadata["fingerprint"] == inverse._fingerprint()
+        assert metadata["empirical_error_bound"] == pytest.approx(
+            metadata["measured_relative_error"] * inverse.GRID_SAFETY_FACTOR
+        )
+        assert metadata["empirical_error_bound"] < GRID_MAX_RELATIVE_ERROR
+
+    def test_grid_error_bound(self):
+        # Random points off the grid nodes, checked against the bisection
+        rng = np.random.default_rng(1)
+        (low40, high40, _), (low_index, high_index, _) = inverse._axes()
+        viscosity40 = 10 ** rng.uniform(low40, high40, 200_000)
+        index = rng.uniform(low_index, high_index, 200_000)
+        exact = inverse._solve_viscosity100(
+            viscosity40,
+            index,
+            MIN_VISCOSITY,
+            np.minimum(viscosity40, MAX_VISCOSITY_100),
+        )
+        result = viscosity100_from_index(viscosity40, index)
+        known = np.isfinite(exact) & np.isfinite(result)
+        error = np.abs(result[known] / exact[known] - 1).max()
+        _, metadata = inverse._grid()
+        assert error <= metadata["empirical_error_bound"]
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides tests for lube/batch.py."""
+
+import pytest
+from pytest import param
+
+np = pytest.importorskip("numpy")
+
+from lubepy.exceptions import ConceptError, ValidationError  # noqa: E402
+from lubepy.lube.batch import (  # noqa: E402
+    ISO_VG_CODES,
+    SAE_CODES,
+    fit_walther,
+    iso_vg_codes,
+    mixture_proportions,
+    mixture_viscosity,
+    sae_codes,
+    viscosity_at_any_temp,
+    viscosity_index,
+    walther_coefficients,
+    walther_temperature,
+    walther_viscosity,
+)
+from lubepy.lube import mixture, viscosity  # noqa: E402
+
+
+class TestViscosityBatch:
+    """Class to test the vectorized viscosity calculations."""
+
+    def test_viscosity_at_any_temp(self):
+        viscosity40 = [68, 320, 46, 10]
+        viscosity100 = [9.0, 24.0, 6.8, 2.5]
+        temperature = [60, 40, -10, 100]
+        expected = [
+            viscosity.viscosity_at_any_temp(*row)
+            for row in zip(viscosity40, viscosity100, temperature)
+        ]
+        result = viscosity_at_any_temp(viscosity40, viscosity100, temperature)
+        assert np.round(result, 2).tolist() == expected
+
+    def test_walther_temperature(self):
+        a, b = walther_coefficients([68, 320], [9.0, 24.0])
+        assert walther_temperature(a, b, [68, 24.0]) == pytest.approx(
+            [40.0, 100.0]
+        )
+
+    def test_viscosity_index(self):
+        rng = np.random.default_rng(0)
+        viscosity100 = rng.uniform(2.0, 100.0, 2_000)
+        viscosity40 = viscosity100 * rng.uniform(3.0, 20.0, 2_000)
+        expected = [
+            viscosity.viscosity_index(*row)
+            for row in zip(viscosity40, viscosity100)
+        ]
+        result = viscosity_index(viscosity40, viscosity100)
+        assert np.round(result).tolist() == expected
+
+    def test_fit_walther_two_points(self):
+        fit = fit_walther([7, 7, 3, 3], [40, 100, 100, 40], [68, 9, 24, 320])
+        a, b = walther_coefficients([320, 68], [24, 9])
+        assert fit.oils.tolist() == [3, 7]
+        assert fit.a == pytest.approx(a)
+        assert fit.b == pytest.approx(b)
+        assert fit.residuals == pytest.approx(0, abs=1e-9)
+
+    def test_fit_walther_ragged(self):
+        rng = np.random.default_rng(0)
+        a, b = walther_coefficients(
+            rng.uniform(30, 300, 500), rng.uniform(5, 20, 500)
+        )
+        counts = rng.integers(3, 9, 500)
+        oils = np.repeat(np.arange(500), counts)
+        temperatures = rng.uniform(0, 120, len(oils))
+        exact = walther_viscosity(a[oils], b[oils], temperatures)
+        noise = rng.normal(1, 0.001, len(oils))
+        order = rng.permutation(len(oils))
+
+        fit = fit_walther(
+            oils[order], temperatures[order], (exact * noise)[order]
+        )
+        assert fit.a == pytest.approx(a, rel=1e-2)
+        assert fit.b == pytest.approx(b, rel=1e-2)
+        fitted = walther_viscosity(fit.a[oils], fit.b[oils], temperatures)
+        assert fitted == pytest.approx(exact, rel=5e-3)
+        assert (fit.rms > 0).all()
+
+    def test_fit_walther_single_temperature(self):
+        fit = fit_walther(["A", "A", "B"], [40, 40, 40], [68, 69, 100])
+        assert np.isnan(fit.a).all() and np.isnan(fit.b).all()
+
+    def test_fit_walther_repeated_temperature(self):
+        fit = fit_walther(
+            ["A"] * 7 + ["B", "B"],
+            [-3.7] * 7 + [40, 100],
+            [900, 905, 910, 895, 902, 908, 899, 68, 8.6],
+        )
+        assert np.isnan(fit.a[0]) and np.isnan(fit.b[0])
+        assert np.isfinite(fit.a[1]) and np.isfinite(fit.b[1])
+
+    @pytest.mark.parametrize(
+        "viscosity40, error",
+        [
+            param([68, 1], ConceptError),
+            param([68, 2_001], ConceptError),
+            param([68, "a"], ValidationError),
+            param([68, float("nan")], ValidationError),
+        ],
+    )
+    def test_wrong_viscosity(self, viscosity40, error):
+        with pytest.raises(error):
+            viscosity_at_any_temp(viscosity40, [9.0, 9.0], 40)
+
+
+class TestMixtureBatch:
+    """Class to test the vectorized mixture calculations."""
+
+    def test_mixture_viscosity(self):
+        rows = [(100, 30, 32, "40"), (68, 50, 32, "40"), (10, 80, 5, "100")]
+        result = [
+            mixture_viscosity([first], [percent], [second], temperature)[0]
+            for first, percent, second, temperature in rows
+        ]
+        assert np.round(result, 2).tolist() == [
+            mixture.mixture_viscosity(*row) for row in rows
+        ]
+
+    def test_mixture_proportions(self):
+        result = mixture_proportions(
+            [100, 100, 32], [32, 32, 100], [50, 150, 50], "40"
+        )
+        expected = mixture.mixture_proportions(100, 32, 50, "40")
+        assert np.round(result[0], 2) == expected.first_oil_percent
+        assert np.isnan(result[1])
+        assert np.round(result[2], 2) == expected.second_oil_percent
+
+    @pytest.mark.parametrize(
+        "percent, temperature, error",
+        [
+            param([101], "40", ConceptError),
+            param([50], "20", ValidationError),
+        ],
+    )
+    def test_wrong_input(self, percent, temperature, error):
+        with pytest.raises(error):
+            mixture_viscosity([68], percent, [32], temperature)
+
+
+class TestGradesBatch:
+    """Class to test the vectorized grade classifications."""
+
+    @pytest.mark.parametrize(
+        "viscosity40, grade, off_grade",
+        [
+            param(68.0, 68, False, id="midpoint"),
+            param(28.8, 32, False, id="lower_limit"),
+            param(35.2, 32, False, id="upper_limit"),
+            param(27.0, 32, True, id="nearest_above"),
+            param(36.0, 32, True, id="nearest_below"),
+            param(1.0, 2, True, id="under_table"),
+            param(1.98, 2, False, id="vg2_lower_limit"),
+            param(2.42, 2, False, id="vg2_upper_limit"),
+            param(2.5, 2, True, id="between_vg2_vg3"),
+            param(2.88, 3, False, id="vg3_lower_limit"),
+            param(3.52, 3, False, id="vg3_upper_limit"),
+            param(3_000.0, 3_200, False, id="over_max_viscosity"),
+            param(4_000.0, 3_200, True, id="over_table"),
+        ],
+    )
+    def test_iso_vg_codes(self, viscosity40, grade, off_grade):
+        result = iso_vg_codes([viscosity40])
+        assert ISO_VG_CODES[result.codes[0]] == grade
+        assert result.off_grade[0] == off_grade
+
+    def test_iso_vg_codes_match_scalar(self):
+        samples = np.geomspace(1.5, 3_000.0, 5_000)
+        result = iso_vg_codes(samples)
+        assert result.codes.dtype == np.int8
+        assert [
+            None if off else ISO_VG_CODES[code]
+            for code, off in zip(result.codes, result.off_grade)
+        ] == [viscosity.iso_vg_grade(value) for value in samples]
+
+    @pytest.mark.parametrize(
+        "viscosity100, grade, off_grade",
+        [
+            param(4.0, 8, False, id="lower_limit"),
+            param(5.5, 12, False, id="overlap"),
+            param(9.3, 30, False, id="upper_limit_excluded"),
+            param(26.0, 60, False, id="last_grade"),
+            param(3.0, 8, True, id="under_table"),
+            param(26.1, 60, True, id="over_table"),
+        ],
+    )
+    def test_sae_codes(self, viscosity100, grade, off_grade):
+        result = sae_codes([viscosity100])
+        assert SAE_CODES[result.codes[0]] == grade
+        assert result.off_grade[0] == off_grade
+
+    def test_wrong_viscosity(self):
+        with pytest.raises(ConceptError):
+            sae_codes([10.0, -1.0])
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides tests for metrics.py."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from lubepy import metrics
+from lubepy.lube.viscosity import viscosity_at_40
+
+
+@pytest.fixture
+def recording(monkeypatch):
+    """Record metrics from a clean state, as with LUBEPY_METRICS=1."""
+    monkeypatch.setattr(metrics, "INSTRUMENTED", True)
+    monkeypatch.setattr(metrics, "_enabled", True)
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def divide(a, b):
+    return a / b
+
+
+class TestMetrics:
+    """Class to test the instrumentation layer."""
+
+    def test_off_by_default(self):
+        assert not metrics.INSTRUMENTED
+        assert metrics.instrumented()(divide) is divide
+
+    def test_calls(self, recording):
+        instrumented = metrics.instrumented("divide")(divide)
+        assert instrumented(6, 3) == 2
+        with pytest.raises(ZeroDivisionError):
+            instrumented(1, 0)
+        metrics.disable()
+        instrumented(6, 3)
+
+        calls = metrics.snapshot()["calls"]["divide"]
+        assert calls["count"] == 2
+        assert calls["errors"] == 1
+        assert calls["sum"] > 0
+        assert calls["buckets"][float("inf")] == 2
+        counts = list(calls["buckets"].values())
+        assert counts == sorted(counts)
+
+    def test_solver_iterations(self, recording):
+        viscosity_at_40(10, 95)
+        (solver,) = metrics.snapshot()["solvers"].values()
+        assert solver["count"] == 1
+        assert solver["sum"] > 100
+
+    def test_prometheus(self, recording):
+        metrics.instrumented('say "hi"')(divide)(1, 2)
+        metrics.record_iterations("solver", 3)
+        lines = metrics.prometheus().splitlines()
+        assert "# TYPE lubepy_call_duration_seconds histogram" in lines
+        assert (
+            'lubepy_call_duration_seconds_bucket{function="say \\"hi\\"",'
+            'le="+Inf"} 1'
+        ) in lines
+        assert (
+            'lubepy_solver_iterations_bucket{solver="solver",le="5"} 1'
+            in lines
+        )
+        assert 'lubepy_solver_iterations_sum{solver="solver"} 3.0' in lines
+        assert 'lubepy_call_errors_total{function="say \\"hi\\""} 0' in lines
+
+    def test_environment_variable(self):
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import json\n"
+                "from lubepy import metrics\n"
+                "from lubepy.lube.viscosity import viscosity_index\n"
+                "viscosity_index(104.7, 13.9)\n"
+                "print(json.dumps(metrics.snapshot()['calls']))\n",
+            ],
+            check=True,
+            stdout=subprocess.PIPE,
+            env=dict(os.environ, LUBEPY_METRICS="1"),
+        ).stdout
+        calls = json.loads(output)
+        assert calls["lubepy.lube.viscosity.viscosity_index"]["count"] == 1
+        assert calls["lubepy.validator.core.ParamValidator"]["count"] == 2
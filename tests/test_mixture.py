@@ -28,7 +28,9 @@ from lubepy.lube.mixture import (
     OilMixture,
     mixture_proportions,
     mixture_viscosity,
+    mixture_viscosity_at_temp,
 )
+from lubepy.lube.viscosity import viscosity_at_any_temp
 
 
 class TestOilMixture:
@@ -147,3 +149,28 @@ class TestOilMixture:
 
     def test_mix_proportions_func(self):
         assert mixture_proportions(680, 220, 460, "40") == (67.32, 32.68)
+
+    def test_mixture_viscosity_at_temp(self):
+        viscosity40 = mixture_viscosity(680, 30, 220, "40")
+        viscosity100 = mixture_viscosity(40, 30, 18, "100")
+        assert mixture_viscosity_at_temp(
+            680, 40, 220, 18, 30, 60
+        ) == viscosity_at_any_temp(viscosity40, viscosity100, 60)
+        assert mixture_viscosity_at_temp(
+            680, 40, 220, 18, 30, 40, "andrade"
+        ) == pytest.approx(viscosity40)
+
+    def test_mixture_raw(self):
+        viscosity40 = mixture_viscosity(680, 30, 220, "40", raw=True)
+        viscosity100 = mixture_viscosity(40, 30, 18, "100", raw=True)
+        assert round(viscosity40, 2) == mixture_viscosity(680, 30, 220, "40")
+        assert mixture_viscosity_at_temp(
+            680, 40, 220, 18, 30, 60, raw=True
+        ) == viscosity_at_any_temp(viscosity40, viscosity100, 60, raw=True)
+        proportions = mixture_proportions(680, 220, 460, "40", raw=True)
+        assert sum(proportions) == 100
+        assert round(proportions.first_oil_percent, 2) == 67.32
+
+    def test_mixture_viscosity_at_temp_wrong_model(self):
+        with pytest.raises(ConceptError):
+            mixture_viscosity_at_temp(680, 40, 220, 18, 30, 60, "vogel")
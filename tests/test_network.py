@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides tests for network.py."""
+
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from lubepy.exceptions import ConceptError  # noqa: E402
+from lubepy.fluid import network  # noqa: E402
+from lubepy.fluid.batch import FLOW_TYPES  # noqa: E402
+from lubepy.fluid.network import (  # noqa: E402
+    Branch,
+    LubricationNetwork,
+    Node,
+    solve_network,
+)
+from lubepy.fluid.reynolds import (  # noqa: E402
+    CircularSession,
+    SquareSession,
+    _FlowTypes,
+    flow_type_circular_session,
+    reynolds_circular_session,
+)
+from lubepy.lube.viscosity import viscosity_at_any_temp  # noqa: E402
+
+OIL = {"viscosity40": 68, "viscosity100": 8.6, "temperature": 40}
+
+
+@pytest.fixture(params=["scipy", "numpy"])
+def solver(request, monkeypatch):
+    if request.param == "scipy":
+        pytest.importorskip("scipy")
+    else:
+        monkeypatch.setattr(network, "spsolve", None)
+
+
+def tree_network(size):
+    """Return a supply node feeding a chain of junctions with consumers."""
+    nodes = [Node("pump", pressure=6.0)]
+    branches = []
+    for i in range(size):
+        nodes.append(Node(f"junction{i}"))
+        nodes.append(Node(f"bearing{i}", demand=2.0))
+        previous = "pump" if i == 0 else f"junction{i - 1}"
+        branches.append(
+            Branch(previous, f"junction{i}", 1.0, CircularSession(25.0))
+        )
+        branches.append(
+            Branch(f"junction{i}", f"bearing{i}", 2.0, CircularSession(6.0))
+        )
+    return nodes, branches
+
+
+class TestNetwork:
+    """Class to test the lubrication network solver."""
+
+    def test_single_laminar_branch(self, solver):
+        nodes = [Node("pump", pressure=3.0), Node("bearing", demand=120.0)]
+        branches = [Branch("pump", "bearing", 10.0, CircularSession(10.0))]
+        solution = solve_network(nodes, branches, density=0.87, **OIL)
+        viscosity = viscosity_at_any_temp(**OIL) * 1e-6
+        drop = (
+            128 * 870 * viscosity * 10.0 * (120.0 / 3.6e6)
+            / (math.pi * 0.01 ** 4)
+        ) / 1e5
+        assert solution.flow_rates == pytest.approx([120.0])
+        assert solution.pressure_drops == pytest.approx([drop], rel=1e-3)
+        assert solution.pressures == pytest.approx([3.0, 3.0 - drop], rel=1e-3)
+        assert solution.reynolds_numbers == pytest.approx(
+            [reynolds_circular_session(120.0, 68, 8.6, 40, 10.0)], abs=0.1
+        )
+        assert FLOW_TYPES[solution.flow_types[0]] == _FlowTypes.LAMINAR
+
+    def test_flow_split_conserves_flow(self, solver):
+        nodes = [
+            Node("pump", pressure=4.0),
+            Node("a"),
+            Node("b"),
+            Node("bearing1", demand=300.0),
+            Node("bearing2", demand=100.0),
+        ]
+        branches = [
+            Branch("pump", "a", 5.0, CircularSession(20.0)),
+            Branch("pump", "b", 8.0, CircularSession(15.0)),
+            Branch("a", "b", 2.0, SquareSession(10.0)),
+            Branch("a", "bearing1", 1.0, CircularSession(8.0)),
+            Branch("b", "bearing2", 1.0, CircularSession(6.0)),
+        ]
+        solution = solve_network(nodes, branches, density=0.87, **OIL)
+        flows = solution.flow_rates
+        assert flows[0] + flows[1] == pytest.approx(400.0)
+        assert flows[0] == pytest.approx(flows[2] + flows[3])
+        assert flows[1] + flows[2] == pytest.approx(flows[4])
+        assert flows[3] == pytest.approx(300.0)
+        assert flows[4] == pytest.approx(100.0)
+
+    def test_turbulent_branch(self, solver):
+        nodes = [Node("pump", pressure=8.0), Node("bearing", demand=3_000.0)]
+        branches = [Branch("pump", "bearing", 2.0, CircularSession(10.0))]
+        solution = solve_network(
+            nodes,
+            branches,
+            viscosity40=10,
+            viscosity100=2.5,
+            temperature=60,
+            density=0.85,
+        )
+        reynolds = solution.reynolds_numbers[0]
+        assert FLOW_TYPES[solution.flow_types[0]] == (
+            flow_type_circular_session(3_000.0, 10, 2.5, 60, 10.0)
+        )
+        assert reynolds == pytest.approx(
+            reynolds_circular_session(3_000.0, 10, 2.5, 60, 10.0), rel=1e-3
+        )
+        velocity = (3_000.0 / 3.6e6) / (math.pi * 0.01 ** 2 / 4)
+        drop = 0.3164 * reynolds ** -0.25 * 2.0 / 0.01 * 850 * velocity ** 2
+        assert solution.pressure_drops == pytest.approx([drop / 2e5], rel=1e-3)
+
+    def test_large_network(self, solver):
+        nodes, branches = tree_network(1_000)
+        solution = LubricationNetwork(nodes, branches).solve(
+            density=0.87, **OIL
+        )
+        assert solution.flow_rates[0] == pytest.approx(2_000.0)
+        assert solution.flow_rates[1::2] == pytest.approx(2.0)
+        assert (np.diff(solution.pressures[1::2]) < 0).all()
+
+    def test_no_supply_node(self):
+        with pytest.raises(ConceptError):
+            LubricationNetwork(
+                [Node("a", demand=1.0), Node("b")],
+                [Branch("a", "b", 1.0, CircularSession(10.0))],
+            )
+
+    def test_disconnected_node(self):
+        with pytest.raises(ConceptError):
+            LubricationNetwork(
+                [Node("pump", pressure=1.0), Node("a"), Node("b")],
+                [Branch("pump", "a", 1.0, CircularSession(10.0))],
+            )
+
+    def test_unknown_node(self):
+        with pytest.raises(ConceptError) as error:
+            LubricationNetwork(
+                [Node("pump", pressure=1.0)],
+                [Branch("pump", "a", 1.0, CircularSession(10.0))],
+            )
+        assert error.value.__cause__ is None
+        assert error.value.__suppress_context__
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides tests for oil.py."""
+
+import pickle
+
+import pytest
+from pytest import param
+
+from lubepy.exceptions import ConceptError, ValidationError
+from lubepy.fluid.reynolds import (
+    CircularSession,
+    FluidFlowType,
+    PipeCircuit,
+    ReynoldsNumber,
+    reynolds_circular_session,
+    smallest_pipe_diameter,
+)
+from lubepy.lube.mixture import (
+    OilMixture,
+    mixture_viscosity,
+    mixture_viscosity_at_temp,
+)
+from lubepy.lube.oil import Oil
+from lubepy.lube.viscosity import (
+    iso_vg_grade,
+    viscosity_at_any_temp,
+    viscosity_at_temp,
+    viscosity_curve,
+    viscosity_index,
+)
+
+OIL = Oil(68.0, 8.6)
+HEAVY = Oil(220.0, 19.0)
+
+
+class TestOil:
+    """Class to test the Oil value object."""
+
+    def test_validation(self):
+        assert Oil("68", 8.6).viscosity40 == 68.0
+        with pytest.raises(ValidationError):
+            Oil(68.0, 1.0)
+
+    def test_immutable(self):
+        with pytest.raises(AttributeError):
+            OIL.viscosity40 = 100.0
+        with pytest.raises(AttributeError):
+            OIL.extra = 1
+        with pytest.raises(AttributeError):
+            del OIL.viscosity100
+
+    def test_value_semantics(self):
+        assert Oil(68, "8.6") == OIL
+        assert Oil(68, 8.7) != OIL
+        assert len({OIL, Oil(68, 8.6), HEAVY}) == 2
+        assert pickle.loads(pickle.dumps(OIL)) == OIL
+
+    def test_cached_properties(self):
+        oil = Oil(46.0, 6.8)
+        assert oil.viscosity_index == viscosity_index(46.0, 6.8)
+        assert oil.iso_vg_grade == 46
+        assert Oil(2.3, 2.0).iso_vg_grade == 2
+        assert oil.walther is oil.walther
+        assert oil.curve("andrade") is oil.curve("andrade")
+
+    def test_multi_point_models(self):
+        with pytest.raises(ConceptError, match="fit_viscosity"):
+            OIL.curve("vogel")
+        with pytest.raises(ConceptError, match="fit_viscosity"):
+            viscosity_at_temp(OIL, 60, "vogel")
+
+    @pytest.mark.parametrize(
+        "viscosity40, grade",
+        [
+            param(68.0, 68, id="midpoint"),
+            param(61.2, 68, id="lower_limit"),
+            param(35.2, 32, id="upper_limit"),
+            param(40.0, None, id="off_grade"),
+            param(1.98, 2, id="vg2_lower_limit"),
+            param(2.3, 2, id="vg2_inside"),
+            param(2.42, 2, id="vg2_upper_limit"),
+            param(1.8, None, id="under_vg2"),
+            param(2.88, 3, id="vg3_lower_limit"),
+            param(3.52, 3, id="vg3_upper_limit"),
+            param(4.6, 5, id="vg5_midpoint"),
+            param(6.8, 7, id="vg7_midpoint"),
+            param(1_999.0, 2_200, id="top_grade"),
+        ],
+    )
+    def test_iso_vg_grade(self, viscosity40, grade):
+        assert iso_vg_grade(viscosity40) == grade
+
+
+class TestOilArguments:
+    """Class to test that the public functions take an Oil."""
+
+    def test_viscosity(self):
+        assert viscosity_index(OIL) == viscosity_index(68.0, 8.6)
+        assert viscosity_at_any_temp(OIL, 60) == viscosity_at_any_temp(
+            68.0, 8.6, 60
+        )
+        assert viscosity_at_temp(OIL, 60, "andrade") == viscosity_at_temp(
+            68.0, 8.6, 60, "andrade"
+        )
+        assert viscosity_at_temp(OIL, temperature=60) == 28.49
+        assert viscosity_curve(OIL, "andrade") == viscosity_curve(
+            68.0, 8.6, "andrade"
+        )
+
+    def test_keywords_and_none(self):
+        assert viscosity_at_any_temp(
+            OIL, temperature=60, raw=True
+        ) == OIL.viscosity_at(60, raw=True)
+        assert viscosity_index(OIL, raw=True) == OIL.raw_viscosity_index
+        # A None after an Oil is the next argument, not a KV100
+        with pytest.raises(ValidationError):
+            viscosity_at_any_temp(OIL, None)
+
+    def test_reynolds(self):
+        assert reynolds_circular_session(
+            10, OIL, 40, 10
+        ) == reynolds_circular_session(10, 68.0, 8.6, 40, 10)
+        reynolds = ReynoldsNumber(10, OIL, 40)
+        assert reynolds.reynolds_circular_session(10) == 5.2
+        flow = FluidFlowType(10, OIL, 40, model="andrade")
+        assert flow.flow_type_circular_session(10).value == "laminar"
+        sessions = [CircularSession(10), CircularSession(20)]
+        assert PipeCircuit(OIL, 40).reynolds_numbers(
+            10, sessions
+        ) == PipeCircuit(68.0, 8.6, 40).reynolds_numbers(10, sessions)
+        assert smallest_pipe_diameter(
+            100, OIL, 0, 80, [5, 10, 20, 40]
+        ) == smallest_pipe_diameter(100, 68.0, 8.6, 0, 80, [5, 10, 20, 40])
+
+    def test_mixture(self):
+        assert mixture_viscosity(OIL, 50, HEAVY, "40") == mixture_viscosity(
+            68.0, 50, 220.0, "40"
+        )
+        assert OilMixture(OIL, HEAVY, "-5").second_viscosity == (
+            viscosity_at_any_temp(HEAVY, -5, raw=True)
+        )
+        assert mixture_viscosity_at_temp(
+            OIL, HEAVY, 50, 60
+        ) == mixture_viscosity_at_temp(68.0, 8.6, 220.0, 19.0, 50, 60)
+        assert mixture_viscosity_at_temp(
+            OIL, OIL, 50, 60
+        ) == mixture_viscosity_at_temp(68.0, 8.6, 68.0, 8.6, 50, 60)
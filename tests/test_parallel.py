@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides tests for parallel.py."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("multiprocessing.shared_memory")
+
+from lubepy import parallel  # noqa: E402
+from lubepy.calculations import run  # noqa: E402
+from lubepy.parallel import parallel_run  # noqa: E402
+
+ROWS = 10_000
+
+
+@pytest.fixture
+def columns():
+    rng = np.random.default_rng(0)
+    viscosity100 = rng.uniform(2.0, 100.0, ROWS)
+    viscosity40 = viscosity100 * rng.uniform(3.0, 20.0, ROWS)
+    viscosity40[::100] = np.nan
+    viscosity100[1::100] = 600.0
+    return {
+        "flow_rate": rng.uniform(1.0, 4_000.0, ROWS),
+        "viscosity40": viscosity40,
+        "viscosity100": viscosity100,
+        "temperature": rng.uniform(-10.0, 120.0, ROWS),
+        "diameter": rng.uniform(5.0, 100.0, ROWS),
+    }
+
+
+class TestParallel:
+    """Class to test the process pool executor."""
+
+    @pytest.mark.parametrize(
+        "name", ["viscosity_index", "reynolds_number", "flow_type"]
+    )
+    @pytest.mark.parametrize("start_method", [None, "spawn"])
+    def test_matches_run(self, columns, name, start_method):
+        expected = run(name, columns)
+        result = parallel_run(
+            name,
+            columns,
+            workers=2,
+            chunk_size=1_024,
+            start_method=start_method,
+        )
+        assert result.reasons.tolist() == expected.reasons.tolist()
+        assert result.valid.tolist() == expected.valid.tolist()
+        np.testing.assert_array_equal(result.values, expected.values)
+        assert (~result.valid).sum() == 200
+
+    def test_single_worker(self, columns):
+        result = parallel_run("viscosity_index", columns, workers=1)
+        expected = run("viscosity_index", columns)
+        np.testing.assert_array_equal(result.values, expected.values)
+
+    @pytest.mark.parametrize("fails", [False, True])
+    def test_tasks_close_blocks(self, columns, monkeypatch, fails):
+        opened = []
+
+        class SharedMemory(parallel.SharedMemory):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                opened.append(self)
+
+        def failing_run(name, columns):
+            raise ValueError(name)
+
+        blocks = []
+        specs = {
+            "viscosity40": parallel._share(columns["viscosity40"], blocks),
+            "viscosity100": parallel._share(columns["viscosity100"], blocks),
+            "__values__": parallel._share(np.empty(ROWS), blocks),
+            "__reasons__": parallel._share(np.empty(ROWS, np.uint8), blocks),
+        }
+        monkeypatch.setattr(parallel, "SharedMemory", SharedMemory)
+        if fails:
+            monkeypatch.setattr(parallel, "run", failing_run)
+        try:
+            parallel._setup("viscosity_index", specs)
+            if fails:
+                with pytest.raises(ValueError):
+                    parallel._run_range((0, 100))
+            else:
+                parallel._run_range((0, 100))
+            assert len(opened) == len(specs)
+            assert all(block.buf is None for block in opened)
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
@@ -23,10 +23,19 @@
 import pytest
 from pytest import param
 
+from lubepy.exceptions import ConceptError
+from lubepy.lube.viscosity import fit_viscosity
 from lubepy.fluid.reynolds import (
     _FlowTypes,
+    CircularSession,
     FluidFlowType,
+    PipeCircuit,
+    RectangularSession,
     ReynoldsNumber,
+    SquareSession,
+    flow_type_circuit,
+    reynolds_circuit,
+    smallest_pipe_diameter,
     reynolds_circular_session,
     flow_type_circular_session,
     flow_type_square_session,
@@ -194,3 +203,158 @@ class TestReynolds:
             )
             == expected
         )
+
+
+class TestPipeCircuit:
+    """Class to test PipeCircuit."""
+
+    sessions = [
+        CircularSession(10.0),
+        SquareSession(20.0),
+        RectangularSession(10.0, 10.0),
+    ]
+
+    def test_reynolds_circuit(self):
+        assert reynolds_circuit(600.0, 10, 2.5, 40, self.sessions) == [
+            reynolds_circular_session(600.0, 10, 2.5, 40, 10.0),
+            reynolds_square_session(600.0, 10, 2.5, 40, 20.0),
+            reynolds_rectangular_session(600.0, 10, 2.5, 40, 10.0, 10.0),
+        ]
+
+    def test_raw(self):
+        raw = reynolds_circuit(600.0, 10, 2.5, 40, self.sessions, raw=True)
+        assert raw[0] == reynolds_circular_session(
+            600.0, 10, 2.5, 40, 10.0, raw=True
+        )
+        # Built on the unrounded viscosity, not only unrounded at the end
+        assert raw[0] == pytest.approx(353.9606 * 600.0 / (10.0 * 10.0))
+        assert [round(number, 1) for number in raw] == reynolds_circuit(
+            600.0, 10, 2.5, 40, self.sessions
+        )
+
+    def test_viscosity_model(self):
+        andrade = PipeCircuit(320, 24.0, 60, "andrade")
+        walther = PipeCircuit(320, 24.0, 60)
+        andrade_number, walther_number = [
+            circuit.reynolds_numbers(600.0, self.sessions[:1])[0]
+            for circuit in (andrade, walther)
+        ]
+        assert andrade_number != walther_number
+        assert andrade_number == ReynoldsNumber(
+            600.0, 320, 24.0, 60, "andrade"
+        ).reynolds_circular_session(10.0)
+
+        curve = fit_viscosity("vogel", [0, 40, 100], [2_900, 320, 24.0])
+        circuit = PipeCircuit(320, 24.0, 40, curve)
+        assert circuit.reynolds_numbers(600.0, self.sessions[:1]) == [
+            ReynoldsNumber(
+                600.0, 320, 24.0, 40, curve
+            ).reynolds_circular_session(10.0)
+        ]
+
+    def test_reynolds_circuit_flow_rates(self):
+        circuit = PipeCircuit(320, 24.0, 40)
+        assert circuit.reynolds_numbers(
+            [1_800.0, 3_600.0, 900.0], self.sessions
+        ) == [
+            reynolds_circular_session(1_800.0, 320, 24.0, 40, 10.0),
+            reynolds_square_session(3_600.0, 320, 24.0, 40, 20.0),
+            reynolds_rectangular_session(900.0, 320, 24.0, 40, 10.0, 10.0),
+        ]
+
+    def test_reynolds_circuit_flow_rate_iterables(self):
+        circuit = PipeCircuit(320, 24.0, 40)
+        flow_rates = [1_800.0, 3_600.0, 900.0]
+        expected = circuit.reynolds_numbers(flow_rates, self.sessions)
+        rates = (rate for rate in flow_rates)
+        assert circuit.reynolds_numbers(rates, self.sessions) == expected
+        np = pytest.importorskip("numpy")
+        rates = np.array(flow_rates)
+        assert circuit.reynolds_numbers(rates, self.sessions) == expected
+        assert circuit.reynolds_numbers(
+            np.float64(1_800.0), self.sessions[:1]
+        ) == expected[:1]
+
+    def test_flow_type_circuit(self):
+        assert flow_type_circuit(
+            600.0, 5, 2.1, 40, [CircularSession(10.0), SquareSession(100.0)]
+        ) == [_FlowTypes.TURBULENT, _FlowTypes.LAMINAR]
+
+    def test_flow_rates_length_mismatch(self):
+        with pytest.raises(ConceptError):
+            reynolds_circuit([600.0], 10, 2.5, 40, self.sessions)
+
+    def test_wrong_session(self):
+        with pytest.raises(TypeError):
+            reynolds_circuit(600.0, 10, 2.5, 40, [10.0])
+
+
+CATALOGUE = [6.0, 8.0, 10.0, 15.0, 20.0, 25.0, 32.0, 40.0, 50.0, 65.0, 80.0]
+
+
+class TestPipeSizing:
+    """Class to test pipe sizing."""
+
+    @pytest.mark.parametrize(
+        "flow_rate, viscosity40, viscosity100, min_temp, max_temp, expected",
+        [
+            param(1_800.0, 320, 24.0, 20, 60, 6.0),
+            param(600.0, 10, 2.5, 20, 60, 20.0),
+            param(600.0, 5, 2.1, 0, 40, 25.0),
+            param(5_000.0, 5, 2.1, 0, 90, None),
+        ],
+    )
+    def test_smallest_pipe_diameter(
+        self, flow_rate, viscosity40, viscosity100, min_temp, max_temp, expected
+    ):
+        diameter = smallest_pipe_diameter(
+            flow_rate, viscosity40, viscosity100, min_temp, max_temp, CATALOGUE
+        )
+        assert diameter == expected
+        if diameter is None:
+            return
+        assert all(
+            reynolds_circular_session(
+                flow_rate, viscosity40, viscosity100, temp, diameter
+            )
+            <= 2_100.0
+            for temp in (min_temp, max_temp)
+        )
+        index = CATALOGUE.index(diameter)
+        if index:
+            assert (
+                reynolds_circular_session(
+                    flow_rate,
+                    viscosity40,
+                    viscosity100,
+                    max_temp,
+                    CATALOGUE[index - 1],
+                )
+                > 2_100.0
+            )
+
+    def test_reynolds_limit(self):
+        assert (
+            smallest_pipe_diameter(
+                600.0, 10, 2.5, 20, 60, CATALOGUE, reynolds_limit=4_000.0
+            )
+            == 10.0
+        )
+
+    def test_text_catalogue(self):
+        text = [str(diameter) for diameter in CATALOGUE]
+        assert smallest_pipe_diameter(
+            1_800.0, 320, 24.0, 0, 80, text
+        ) == smallest_pipe_diameter(1_800.0, 320, 24.0, 0, 80, CATALOGUE)
+
+    @pytest.mark.parametrize(
+        "diameters",
+        [param([0.5, 10.0, 20.0, 40.0]), param([10.0, 20.0, 40.0, 2_000.0])],
+    )
+    def test_catalogue_out_of_range(self, diameters):
+        with pytest.raises(ConceptError):
+            smallest_pipe_diameter(600.0, 10, 2.5, 20, 60, diameters)
+
+    def test_unsorted_catalogue(self):
+        with pytest.raises(ConceptError):
+            smallest_pipe_diameter(600.0, 10, 2.5, 20, 60, [10.0, 8.0])
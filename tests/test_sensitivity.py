@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides tests for sensitivity.py."""
+
+import pytest
+from pytest import param
+
+np = pytest.importorskip("numpy")
+
+from lubepy.exceptions import ValidationError  # noqa: E402
+from lubepy.lube import batch  # noqa: E402
+from lubepy.lube.sensitivity import (  # noqa: E402
+    mixture_viscosity_gradient,
+    viscosity_gradient,
+    viscosity_index_gradient,
+)
+
+# VI under and over 100, inside one ASTM D2270 range each
+VISCOSITY40 = np.array([68.0, 104.7, 220.0, 30.0, 1_500.0])
+VISCOSITY100 = np.array([8.6, 13.9, 19.0, 4.1, 80.0])
+STEP = 1e-6
+
+
+def central_difference(function, args, position):
+    """Return the derivative of function by its argument at position."""
+    up, down = list(args), list(args)
+    up[position] = up[position] + STEP
+    down[position] = down[position] - STEP
+    return (function(*up) - function(*down)) / (2 * STEP)
+
+
+class TestSensitivity:
+    """Class to test the analytic derivatives against finite differences."""
+
+    @pytest.mark.parametrize(
+        "gradient, function, args",
+        [
+            param(
+                viscosity_index_gradient,
+                batch.viscosity_index,
+                (VISCOSITY40, VISCOSITY100),
+                id="viscosity_index",
+            ),
+            param(
+                viscosity_gradient,
+                batch.viscosity_at_any_temp,
+                (VISCOSITY40, VISCOSITY100, np.array([0, 40, 60, 100, 150.0])),
+                id="viscosity",
+            ),
+            param(
+                mixture_viscosity_gradient,
+                batch.mixture_viscosity,
+                (
+                    VISCOSITY40,
+                    np.array([10, 50, 90, 30, 5.0]),
+                    VISCOSITY40 / 2,
+                    "40",
+                ),
+                id="mixture_viscosity",
+            ),
+        ],
+    )
+    def test_gradient(self, gradient, function, args):
+        result = gradient(*args)
+        assert result.value == pytest.approx(function(*args), rel=1e-12)
+        for position, derivative in enumerate(result[1:]):
+            if isinstance(args[position], str):
+                continue
+            assert derivative == pytest.approx(
+                central_difference(function, args, position),
+                rel=1e-5,
+                abs=1e-6,
+            )
+
+    def test_scalars(self):
+        result = viscosity_index_gradient(68.0, 8.6)
+        assert result.value == pytest.approx(96.79, abs=0.01)
+        assert result.viscosity40 < 0 < result.viscosity100
+
+    def test_validation(self):
+        with pytest.raises(ValidationError):
+            viscosity_gradient(68.0, 8.6, 2_000.0)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides tests for service.py."""
+
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from lubepy.lube.viscosity import viscosity_index  # noqa: E402
+from lubepy.service import CalculationService  # noqa: E402
+
+
+def exchange(service, lines):
+    """Send lines over one connection and return the responses by id."""
+
+    async def session():
+        server = await service.serve("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        for line in lines:
+            writer.write(line.encode() + b"\n")
+        await writer.drain()
+        writer.write_eof()
+        responses = [json.loads(line) async for line in reader]
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return responses
+
+    return asyncio.run(session())
+
+
+class TestCalculationService:
+    """Class to test CalculationService."""
+
+    def test_micro_batching(self):
+        service = CalculationService(max_batch=8, max_delay=0.05)
+        samples = [(104.7, 13.9), (68.0, 8.6), (220.0, 19.0), (32.0, 5.4)] * 5
+        lines = [
+            json.dumps(
+                {
+                    "id": index,
+                    "calculation": "viscosity_index",
+                    "viscosity40": v40,
+                    "viscosity100": v100,
+                }
+            )
+            for index, (v40, v100) in enumerate(samples)
+        ]
+        responses = {r["id"]: r for r in exchange(service, lines)}
+        assert len(responses) == len(samples)
+        for index, (v40, v100) in enumerate(samples):
+            assert responses[index]["error"] == ""
+            assert responses[index]["result"] == pytest.approx(
+                viscosity_index(v40, v100), abs=0.5
+            )
+        assert service.batches < len(samples)
+
+    def test_labels(self):
+        service = CalculationService(max_delay=0.0)
+        line = json.dumps(
+            {
+                "id": "a",
+                "calculation": "flow_type",
+                "flow_rate": 30,
+                "viscosity40": 68,
+                "viscosity100": 8.6,
+                "temperature": 40,
+                "diameter": 10,
+            }
+        )
+        assert exchange(service, [line]) == [
+            {"id": "a", "result": "laminar", "error": ""}
+        ]
+
+    @pytest.mark.parametrize(
+        "line, error",
+        [
+            pytest.param(
+                '{"id": 1, "calculation": "viscosity_index",'
+                ' "viscosity40": "abc", "viscosity100": 10}',
+                "viscosity40: not a number",
+                id="invalid-input",
+            ),
+            pytest.param(
+                '{"id": 1, "calculation": "unknown"}',
+                "unknown is not a valid calculation",
+                id="unknown-calculation",
+            ),
+            pytest.param(
+                "not json", "Requests must be JSON objects", id="not-json"
+            ),
+        ],
+    )
+    def test_errors(self, line, error):
+        service = CalculationService(max_delay=0.0)
+        (response,) = exchange(service, [line])
+        assert response["result"] is None
+        assert response["error"] == error
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides tests for store.py."""
+
+import pytest
+from pytest import param
+
+np = pytest.importorskip("numpy")
+
+from lubepy.exceptions import ConceptError, ValidationError  # noqa: E402
+from lubepy.store import ResultStore  # noqa: E402
+
+COLUMNS = {"asset": "S8", "viscosity_index": "f8", "reason": "u1"}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResultStore.create(tmp_path / "results", COLUMNS)
+
+
+class TestResultStore:
+    """Class to test ResultStore."""
+
+    def test_empty(self, store):
+        assert len(store) == 0
+        assert store["viscosity_index"].dtype == np.float64
+        assert {
+            column: values.tolist() for column, values in store.read().items()
+        } == {"asset": [], "viscosity_index": [], "reason": []}
+
+    def test_append_and_reopen(self, store):
+        store.append(
+            {
+                "asset": [b"P-1", b"P-2"],
+                "viscosity_index": [95, 134],
+                "reason": [0, 0],
+            }
+        )
+        assert (
+            store.append(
+                {"asset": ["P-1"], "viscosity_index": [97], "reason": [0]}
+            )
+            == 3
+        )
+
+        reopened = ResultStore(store.path)
+        asset = reopened["asset"]
+        assert isinstance(asset, np.memmap)
+        assert not asset.flags.writeable
+        assert reopened["viscosity_index"][asset == b"P-1"].tolist() == [
+            95,
+            97,
+        ]
+        assert reopened.read(["reason"], start=1)["reason"].tolist() == [0, 0]
+
+    def test_refresh(self, store):
+        reader = ResultStore(store.path)
+        store.append(
+            {"asset": ["P-1"], "viscosity_index": [97], "reason": [0]}
+        )
+        assert len(reader) == 0
+        reader.refresh()
+        assert len(reader) == 1
+
+    def test_uncommitted_bytes_are_dropped(self, store):
+        store.append(
+            {"asset": ["P-1"], "viscosity_index": [97], "reason": [0]}
+        )
+        with open(store.path / "viscosity_index.bin", "ab") as column_file:
+            column_file.write(b"interrupted append")
+        assert len(ResultStore(store.path)) == 1
+        store.append(
+            {"asset": ["P-2"], "viscosity_index": [134], "reason": [0]}
+        )
+        assert store["viscosity_index"].tolist() == [97, 134]
+
+    def test_append_run(self, store):
+        result = store.append_run(
+            "viscosity_index",
+            {
+                "asset": ["P-1", "P-2"],
+                "viscosity40": [104.7, "abc"],
+                "viscosity100": [13.9, 10.0],
+            },
+            keep=["asset"],
+        )
+        assert store["viscosity_index"][0] == result.values[0]
+        assert store["reason"].tolist() == result.reasons.tolist()
+
+    @pytest.mark.parametrize(
+        "chunk",
+        [
+            param({"asset": ["P-1"], "viscosity_index": [97]}, id="missing"),
+            param(
+                {"asset": ["P-1"], "viscosity_index": [97, 95], "reason": [0]},
+                id="lengths",
+            ),
+        ],
+    )
+    def test_wrong_chunk(self, store, chunk):
+        with pytest.raises(ConceptError):
+            store.append(chunk)
+        assert len(store) == 0
+
+    @pytest.mark.parametrize(
+        "chunk",
+        [
+            param(
+                {
+                    "asset": ["PUMP-1010"],
+                    "viscosity_index": [97],
+                    "reason": [0],
+                },
+                id="long-text",
+            ),
+            param(
+                {
+                    "asset": [b"PUMP-1010"],
+                    "viscosity_index": [97],
+                    "reason": [0],
+                },
+                id="long-bytes",
+            ),
+            param(
+                {"asset": [123456789], "viscosity_index": [97], "reason": [0]},
+                id="long-number",
+            ),
+            param(
+                {"asset": ["P-ñ"], "viscosity_index": [97], "reason": [0]},
+                id="not-ascii",
+            ),
+            param(
+                {"asset": ["P-1"], "viscosity_index": ["abc"], "reason": [0]},
+                id="not-a-number",
+            ),
+            param(
+                {"asset": ["P-1"], "viscosity_index": [97], "reason": [300]},
+                id="overflow",
+            ),
+        ],
+    )
+    def test_values_that_dont_fit(self, store, chunk):
+        with pytest.raises(ValidationError):
+            store.append(chunk)
+        assert len(store) == 0
+        store.append(
+            {"asset": ["PUMP-101"], "viscosity_index": [97], "reason": [0]}
+        )
+        assert store["asset"].tolist() == [b"PUMP-101"]
+
+    @pytest.mark.parametrize(
+        "columns",
+        [
+            param({"asset": object}, id="object"),
+            param({"asset": "U"}, id="variable-size"),
+            param({"../asset": "f8"}, id="name"),
+        ],
+    )
+    def test_wrong_columns(self, tmp_path, columns):
+        with pytest.raises(ValidationError):
+            ResultStore.create(tmp_path / "results", columns)
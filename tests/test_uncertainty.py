@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides tests for uncertainty.py."""
+
+import pytest
+from pytest import param
+
+np = pytest.importorskip("numpy")
+
+from lubepy.exceptions import ConceptError, ValidationError  # noqa: E402
+from lubepy.lube.batch import viscosity_at_any_temp  # noqa: E402
+from lubepy.lube.batch import viscosity_index  # noqa: E402
+from lubepy.lube.uncertainty import propagate  # noqa: E402
+
+VISCOSITY40 = [68.0, 104.7, 220.0]
+VISCOSITY100 = [8.6, 13.9, 19.0]
+
+
+class TestPropagate:
+    """Class to test the Monte Carlo uncertainty propagation."""
+
+    def test_no_uncertainty(self):
+        result = propagate(VISCOSITY40, VISCOSITY100, 60, 0.0, 0.0, 10)
+        index = viscosity_index(VISCOSITY40, VISCOSITY100)
+        viscosity = viscosity_at_any_temp(VISCOSITY40, VISCOSITY100, 60)
+        assert result.viscosity_index == pytest.approx(
+            np.repeat(index[:, None], 3, axis=1)
+        )
+        assert result.viscosity == pytest.approx(
+            np.repeat(viscosity[:, None], 3, axis=1)
+        )
+
+    @pytest.mark.parametrize(
+        "distribution, width",
+        [
+            param("normal", 2 * 1.96 * 0.01, id="normal"),
+            param("uniform", 2 * 0.95 * np.sqrt(3) * 0.01, id="uniform"),
+        ],
+    )
+    def test_intervals(self, distribution, width):
+        result = propagate(
+            VISCOSITY40,
+            VISCOSITY100,
+            [40, 60, 100],
+            samples=20_000,
+            distribution=distribution,
+            seed=0,
+        )
+        low, median, high = result.viscosity_index.T
+        assert median == pytest.approx(
+            viscosity_index(VISCOSITY40, VISCOSITY100), abs=0.2
+        )
+        assert np.all(low < median) and np.all(median < high)
+        # At 40 ºC the 95 % interval is the one of KV40 itself
+        low, median, high = result.viscosity[0]
+        assert (high - low) / median == pytest.approx(width, rel=0.05)
+
+    def test_wider_uncertainty(self):
+        narrow, wide = (
+            propagate(68.0, 8.6, 60, u, u, 5_000, seed=0).viscosity
+            for u in (0.005, 0.01)
+        )
+        assert np.ptp(wide) > np.ptp(narrow)
+
+    def test_chunks(self):
+        viscosity40 = np.full(50, 68.0)
+        whole = propagate(viscosity40, 8.6, samples=2_000, seed=1)
+        chunked = propagate(
+            viscosity40, 8.6, samples=2_000, seed=1, chunk_size=5_000
+        )
+        assert whole.viscosity is None
+        assert chunked.viscosity_index.shape == (50, 3)
+        assert chunked.viscosity_index == pytest.approx(
+            whole.viscosity_index, abs=1.0
+        )
+
+    def test_seed(self):
+        first, second = (
+            propagate(68.0, 8.6, 60, samples=100, seed=7) for _ in range(2)
+        )
+        assert np.array_equal(first.viscosity, second.viscosity)
+
+    @pytest.mark.parametrize(
+        "kwargs, error",
+        [
+            param({"samples": 0}, ConceptError, id="samples"),
+            param({"distribution": "cauchy"}, ConceptError, id="distribution"),
+            param({"uncertainty40": -0.1}, ValidationError, id="uncertainty"),
+            param({"temperature": 2_000}, ValidationError, id="temperature"),
+        ],
+    )
+    def test_errors(self, kwargs, error):
+        with pytest.raises(error):
+            propagate(68.0, 8.6, **kwargs)
@@ -25,6 +25,7 @@ from pytest import param
 
 from lubepy.exceptions import ValidationError, ConceptError
 from lubepy.validator.core import (
+    ParamValidator,
     validate_viscosity,
     validate_viscosity_index,
     validate_temperature,
@@ -96,3 +97,50 @@ class TestValidator:
     def test_temperature_wrong_value(self, temp):
         with pytest.raises(ConceptError):
             validate_temperature(temp)
+
+
+class TestParamValidator:
+    """Class to test ParamValidator."""
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            param(68, 68.0),
+            param(68.5, 68.5),
+            param(" 68,5 ", 68.5),
+            param("6 8.5", 68.5),
+        ],
+    )
+    def test_numbers_and_text(self, value, expected):
+        result = ParamValidator()("Viscosity", value, 2.0, 2_000.0)
+        assert result == expected
+        assert type(result) is float
+
+    def test_numpy_scalars(self):
+        np = pytest.importorskip("numpy")
+        validate = ParamValidator()
+        for value in (np.float64(68.5), np.float32(68.5), np.int64(68)):
+            result = validate("Viscosity", value, 2.0, 2_000.0)
+            assert result == float(value)
+            assert type(result) is float
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            param(float("nan")),
+            param(float("inf")),
+            param(-float("inf")),
+            param("nan"),
+            param(True),
+            param(None),
+            param(10 ** 400),
+        ],
+    )
+    def test_not_a_number(self, value):
+        with pytest.raises(ValidationError):
+            ParamValidator()("Viscosity", value, 2.0, 2_000.0)
+
+    @pytest.mark.parametrize("value", [param(1), param(2_000.1)])
+    def test_out_of_range(self, value):
+        with pytest.raises(ConceptError):
+            ParamValidator()("Viscosity", value, 2.0, 2_000.0)
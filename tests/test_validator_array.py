@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides tests for validator/array.py."""
+
+import pytest
+from pytest import param
+
+np = pytest.importorskip("numpy")
+
+from lubepy.exceptions import ValidationError  # noqa: E402
+from lubepy.validator import array  # noqa: E402
+from lubepy.validator.array import (  # noqa: E402
+    NOT_A_NUMBER,
+    NOT_FINITE,
+    OUT_OF_RANGE,
+    REASONS,
+    VALID,
+    validate_array,
+    validate_bearing_diameter_array,
+    validate_temperature_array,
+    validate_viscosity_array,
+    validate_viscosity_index_array,
+)
+from lubepy.validator.core import ParamValidator  # noqa: E402
+
+
+class TestArrayValidator:
+    """Class to test the array validators."""
+
+    def test_numeric_column(self):
+        result = validate_viscosity_array([68, 1.0, np.nan, 2_010.0], "40")
+        assert result.values[0] == 68.0
+        assert np.isnan(result.values[1:]).all()
+        assert result.valid.tolist() == [True, False, False, False]
+        assert result.reasons.tolist() == [
+            VALID,
+            OUT_OF_RANGE,
+            NOT_FINITE,
+            OUT_OF_RANGE,
+        ]
+
+    def test_text_column(self):
+        result = validate_viscosity_index_array(
+            ["95", " 1 50 ", "99,5", "", "abc", "inf", "-26"]
+        )
+        assert result.values[:3].tolist() == [95.0, 150.0, 99.5]
+        assert result.reasons.tolist() == [
+            VALID,
+            VALID,
+            VALID,
+            NOT_A_NUMBER,
+            NOT_A_NUMBER,
+            NOT_FINITE,
+            OUT_OF_RANGE,
+        ]
+
+    def test_mixed_object_column(self):
+        result = validate_temperature_array([40, "60", None, True, 1_500])
+        assert result.valid.tolist() == [True, True, False, False, False]
+        assert [REASONS[code] for code in result.reasons] == [
+            "valid",
+            "valid",
+            "not a number",
+            "not a number",
+            "out of range",
+        ]
+
+    def test_boolean_column(self):
+        result = validate_array(np.array([True, False]))
+        assert (result.reasons == NOT_A_NUMBER).all()
+
+    @pytest.mark.parametrize(
+        "values",
+        [
+            param([True, 2.5, 1]),
+            param([np.True_, 2.5]),
+            param(np.array([False, 2.5, "3"], dtype=object)),
+            param((1, True)),
+        ],
+    )
+    def test_boolean_elements(self, values):
+        result = validate_array(values)
+        for value, reason in zip(values, result.reasons):
+            if isinstance(value, (bool, np.bool_)):
+                assert reason == NOT_A_NUMBER
+            else:
+                assert reason == VALID
+
+    def test_agrees_with_param_validator(self):
+        values = ["10", "0,5", "100001", "x", 50.0, "nan", 1, True]
+        result = validate_bearing_diameter_array(values)
+        for value, valid, clean in zip(values, result.valid, result.values):
+            try:
+                expected = ParamValidator()("Diameter", value, 1.0, 1e5)
+            except ValidationError:
+                assert not valid
+            else:
+                assert valid and clean == expected
+
+    def test_input_is_not_modified(self):
+        values = np.array([68.0, -1.0, 320.0])
+        result = validate_viscosity_array(values, "40")
+        assert values.tolist() == [68.0, -1.0, 320.0]
+        assert np.isnan(result.values[1])
+        valid = np.array([68.0, 320.0])
+        assert validate_viscosity_array(valid, "40").values is valid
+
+    def test_no_range(self):
+        result = validate_array([-1e9, 1e9])
+        assert result.valid.all()
+
+    def test_all_validators(self):
+        for name in dir(array):
+            if name.startswith("validate_") and name.endswith("_array"):
+                args = ("40",) if name == "validate_viscosity_array" else ()
+                result = getattr(array, name)(["abc"], *args)
+                assert result.reasons.tolist() == [NOT_A_NUMBER]
@@ -25,9 +25,14 @@ from pytest import param
 
 from lubepy.exceptions import ConceptError, ValidationError
 from lubepy.lube.viscosity import (
+    VISCOSITY_MODELS,
+    ViscosityModel,
+    fit_viscosity,
     viscosity_at_40,
     viscosity_at_100,
     viscosity_at_any_temp,
+    viscosity_at_temp,
+    viscosity_curve,
     viscosity_index,
 )
 
@@ -117,6 +122,13 @@ class TestViscosity:
     def test_viscosity_at_any_temp(self):
         assert viscosity_at_any_temp(4.6, 2, 20) == 6.89
 
+    def test_raw(self):
+        viscosity = viscosity_at_any_temp(4.6, 2, 20, raw=True)
+        assert viscosity != 6.89 and round(viscosity, 2) == 6.89
+        assert viscosity_at_temp(4.6, 2, 20, raw=True) == viscosity
+        index = viscosity_index(104.7, 13.9, raw=True)
+        assert isinstance(index, float) and round(index) == 134
+
     @pytest.mark.parametrize(
         "viscosity40, viscosity100, temp",
         [
@@ -178,3 +190,78 @@ class TestViscosity:
     def test_viscosity_index_wrong_number(self, viscosity40, viscosity100):
         with pytest.raises(ValidationError):
             viscosity_index(viscosity40, viscosity100)
+
+
+class TestViscosityModels:
+    """Class to test the viscosity-temperature models."""
+
+    # Vogel oil: ln(v) = -2.5 + 900 / (T - 160)
+    temperatures = [-20.0, 0.0, 20.0, 40.0, 70.0, 100.0]
+    viscosities = [
+        2.718281828 ** (-2.5 + 900 / (t + 273.15 - 160)) for t in temperatures
+    ]
+
+    @pytest.mark.parametrize("model", list(VISCOSITY_MODELS))
+    def test_round_trip(self, model):
+        curve = fit_viscosity(model, self.temperatures, self.viscosities)
+        viscosity = curve.viscosity(60)
+        assert curve.temperature(viscosity) == pytest.approx(60)
+
+    def test_walther_matches_astm_d341(self):
+        assert viscosity_at_temp(68, 8.6, 60) == viscosity_at_any_temp(
+            68, 8.6, 60
+        )
+        curve = viscosity_curve(68, 8.6)
+        assert round(curve.viscosity(60), 2) == viscosity_at_any_temp(
+            68, 8.6, 60
+        )
+
+    def test_andrade_two_points(self):
+        curve = fit_viscosity("andrade", [40, 100], [68, 8.6])
+        assert curve.viscosity(40) == pytest.approx(68)
+        assert curve.viscosity(100) == pytest.approx(8.6)
+
+    def test_vogel_fit(self):
+        curve = fit_viscosity("vogel", self.temperatures, self.viscosities)
+        assert curve.params == pytest.approx((-2.5, 900, 160), rel=1e-6)
+        # Vogel fits the cold end better than the other models
+        for model in ("walther", "andrade"):
+            other = fit_viscosity(model, self.temperatures, self.viscosities)
+            assert abs(curve.viscosity(-20) - self.viscosities[0]) < abs(
+                other.viscosity(-20) - self.viscosities[0]
+            )
+
+    def test_vectorized(self):
+        np = pytest.importorskip("numpy")
+        curve = fit_viscosity("vogel", self.temperatures, self.viscosities)
+        result = curve.viscosity(np.array(self.temperatures))
+        assert result == pytest.approx(self.viscosities, rel=1e-6)
+        assert curve.temperature(result) == pytest.approx(self.temperatures)
+
+    def test_custom_model(self):
+        class Constant(ViscosityModel):
+            name = "constant"
+            min_points = 1
+
+            def fit(self, temperatures, viscosities):
+                return (sum(viscosities) / len(viscosities),)
+
+            def viscosity(self, params, temperature):
+                return params[0]
+
+        curve = fit_viscosity(Constant(), [40, 100], [60, 40])
+        assert viscosity_at_temp(68, 8.6, 0, curve) == 50
+
+    @pytest.mark.parametrize(
+        "model, temperatures, viscosities",
+        [
+            param("unknown", [40, 100], [68, 8.6], id="unknown-model"),
+            param("vogel", [40, 100], [68, 8.6], id="too-few-points"),
+            param("walther", [40, 40], [68, 70], id="same-temperature"),
+            param("walther", [40, 100], [68], id="missing-viscosity"),
+            param("walther", [40, 100], [68, 1], id="low-viscosity"),
+        ],
+    )
+    def test_wrong_fit(self, model, temperatures, viscosities):
+        with pytest.raises(ConceptError):
+            fit_viscosity(model, temperatures, viscosities)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2020 Leodanis Pozo Ramos <lpozor78@gmail.com>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+# MA 02110-1301, USA.
+
+"""This module provides tests for warmup.py."""
+
+import pytest
+from pytest import param
+
+np = pytest.importorskip("numpy")
+
+from lubepy.exceptions import ConceptError  # noqa: E402
+from lubepy.fluid.batch import FLOW_TYPES  # noqa: E402
+from lubepy.fluid.reynolds import flow_type_circular_session  # noqa: E402
+from lubepy.fluid.warmup import warmup_flow_types  # noqa: E402
+
+LINES = {
+    "flow_rate": [600.0, 600.0, 100.0],
+    "viscosity40": [10, 68, 320],
+    "viscosity100": [2.5, 8.6, 24.0],
+    "equivalent_diameter": [10.0, 5.0, 10.0],
+}
+TIMES = np.arange(0.0, 2_401.0, 60.0)
+TEMPERATURES = np.linspace(-10.0, 80.0, len(TIMES))[:, None] + [0, 5, 10]
+
+
+class TestWarmup:
+    """Class to test the warm-up simulation."""
+
+    def test_matches_scalar_flow_types(self):
+        result = warmup_flow_types(TIMES, TEMPERATURES, **LINES)
+        for line, (q, v40, v100, d) in enumerate(zip(*LINES.values())):
+            flow_types = [
+                flow_type_circular_session(q, v40, v100, temp, d)
+                for temp in TEMPERATURES[:-1, line]
+            ]
+            for code, name in enumerate(["laminar", "mixed", "turbulent"]):
+                assert getattr(result, name)[line] == 60.0 * flow_types.count(
+                    FLOW_TYPES[code]
+                )
+
+    def test_durations_add_up(self):
+        result = warmup_flow_types(TIMES, TEMPERATURES, **LINES)
+        total = result.laminar + result.mixed + result.turbulent
+        assert total == pytest.approx(TIMES[-1] - TIMES[0])
+        assert result.transitions.tolist() == [2, 1, 0]
+        assert result.viscosities is None and result.flow_types is None
+
+    def test_generator_and_trajectories(self):
+        result = warmup_flow_types(
+            iter(TIMES),
+            (row for row in TEMPERATURES),
+            trajectories=True,
+            **LINES,
+        )
+        expected = warmup_flow_types(TIMES, TEMPERATURES, **LINES)
+        assert result.laminar == pytest.approx(expected.laminar)
+        assert result.viscosities.shape == TEMPERATURES.shape
+        assert result.flow_types.shape == TEMPERATURES.shape
+        assert (np.diff(result.viscosities, axis=0) < 0).all()
+
+    def test_times_not_ascending(self):
+        with pytest.raises(ConceptError):
+            warmup_flow_types(TIMES[::-1], TEMPERATURES, **LINES)
+
+    @pytest.mark.parametrize(
+        "times, temperatures",
+        [
+            param(TIMES[:-1], TEMPERATURES),
+            param(TIMES, TEMPERATURES[:-1]),
+            param(iter(TIMES), (row for row in TEMPERATURES[:1])),
+        ],
+    )
+    def test_steps_mismatch(self, times, temperatures):
+        with pytest.raises(ConceptError):
+            warmup_flow_types(times, temperatures, **LINES)